@@ -5,10 +5,10 @@ Provides chat and lead qualification endpoints with LangServe integration
 import os
 import sys
 import uvicorn
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from contextlib import asynccontextmanager
+from fastapi.responses import JSONResponse, StreamingResponse
+from contextlib import aclosing, asynccontextmanager
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
@@ -27,6 +27,10 @@ try:
         QualificationResponse
     )
     from config.settings import settings
+    from monitoring import get_metrics
+    from utils.streaming import sse_event, SSE_HEADERS
+    from utils.llm_clients import aclose_llm_clients
+    from utils.session_manager import aclose_session_manager
 except ImportError as e:
     print(f"Import error: {e}")
     print("Current working directory:", os.getcwd())
@@ -55,6 +59,7 @@ async def lifespan(app: FastAPI):
         # Initialize chains
         rag_chain = get_rag_chain()
         qualification_chain = get_qualification_chain()
+        rag_chain.session_manager.start_cleanup()
         
         logger.info("RAG system initialized successfully")
         yield
@@ -64,6 +69,8 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         logger.info("Shutting down BrainGenTechnology RAG API...")
+        await aclose_llm_clients()
+        await aclose_session_manager()
 
 # Create FastAPI app
 app = FastAPI(
@@ -102,6 +109,18 @@ class ChatResponse(BaseModel):
     conversation_length: int = Field(..., description="Number of messages in conversation")
     timestamp: str = Field(..., description="Response timestamp")
     processing_time: Optional[float] = Field(default=None, description="Processing time in seconds")
+    timings: Optional[Dict[str, float]] = Field(default=None, description="Seconds spent per chat stage")
+
+class BatchRetrieveRequest(BaseModel):
+    """Request model for batch retrieval endpoint"""
+    queries: List[str] = Field(..., min_length=1, max_length=256, description="Queries to search for")
+    k: Optional[int] = Field(default=None, ge=1, le=50, description="Chunks per query")
+
+class BatchRetrieveResponse(BaseModel):
+    """Response model for batch retrieval endpoint"""
+    results: List[Dict[str, Any]] = Field(..., description="Per query: the query and its ranked chunks with scores")
+    count: int = Field(..., description="Number of queries")
+    processing_time: float = Field(..., description="Processing time in seconds")
 
 class QualificationRequest(BaseModel):
     """Request model for qualification endpoint"""
@@ -159,6 +178,23 @@ async def health_check(
         logger.error(f"Health check failed: {e}")
         raise HTTPException(status_code=503, detail=f"System unhealthy: {str(e)}")
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics endpoint"""
+    metrics = get_metrics()
+    
+    if rag_chain is not None and rag_chain.vectorstore is not None:
+        try:
+            metrics.update_vectorstore_size(rag_chain.vectorstore._collection.count())
+        except Exception:
+            metrics.update_vectorstore_size(0)
+    metrics.rag_up.set(1 if rag_chain is not None else 0)
+    
+    return Response(
+        content=metrics.get_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(
     request: ChatRequest,
@@ -195,7 +231,8 @@ async def chat_endpoint(
             sources=result.get("source_documents", []),
             conversation_length=result.get("conversation_length", 0),
             timestamp=result["timestamp"],
-            processing_time=processing_time
+            processing_time=processing_time,
+            timings=result.get("timings")
         )
         
         # Add background task for analytics/logging
@@ -225,6 +262,66 @@ async def chat_endpoint(
             processing_time=processing_time
         )
 
+@app.post("/chat/stream")
+async def chat_stream_endpoint(
+    request: ChatRequest,
+    background_tasks: BackgroundTasks,
+    rag: BrainGenRAGChain = Depends(get_rag_chain_instance)
+):
+    """
+    Streaming chat endpoint (Server-Sent Events)
+    Emits retrieved sources first, then answer tokens as they arrive, then a final done event
+    """
+    if not request.message.strip():
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+    
+    logger.info(f"Processing streaming chat request for session {request.session_id}")
+    start_time = datetime.now(timezone.utc)
+    
+    async def event_stream():
+        # A disconnecting client stops this generator: close the turn (and its LLM stream) with it
+        async with aclosing(rag.astream_question(
+            question=request.message,
+            session_id=request.session_id,
+            metadata=request.metadata
+        )) as events:
+            async for event in events:
+                if event["event"] == "done":
+                    processing_time = (datetime.now(timezone.utc) - start_time).total_seconds()
+                    event["data"]["processing_time"] = processing_time
+                    background_tasks.add_task(
+                        log_conversation,
+                        request.session_id,
+                        request.message,
+                        event["data"]["answer"],
+                        processing_time
+                    )
+                yield sse_event(event["event"], event["data"])
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.post("/retrieve/batch", response_model=BatchRetrieveResponse)
+async def retrieve_batch_endpoint(
+    request: BatchRetrieveRequest,
+    rag: BrainGenRAGChain = Depends(get_rag_chain_instance)
+):
+    """Retrieve ranked knowledge base chunks for many queries in one call"""
+    if any(not query.strip() for query in request.queries):
+        raise HTTPException(status_code=400, detail="Queries cannot be empty")
+    
+    start_time = datetime.now(timezone.utc)
+    try:
+        results = await rag.retrieve_batch(request.queries, request.k)
+    except Exception as e:
+        logger.error(f"Error in batch retrieval: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch retrieval failed: {str(e)}")
+    
+    return BatchRetrieveResponse(
+        results=[{"query": query, "chunks": chunks} for query, chunks in zip(request.queries, results)],
+        count=len(results),
+        processing_time=(datetime.now(timezone.utc) - start_time).total_seconds()
+    )
+
 @app.post("/qualify", response_model=QualificationResponse)
 async def qualify_lead_endpoint(
     request: QualificationRequest,
@@ -271,7 +368,7 @@ async def get_conversation_history(
 ):
     """Get conversation history for a session"""
     try:
-        history = rag.get_conversation_history(session_id)
+        history = await rag.get_conversation_history(session_id)
         return {
             "session_id": session_id,
             "conversation_history": history,
@@ -289,7 +386,7 @@ async def clear_conversation(
 ):
     """Clear conversation history for a session"""
     try:
-        rag.clear_conversation(session_id)
+        await rag.clear_conversation(session_id)
         return {
             "message": f"Conversation cleared for session {session_id}",
             "timestamp": datetime.now(timezone.utc).isoformat()
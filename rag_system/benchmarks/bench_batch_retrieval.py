@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Batch retrieval throughput benchmark
+Compares one-query-at-a-time similarity_search with HybridSearcher.search_batch
+at several batch sizes and reports queries/second. Uses the uncached embedding
+model so every query pays for its forward pass
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import argparse
+import itertools
+import statistics
+import time
+from typing import Callable, List
+
+from config.settings import settings
+from relevance import load_questions
+from retrieval import HybridSearcher, RETRIEVAL_MODES, VECTOR_STORE_TYPES
+from utils.embeddings_provider import get_local_embeddings
+from utils.knowledge_base import index_exists, open_vectorstore
+
+def throughput(run_batch: Callable[[List[str]], object], queries: List[str], batch_size: int):
+    """(queries/second, median seconds per batch) over all queries"""
+    run_batch(queries[:batch_size])  # warm up
+    durations = []
+    start = time.perf_counter()
+    for offset in range(0, len(queries), batch_size):
+        batch_start = time.perf_counter()
+        run_batch(queries[offset:offset + batch_size])
+        durations.append(time.perf_counter() - batch_start)
+    return len(queries) / (time.perf_counter() - start), statistics.median(durations)
+
+def run_benchmark(batch_sizes: List[int], total: int, k: int, modes: List[str], store_types: List[str]):
+    if not index_exists():
+        sys.exit("No index found: run `python utils/indexer.py` first")
+
+    embeddings = get_local_embeddings()
+    vectorstore = open_vectorstore(embeddings)
+    questions = [q["question"] for q in load_questions()]
+    # Cycle the labelled questions up to the requested total
+    queries = list(itertools.islice(itertools.cycle(questions), total))
+    print(
+        f"{total} queries, {vectorstore._collection.count()} chunks, k={k}, "
+        f"model={settings.embeddings_model_id}\n"
+    )
+
+    print(f"{'path':<34} {'batch':>6} {'queries/s':>10} {'ms/batch':>9}")
+    qps, per_batch = throughput(
+        lambda batch: [vectorstore.similarity_search(query, k=k) for query in batch], queries, 1
+    )
+    print(f"{'similarity_search (sequential)':<34} {1:>6} {qps:>10.1f} {per_batch * 1000:>9.1f}")
+
+    for store_type in store_types:
+        for mode in modes:
+            searcher = HybridSearcher(vectorstore, embeddings, mode=mode, vector_store_type=store_type)
+            label = f"search_batch {mode}/{searcher.dense_backend}"
+            for batch_size in batch_sizes:
+                qps, per_batch = throughput(lambda batch: searcher.search_batch(batch, k), queries, batch_size)
+                print(f"{label:<34} {batch_size:>6} {qps:>10.1f} {per_batch * 1000:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch retrieval throughput benchmark")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 16, 128])
+    parser.add_argument("--queries", type=int, default=256, help="Queries per measurement")
+    parser.add_argument("--k", type=int, default=settings.retrieval_k)
+    parser.add_argument("--modes", nargs="+", default=["dense", "hybrid"], choices=RETRIEVAL_MODES)
+    parser.add_argument("--vector-store-types", nargs="+", default=list(VECTOR_STORE_TYPES),
+                        choices=VECTOR_STORE_TYPES)
+    args = parser.parse_args()
+
+    run_benchmark(args.batch_sizes, args.queries, args.k, args.modes, args.vector_store_types)
+
+if __name__ == "__main__":
+    main()
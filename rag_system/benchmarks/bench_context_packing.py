@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Context packing report: character truncation vs token-budget packing
+For each labelled question, builds the context the old way (top 3 chunks
+joined and cut at 2000 characters) and with pack_context(), then reports
+prompt tokens, unique sentences carried, mid-sentence cuts and whether the
+answer made it into the context
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import argparse
+import statistics
+from typing import Callable, List
+
+from langchain_core.documents import Document
+
+from config.settings import settings, DOCUMENTS_DIR
+from relevance import load_questions, is_relevant
+from retrieval import BM25Index, count_tokens, pack_context
+from retrieval.context import SENTENCE_BOUNDARY, tokenizer_name
+from utils.ingestion import load_and_split
+
+LEGACY_K = 3
+LEGACY_CHARS = 2000
+
+def document_searcher() -> Callable[[str, int], List[Document]]:
+    """BM25 over freshly split documents: runs without the vector index"""
+    index = BM25Index()
+    for path in sorted(DOCUMENTS_DIR.rglob("*.md")):
+        chunks, _, _ = load_and_split(str(path), settings.chunk_size, settings.chunk_overlap)
+        for chunk in chunks:
+            index.add(chunk.metadata["chunk_id"], chunk.page_content, chunk.metadata)
+    return lambda query, n: [index.get(chunk_id) for chunk_id, _ in index.search(query, n)]
+
+def index_searcher() -> Callable[[str, int], List[Document]]:
+    """The configured retrieval over the indexed knowledge base"""
+    from retrieval import HybridSearcher
+    from utils.embeddings_provider import get_embeddings
+    from utils.knowledge_base import open_vectorstore
+
+    embeddings = get_embeddings()
+    searcher = HybridSearcher(open_vectorstore(embeddings), embeddings)
+    return lambda query, n: [document for document, _ in searcher.search(query, n)]
+
+def sentences(text: str) -> List[str]:
+    return [" ".join(part.split()).lower() for part in SENTENCE_BOUNDARY.split(text) if part.strip()]
+
+def ends_mid_sentence(context: str, documents: List[Document]) -> bool:
+    """True when the context's last sentence is not a complete sentence of any retrieved chunk"""
+    context_sentences = sentences(context)
+    if not context_sentences:
+        return False
+    complete = {sentence for document in documents for sentence in sentences(document.page_content)}
+    return context_sentences[-1] not in complete
+
+def run_report(source: str, token_budget: int, verbose: bool):
+    from working_server import create_enhanced_rag_prompt
+
+    search = index_searcher() if source == "index" else document_searcher()
+    questions = load_questions()
+    candidates = max(LEGACY_K, settings.context_candidates)
+    print(
+        f"{len(questions)} questions, retrieval: {source}, tokenizer: {tokenizer_name()}, "
+        f"budget {token_budget} tokens from {candidates} candidates\n"
+    )
+
+    rows = {"before": [], "after": []}
+    for question in questions:
+        documents = search(question["question"], candidates)
+
+        legacy = "\n\n".join(document.page_content for document in documents[:LEGACY_K])[:LEGACY_CHARS]
+        legacy_parts = [(document.metadata.get("source", ""), document.page_content) for document in documents[:LEGACY_K]]
+        packed = pack_context(documents, token_budget)
+        packed_parts = [(document.metadata["source"], document.page_content) for document in packed["documents"]]
+
+        for label, context, parts in (("before", legacy, legacy_parts), ("after", packed["text"], packed_parts)):
+            context_sentences = sentences(context)
+            prompt = create_enhanced_rag_prompt(question["question"], context, "", "")
+            rows[label].append({
+                "context_tokens": count_tokens(context),
+                "prompt_tokens": count_tokens(prompt),
+                "unique_sentences": len(set(context_sentences)),
+                "repeated_sentences": len(context_sentences) - len(set(context_sentences)),
+                "cut": ends_mid_sentence(context, documents),
+                # The legacy cut may drop the relevant chunk's text: check what survived
+                "answered": any(
+                    is_relevant(part_source, text, question) and text[:200] in context
+                    for part_source, text in parts
+                )
+            })
+        if verbose:
+            before, after = rows["before"][-1], rows["after"][-1]
+            print(
+                f"{before['prompt_tokens']:>5} -> {after['prompt_tokens']:<5} "
+                f"{before['unique_sentences']:>3} -> {after['unique_sentences']:<3} {question['question']}"
+            )
+
+    if verbose:
+        print()
+    print(f"{'':<8} {'prompt tok':>10} {'context tok':>11} {'unique sent':>11} {'repeated':>8} {'cut':>5} {'answer':>7}")
+    for label, results in rows.items():
+        print(
+            f"{label:<8} "
+            f"{statistics.mean(r['prompt_tokens'] for r in results):>10.1f} "
+            f"{statistics.mean(r['context_tokens'] for r in results):>11.1f} "
+            f"{statistics.mean(r['unique_sentences'] for r in results):>11.1f} "
+            f"{sum(r['repeated_sentences'] for r in results):>8} "
+            f"{sum(r['cut'] for r in results):>5} "
+            f"{sum(r['answered'] for r in results) / len(results):>7.2f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt tokens before/after token-budget context packing")
+    parser.add_argument("--source", choices=["index", "documents"], default="documents",
+                        help="Retrieve from the vector index, or BM25 over freshly split documents")
+    parser.add_argument("--budget", type=int, default=settings.context_token_budget)
+    parser.add_argument("--verbose", action="store_true", help="Per-question prompt tokens and unique sentences")
+    args = parser.parse_args()
+
+    run_report(args.source, args.budget, args.verbose)
+
+if __name__ == "__main__":
+    main()
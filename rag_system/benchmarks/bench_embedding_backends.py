@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Embedding backend benchmark: sentence-transformers (PyTorch) vs ONNX fp32 vs ONNX int8
+Measures indexing throughput and query latency on the vectorstore/documents
+corpus, and checks recall parity of each backend against the PyTorch model
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import argparse
+import statistics
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from config.settings import settings, DOCUMENTS_DIR
+from relevance import load_questions, first_relevant_rank
+
+def load_chunks() -> List[Dict[str, str]]:
+    """Split the document corpus exactly like the indexer does"""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=settings.chunk_size,
+        chunk_overlap=settings.chunk_overlap,
+        separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""],
+        length_function=len
+    )
+    chunks = []
+    for path in sorted(DOCUMENTS_DIR.rglob("*.md")):
+        source = str(path.relative_to(DOCUMENTS_DIR))
+        for text in splitter.split_text(path.read_text(encoding="utf-8")):
+            chunks.append({"source": source, "text": text})
+    return chunks
+
+def load_backend(name: str):
+    if name == "pytorch":
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(
+            model_name=settings.embeddings_model,
+            model_kwargs={'device': 'cpu'},
+            encode_kwargs={'normalize_embeddings': True, 'batch_size': settings.embeddings_batch_size}
+        )
+    from utils.onnx_embeddings import ONNXEmbeddings
+    return ONNXEmbeddings(quantize=(name == "onnx-int8"), normalize=True)
+
+def top_k(doc_vectors: np.ndarray, query_vectors: np.ndarray, k: int) -> np.ndarray:
+    scores = query_vectors @ doc_vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+def labelled_recall(ranked: np.ndarray, chunks: List[Dict[str, str]], questions: List[Dict]) -> float:
+    """Fraction of questions with at least one relevant chunk in the top k"""
+    found = sum(
+        1 for row, question in zip(ranked, questions)
+        if first_relevant_rank([chunks[index] for index in row], question)
+    )
+    return found / len(questions)
+
+def run_benchmark(backends: List[str], k: int, query_repeats: int):
+    chunks = load_chunks()
+    questions = load_questions()
+    texts = [chunk["text"] for chunk in chunks]
+    print(f"Corpus: {len(chunks)} chunks from {DOCUMENTS_DIR}, {len(questions)} questions, k={k}\n")
+
+    results = {}
+    for name in backends:
+        load_start = time.perf_counter()
+        embeddings = load_backend(name)
+        load_time = time.perf_counter() - load_start
+
+        embeddings.embed_documents(texts[:4])  # warm up
+        index_start = time.perf_counter()
+        doc_vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+        index_time = time.perf_counter() - index_start
+
+        query_vectors, latencies = [], []
+        for question in questions:
+            for _ in range(query_repeats):
+                start = time.perf_counter()
+                vector = embeddings.embed_query(question["question"])
+                latencies.append(time.perf_counter() - start)
+            query_vectors.append(vector)
+
+        results[name] = {
+            "load_time": load_time,
+            "chunks_per_second": len(texts) / index_time,
+            "query_p50_ms": statistics.median(latencies) * 1000,
+            "doc_vectors": doc_vectors,
+            "query_vectors": np.asarray(query_vectors, dtype=np.float32)
+        }
+
+    reference = results.get("pytorch") or results[backends[0]]
+    reference_top = top_k(reference["doc_vectors"], reference["query_vectors"], k)
+
+    print(f"{'backend':<11} {'load s':>7} {'chunks/s':>9} {'query p50 ms':>13} {'recall@k':>9} {'parity@k':>9} {'cos vs ref':>11}")
+    for name, result in results.items():
+        ranked = top_k(result["doc_vectors"], result["query_vectors"], k)
+        parity = np.mean([
+            len(set(row) & set(ref_row)) / k for row, ref_row in zip(ranked, reference_top)
+        ])
+        cosine = float(np.mean(np.sum(result["doc_vectors"] * reference["doc_vectors"], axis=1)))
+        print(
+            f"{name:<11} {result['load_time']:>7.1f} {result['chunks_per_second']:>9.1f} "
+            f"{result['query_p50_ms']:>13.1f} {labelled_recall(ranked, chunks, questions):>9.2f} "
+            f"{parity:>9.2f} {cosine:>11.4f}"
+        )
+    print("\nparity@k: overlap of each backend's top-k with the PyTorch top-k (1.00 = identical rankings)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding backend speed/recall benchmark")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=["pytorch", "onnx-fp32", "onnx-int8"],
+        choices=["pytorch", "onnx-fp32", "onnx-int8"]
+    )
+    parser.add_argument("--k", type=int, default=settings.retrieval_k)
+    parser.add_argument("--query-repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    run_benchmark(args.backends, args.k, args.query_repeats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+LLM admission control benchmark
+A burst of background (qualification) requests lands on a rate limited fake
+Groq API while interactive chat requests keep arriving at a steady rate.
+Compares plain ChatGroq clients (the SDK retries 429s on its own), admission
+control that only reacts to 429s (AIMD + Retry-After pause) and admission
+control that also knows the provider's request budget. Reports provider
+429s, failed and shed requests, and latency per lane
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "fake-groq-key")
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+from fake_groq import FakeGroqServer
+
+MODES = ("none", "adaptive", "budget")
+
+def build_models(mode: str, base_url: str, rpm: int, burst: int) -> Dict[str, object]:
+    """Interactive and background chat models for a mode"""
+    from config.settings import settings
+
+    if mode == "none":
+        from langchain_groq import ChatGroq
+
+        return {
+            lane: ChatGroq(
+                groq_api_key="fake-groq-key",
+                groq_api_base=base_url,
+                model_name=settings.llm_model,
+                max_tokens=300,
+                max_retries=2
+            )
+            for lane in ("interactive", "background")
+        }
+
+    from utils.llm_admission import RateBudget
+    from utils.llm_clients import get_admission_controller, get_chat_model
+
+    settings.llm_requests_per_minute = rpm if mode == "budget" else 0
+    if mode == "budget":
+        get_admission_controller().requests = RateBudget(rpm, burst)
+    return {
+        lane: get_chat_model(groq_api_base=base_url, max_tokens=300, max_retries=2, priority=lane)
+        for lane in ("interactive", "background")
+    }
+
+async def timed_call(model, lane: str, index: int, delay: float) -> Dict:
+    await asyncio.sleep(delay)
+    started = time.perf_counter()
+    try:
+        await model.ainvoke(f"{lane} request {index}: what do you offer?")
+        outcome = "ok"
+    except Exception as e:
+        outcome = "shed" if "admission_rejected" in str(e) else "failed"
+    return {"lane": lane, "outcome": outcome, "seconds": time.perf_counter() - started}
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+async def run_mode(mode: str, args) -> Dict:
+    from utils.llm_clients import aclose_llm_clients
+
+    with FakeGroqServer(
+        delay=args.delay, token_delay=0.0, rate_limit_rpm=args.rpm, rate_limit_burst=args.burst
+    ) as fake_groq:
+        models = build_models(mode, fake_groq.base_url, args.rpm, args.burst)
+        started = time.perf_counter()
+        calls = [timed_call(models["background"], "background", i, 0.0) for i in range(args.background)]
+        calls += [
+            timed_call(models["interactive"], "interactive", i, i / args.interactive_rate)
+            for i in range(args.interactive)
+        ]
+        rows = await asyncio.gather(*calls)
+        wall = time.perf_counter() - started
+        throttled = fake_groq.app.state.throttled
+    await aclose_llm_clients()
+
+    summary = {"mode": mode, "throttled": throttled, "wall": wall}
+    for outcome in ("failed", "shed"):
+        summary[outcome] = sum(row["outcome"] == outcome for row in rows)
+    for lane in ("interactive", "background"):
+        ok = [row["seconds"] * 1000 for row in rows if row["lane"] == lane and row["outcome"] == "ok"]
+        summary[f"{lane}_p50"] = statistics.median(ok) if ok else float("nan")
+        summary[f"{lane}_p95"] = percentile(ok, 0.95)
+    return summary
+
+async def run_benchmark(args):
+    print(
+        f"provider limit {args.rpm} rpm (burst {args.burst}), {args.delay * 1000:.0f} ms per completion; "
+        f"{args.background} background at t=0, {args.interactive} interactive at {args.interactive_rate}/s\n"
+    )
+    print(
+        f"{'admission':<10} {'429s':>6} {'failed':>7} {'shed':>5} "
+        f"{'interactive p50/p95 ms':>23} {'background p50/p95 ms':>22} {'wall s':>7}"
+    )
+    for mode in args.modes:
+        s = await run_mode(mode, args)
+        print(
+            f"{mode:<10} {s['throttled']:>6} {s['failed']:>7} {s['shed']:>5} "
+            f"{s['interactive_p50']:>11.0f} / {s['interactive_p95']:<9.0f} "
+            f"{s['background_p50']:>10.0f} / {s['background_p95']:<9.0f} {s['wall']:>7.1f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM admission control under a provider rate limit")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES,
+                        help="none: plain ChatGroq clients; adaptive: AIMD only; budget: AIMD + known RPM")
+    parser.add_argument("--rpm", type=int, default=600, help="Provider requests per minute")
+    parser.add_argument("--burst", type=int, default=10, help="Provider bucket size")
+    parser.add_argument("--delay", type=float, default=0.3, help="Seconds per completion")
+    parser.add_argument("--background", type=int, default=40)
+    parser.add_argument("--interactive", type=int, default=40)
+    parser.add_argument("--interactive-rate", type=float, default=8.0, help="Interactive requests per second")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args))
+
+if __name__ == "__main__":
+    main()
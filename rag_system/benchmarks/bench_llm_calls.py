@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+LLM calls per chat turn: condensing every follow-up versus the heuristic
+Replays the scripted conversations in data/conversations.json through
+BrainGenRAGChain.ask_question against the local fake Groq API and counts the
+completions each turn requested. Retrieval is BM25 over freshly split
+documents, so neither the vector index nor an embedding model is needed
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "fake-groq-key")
+
+import argparse
+import asyncio
+import json
+import statistics
+from typing import Dict, List
+
+from fake_groq import FakeGroqServer
+
+CONVERSATIONS_FILE = Path(__file__).parent / "data" / "conversations.json"
+
+class DocumentSearcher:
+    """BM25 over freshly split documents, with the HybridSearcher.search signature"""
+
+    def __init__(self):
+        from config.settings import settings, DOCUMENTS_DIR
+        from retrieval import BM25Index
+        from utils.ingestion import load_and_split
+
+        self.index = BM25Index()
+        for path in sorted(DOCUMENTS_DIR.rglob("*.md")):
+            chunks, _, _ = load_and_split(str(path), settings.chunk_size, settings.chunk_overlap)
+            for chunk in chunks:
+                self.index.add(chunk.metadata["chunk_id"], chunk.page_content, chunk.metadata)
+
+    def search(self, query: str, k: int, query_embedding=None):
+        return [(self.index.get(chunk_id), score) for chunk_id, score in self.index.search(query, k)]
+
+def build_chain(base_url: str):
+    """BrainGenRAGChain with injected components: no embedding model or vector index"""
+    from chains.rag_chain import BrainGenRAGChain
+    from utils.llm_clients import get_chat_model
+    from utils.kb_version import KBVersionMonitor
+    from utils.fake_redis import FakeRedis
+    from utils.session_manager import SessionManager
+
+    chain = BrainGenRAGChain.__new__(BrainGenRAGChain)
+    chain.llm = get_chat_model(groq_api_base=base_url, max_retries=0)
+    chain.searcher = DocumentSearcher()
+    chain.session_manager = SessionManager(redis_client=FakeRedis())
+    chain.kb_monitor = KBVersionMonitor()
+    chain.business_prompt = chain._create_business_prompt()
+    chain.condense_prompt = chain._create_condense_prompt()
+    return chain
+
+async def replay(chain, fake_groq, conversations: List[Dict], mode: str) -> List[Dict]:
+    """One row per turn: LLM calls, whether it was condensed, whether it is a labelled follow-up"""
+    from chains.condense import condense_decision, needs_condensing
+    from config.settings import settings
+
+    settings.condense_mode = mode
+    rows = []
+    for conversation in conversations:
+        session_id = f"llm-calls-{mode}-{conversation['name']}"
+        await chain.session_manager.clear_session(session_id)
+        for turn in conversation["turns"]:
+            history = (await chain.session_manager.get_session_history(session_id)).tail()
+            decision = condense_decision(turn["message"], history)
+            before = fake_groq.app.state.requests
+            result = await chain.ask_question(turn["message"], session_id)
+            if "error" in result:
+                raise RuntimeError(result["error"])
+            rows.append({
+                "calls": fake_groq.app.state.requests - before,
+                "condensed": needs_condensing(decision),
+                "follow_up": turn["follow_up"] and bool(history)
+            })
+    return rows
+
+async def run_benchmark(modes: List[str]):
+    conversations = json.loads(CONVERSATIONS_FILE.read_text(encoding="utf-8"))
+    turns = sum(len(conversation["turns"]) for conversation in conversations)
+    print(f"{len(conversations)} conversations, {turns} turns\n")
+
+    with FakeGroqServer(delay=0.0, token_delay=0.0) as fake_groq:
+        chain = build_chain(fake_groq.base_url)
+        print(f"{'condense mode':<14} {'LLM calls/turn':>14} {'condensed':>10} {'missed follow-ups':>18} {'unneeded':>9}")
+        for mode in modes:
+            rows = await replay(chain, fake_groq, conversations, mode)
+            print(
+                f"{mode:<14} "
+                f"{statistics.mean(row['calls'] for row in rows):>14.2f} "
+                f"{sum(row['condensed'] for row in rows):>10} "
+                f"{sum(row['follow_up'] and not row['condensed'] for row in rows):>18} "
+                f"{sum(row['condensed'] and not row['follow_up'] for row in rows):>9}"
+            )
+
+def main():
+    from chains.condense import CONDENSE_MODES
+
+    parser = argparse.ArgumentParser(description="LLM calls per chat turn by condense mode")
+    parser.add_argument("--modes", nargs="+", default=["always", "auto"], choices=CONDENSE_MODES,
+                        help="always: ConversationalRetrievalChain behaviour, condense every turn with history")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.modes))
+
+if __name__ == "__main__":
+    main()
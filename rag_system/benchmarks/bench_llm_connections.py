@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+LLM connection reuse benchmark
+Sends the same concurrent request mix (chat, streamed chat, qualification
+and server configurations) to the local fake Groq API through four
+independently built ChatGroq clients, as before utils/llm_clients.py, and
+through the shared pool. Reports TCP connections opened (each one a TLS
+handshake against the real API) and request latency
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "fake-groq-key")
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+from fake_groq import FakeGroqServer
+
+# (temperature, max_tokens, timeout, max_retries, streaming) of the chains and servers
+CONFIGURATIONS = {
+    "rag_chain": (0.3, 2048, 60, 3, True),
+    "qualification": (0.1, 1500, 30, 2, False),
+    "working_server": (0.3, 1000, None, 2, False),
+    "simple_server": (0.3, 1000, 30, 2, False)
+}
+
+def separate_clients(base_url: str) -> Dict[str, object]:
+    from langchain_groq import ChatGroq
+    from config.settings import settings
+
+    return {
+        name: ChatGroq(
+            groq_api_key="fake-groq-key",
+            groq_api_base=base_url,
+            model_name=settings.llm_model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            max_retries=max_retries,
+            streaming=streaming
+        )
+        for name, (temperature, max_tokens, timeout, max_retries, streaming) in CONFIGURATIONS.items()
+    }
+
+def shared_clients(base_url: str) -> Dict[str, object]:
+    from utils.llm_clients import get_chat_model
+
+    return {
+        name: get_chat_model(
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            max_retries=max_retries,
+            streaming=streaming,
+            groq_api_base=base_url
+        )
+        for name, (temperature, max_tokens, timeout, max_retries, streaming) in CONFIGURATIONS.items()
+    }
+
+async def run_mix(clients: Dict[str, object], concurrency: int, rounds: int) -> List[float]:
+    """`concurrency` workers, each cycling through the configurations `rounds` times"""
+    latencies: List[float] = []
+
+    async def worker(offset: int):
+        names = list(clients)
+        for i in range(rounds * len(names)):
+            llm = clients[names[(offset + i) % len(names)]]
+            start = time.perf_counter()
+            if llm.streaming:
+                async for _ in llm.astream("What AI services do you offer?"):
+                    pass
+            else:
+                await llm.ainvoke("What AI services do you offer?")
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+    return latencies
+
+async def run_benchmark(concurrency: int, rounds: int, delay: float):
+    from utils.llm_clients import http2_available
+
+    print(
+        f"{concurrency} concurrent workers x {rounds} rounds over {len(CONFIGURATIONS)} client configurations, "
+        f"fake Groq delay {delay * 1000:.0f} ms, HTTP/2 available: {http2_available()}\n"
+    )
+    print(f"{'clients':<10} {'requests':>9} {'connections':>12} {'p50 ms':>8} {'p95 ms':>8}")
+    for label, build in (("separate", separate_clients), ("shared", shared_clients)):
+        with FakeGroqServer(delay=delay, token_delay=0.0) as fake_groq:
+            latencies = await run_mix(build(fake_groq.base_url), concurrency, rounds)
+            connections = len(fake_groq.app.state.client_ports)
+        latencies.sort()
+        print(
+            f"{label:<10} {len(latencies):>9} {connections:>12} "
+            f"{statistics.median(latencies) * 1000:>8.1f} {latencies[int(len(latencies) * 0.95) - 1] * 1000:>8.1f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM connection reuse: separate clients vs shared pool")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.05, help="Fake Groq delay before answering")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.concurrency, args.rounds, args.delay))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Retrieval relevance benchmark: dense vs sparse (BM25) vs hybrid (RRF)
+Runs the labelled questions in benchmarks/data/retrieval_questions.json
+against the indexed knowledge base and reports recall@k, MRR and latency,
+optionally with cross-encoder re-ranking on top of each mode
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import argparse
+import statistics
+import time
+from typing import List
+
+from config.settings import settings
+from relevance import load_questions, first_relevant_rank
+from retrieval import HybridSearcher, RETRIEVAL_MODES, get_reranker, retrieve_reranked
+from utils.embeddings_provider import get_embeddings
+from utils.knowledge_base import index_exists, open_vectorstore
+
+def run_benchmark(modes: List[str], k: int, repeats: int, verbose: bool, rerank: bool):
+    if not index_exists():
+        sys.exit("No index found: run `python utils/indexer.py` first")
+    if rerank:
+        settings.rerank_enabled = True
+        if get_reranker() is None:
+            sys.exit("Cross-encoder could not be loaded")
+
+    embeddings = get_embeddings()
+    vectorstore = open_vectorstore(embeddings)
+    questions = load_questions()
+
+    # Embed every question up front: latency below is retrieval only
+    query_embeddings = embeddings.embed_documents([q["question"] for q in questions])
+    print(
+        f"{len(questions)} questions, {vectorstore._collection.count()} chunks, k={k}, "
+        f"rrf_k={settings.rrf_k}, candidates={settings.hybrid_candidates}\n"
+    )
+
+    print(f"{'mode':<14} {'recall@k':>9} {'MRR':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    variants = [(mode, False) for mode in modes]
+    if rerank:
+        variants += [(mode, True) for mode in modes]
+    for mode, reranked in variants:
+        searcher = HybridSearcher(vectorstore, embeddings, mode=mode)
+        ranks, latencies, misses = [], [], []
+
+        for question, query_embedding in zip(questions, query_embeddings):
+            for _ in range(repeats):
+                start = time.perf_counter()
+                if reranked:
+                    results = retrieve_reranked(searcher, question["question"], query_embedding=query_embedding)[:k]
+                else:
+                    results = searcher.search(question["question"], k, query_embedding=query_embedding)
+                latencies.append(time.perf_counter() - start)
+
+            rank = first_relevant_rank(
+                [{"source": doc.metadata.get("source", ""), "text": doc.page_content} for doc, _ in results],
+                question
+            )
+            ranks.append(rank)
+            if not rank:
+                misses.append(question["question"])
+
+        latencies.sort()
+        recall = sum(1 for rank in ranks if rank) / len(ranks)
+        mrr = sum(1 / rank for rank in ranks if rank) / len(ranks)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        label = f"{mode}+rerank" if reranked else mode
+        print(
+            f"{label:<14} {recall:>9.2f} {mrr:>6.2f} "
+            f"{statistics.median(latencies) * 1000:>8.2f} {p95 * 1000:>8.2f}"
+        )
+        if verbose and misses:
+            for question in misses:
+                print(f"        miss: {question}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Dense / sparse / hybrid retrieval relevance benchmark")
+    parser.add_argument("--modes", nargs="+", default=list(RETRIEVAL_MODES), choices=RETRIEVAL_MODES)
+    parser.add_argument("--k", type=int, default=settings.retrieval_k)
+    parser.add_argument("--repeats", type=int, default=5, help="Timed searches per question")
+    parser.add_argument("--verbose", action="store_true", help="List questions with no relevant chunk in the top k")
+    parser.add_argument("--rerank", action="store_true", help="Also run each mode with cross-encoder re-ranking")
+    parser.add_argument("--rerank-budget-ms", type=float, default=settings.rerank_budget_ms)
+    args = parser.parse_args()
+
+    settings.rerank_budget_ms = args.rerank_budget_ms
+    run_benchmark(args.modes, args.k, args.repeats, args.verbose, args.rerank)
+
+if __name__ == "__main__":
+    main()
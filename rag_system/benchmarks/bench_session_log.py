@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Session history write cost: full rewrite versus append-only log
+Plays 1, 20 and 200-turn conversations through SessionManager against the
+in-process fake Redis. "rewrite" is the previous store (the whole history
+serialized to one JSON value on every turn), "append" the current one (the
+new message pair pushed onto a list trimmed to the memory window). Reports
+bytes written and save latency per turn, and the bytes a session load reads
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "fake-groq-key")
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from utils.fake_redis import FakeRedis
+from utils.session_manager import SessionManager
+
+USER_MESSAGE = "We run 40 warehouses and want to forecast demand per SKU. " * 2
+AI_RESPONSE = (
+    "BrainGenTechnology builds predictive analytics for logistics: demand forecasting, "
+    "inventory optimization and route planning, integrated with your WMS and ERP. "
+) * 6
+
+class RewriteSessionManager(SessionManager):
+    """The previous store: every turn rewrites the whole history as one JSON value"""
+
+    async def add_message_to_session(self, session_id: str, user_message: str, ai_response: str, metadata=None):
+        session = await self.load_session(session_id)
+        history, context = session["history"], session["context"]
+        history.add('human', user_message)
+        history.add('ai', ai_response)
+        self._apply_interaction(context, user_message, ai_response, metadata)
+
+        messages_data = [
+            {'type': message.type, 'content': message.content, 'timestamp': datetime.now().isoformat()}
+            for message in history
+        ]
+        ttl = timedelta(hours=24)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(f"session_memory:{session_id}", ttl, json.dumps(messages_data))
+            pipe.setex(f"session_context:{session_id}", ttl, json.dumps(context, default=str))
+            await pipe.execute()
+
+def stored_history_bytes(redis: FakeRedis, session_id: str) -> int:
+    """Bytes a session load reads for the history"""
+    value = redis._data.get(f"session_memory:{session_id}") or redis._data.get(f"session_log:{session_id}") or []
+    return sum(len(item.encode("utf-8")) for item in ([value] if isinstance(value, str) else value))
+
+async def play(store: str, turns: int, latency: float) -> Dict:
+    redis = FakeRedis(latency=latency)
+    manager_class = RewriteSessionManager if store == "rewrite" else SessionManager
+    manager = manager_class(redis_client=redis)
+    session_id = f"{store}-{turns}"
+    await manager.load_session(session_id)
+
+    written: List[int] = []
+    seconds: List[float] = []
+    for turn in range(turns):
+        before = redis.bytes_written
+        started = time.perf_counter()
+        await manager.add_message_to_session(session_id, f"{turn}: {USER_MESSAGE}", AI_RESPONSE)
+        seconds.append(time.perf_counter() - started)
+        written.append(redis.bytes_written - before)
+
+    return {
+        "store": store,
+        "turns": turns,
+        "bytes_mean": statistics.mean(written),
+        "bytes_last": written[-1],
+        "bytes_total": sum(written),
+        "ms_mean": statistics.mean(seconds) * 1000,
+        "ms_last": seconds[-1] * 1000,
+        "load_bytes": stored_history_bytes(redis, session_id)
+    }
+
+async def run_benchmark(turn_counts: List[int], latency: float):
+    from config.settings import settings
+    from utils.session_manager import history_limit
+
+    # Time each turn's own write, not a batched write-behind flush
+    settings.session_write_behind_seconds = 0
+
+    print(f"fake Redis round trip {latency * 1000:.1f} ms, history window {history_limit()} messages\n")
+    print(
+        f"{'turns':>6} {'store':<8} {'bytes/turn':>11} {'last turn':>10} {'conversation':>13} "
+        f"{'save ms':>8} {'last ms':>8} {'load bytes':>11}"
+    )
+    for turns in turn_counts:
+        for store in ("rewrite", "append"):
+            r = await play(store, turns, latency)
+            print(
+                f"{r['turns']:>6} {r['store']:<8} {r['bytes_mean']:>11,.0f} {r['bytes_last']:>10,} "
+                f"{r['bytes_total']:>13,} {r['ms_mean']:>8.2f} {r['ms_last']:>8.2f} {r['load_bytes']:>11,}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description="Session history bytes and latency per turn")
+    parser.add_argument("--turns", nargs="+", type=int, default=[1, 20, 200])
+    parser.add_argument("--latency", type=float, default=0.0005, help="Simulated Redis round trip in seconds")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.turns, args.latency))
+
+if __name__ == "__main__":
+    main()
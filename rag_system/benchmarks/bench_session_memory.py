@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Per-session memory overhead: LangChain window memory versus compact history
+Builds N warm sessions holding a full history window each and measures the
+allocated bytes with tracemalloc. "langchain" is the previous representation
+(ConversationBufferWindowMemory holding HumanMessage / AIMessage objects),
+"compact" the current one (SessionHistory ring of __slots__ ChatMessages).
+Message strings are created before measuring, so the numbers are the
+per-session overhead on top of the text itself; projected to 100k sessions
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "fake-groq-key")
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from utils.chat_history import SessionHistory
+
+PROJECTED_SESSIONS = 100_000
+REPRESENTATIONS = ("langchain", "compact")
+
+def langchain_session(limit: int, messages: List[str]):
+    from langchain.memory import ConversationBufferWindowMemory
+
+    memory = ConversationBufferWindowMemory(
+        k=limit // 2,
+        memory_key="chat_history",
+        return_messages=True,
+        output_key="answer"
+    )
+    for i, content in enumerate(messages):
+        if i % 2 == 0:
+            memory.chat_memory.add_user_message(content)
+        else:
+            memory.chat_memory.add_ai_message(content)
+    del memory.chat_memory.messages[:-limit]
+    return memory
+
+def compact_session(limit: int, messages: List[str]):
+    history = SessionHistory(limit)
+    for i, content in enumerate(messages):
+        history.add("human" if i % 2 == 0 else "ai", content)
+    return history
+
+BUILDERS: Dict[str, Callable] = {"langchain": langchain_session, "compact": compact_session}
+
+def measure(representation: str, sessions: int, limit: int, turns: int) -> Dict:
+    build = BUILDERS[representation]
+    build(limit, ["warm-up"] * 2)  # Imports and class setup outside the measurement
+    texts = [[f"session {s} message {m}: " + "x" * 200 for m in range(turns * 2)] for s in range(sessions)]
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    kept = [build(limit, messages) for messages in texts]
+    seconds = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    messages = sum(len(list(session.chat_memory.messages if representation == "langchain" else session)) for session in kept)
+    del kept
+    return {
+        "representation": representation,
+        "per_session": current / sessions,
+        "per_message": current / messages,
+        "build_us": seconds / sessions * 1e6,
+        "projected_mb": current / sessions * PROJECTED_SESSIONS / 1e6
+    }
+
+def main():
+    from utils.session_manager import history_limit
+
+    parser = argparse.ArgumentParser(description="Per-session memory of the chat history representation")
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--turns", type=int, default=None, help="Exchanges per session (default: the full window)")
+    args = parser.parse_args()
+
+    limit = history_limit()
+    turns = args.turns or limit // 2
+    print(f"{args.sessions:,} sessions, {turns} exchanges each, window {limit} messages; text excluded\n")
+    print(f"{'history':<10} {'bytes/session':>14} {'bytes/message':>14} {'build us':>9} {f'{PROJECTED_SESSIONS:,} sessions':>17}")
+    for representation in REPRESENTATIONS:
+        r = measure(representation, args.sessions, limit, turns)
+        print(
+            f"{r['representation']:<10} {r['per_session']:>14,.0f} {r['per_message']:>14,.0f} "
+            f"{r['build_us']:>9.1f} {r['projected_mb']:>13,.0f} MB"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Speculative retrieval benchmark
+Replays data/conversations.json through BrainGenRAGChain.ask_question with
+and without settings.speculative_retrieval. A scripted in-process LLM answers
+condense prompts after a fixed delay, with the turn's labelled standalone
+question (or the message itself when it is self-contained). Reports the
+condense + retrieve latency of condensed turns, the speculative hit rate and
+how often a reused result has the same top chunks as the search for the
+condensed question
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+from bench_llm_calls import CONVERSATIONS_FILE, DocumentSearcher
+
+class ScriptedLLM:
+    """Answers condense prompts with the labelled standalone question, after a delay"""
+
+    FOLLOW_UP_INPUT = re.compile(r"Follow Up Input: (.*)\nStandalone question:")
+
+    def __init__(self, standalone: Dict[str, str], delay: float):
+        self.standalone = standalone
+        self.delay = delay
+
+    async def ainvoke(self, prompt: str):
+        await asyncio.sleep(self.delay)
+        match = self.FOLLOW_UP_INPUT.search(prompt)
+        if match is None:
+            return SimpleNamespace(content="Happy to help.")
+        return SimpleNamespace(content=self.standalone.get(match.group(1), match.group(1)))
+
+class SlowSearcher:
+    """Adds a fixed cost to every search, standing in for query embedding and re-ranking"""
+
+    def __init__(self, searcher, delay: float):
+        self.searcher = searcher
+        self.delay = delay
+
+    def search(self, query: str, k: int, query_embedding=None):
+        time.sleep(self.delay)
+        return self.searcher.search(query, k, query_embedding=query_embedding)
+
+def build_chain(source: str, llm: ScriptedLLM, retrieval_delay: float):
+    """BrainGenRAGChain with injected components"""
+    from chains.rag_chain import BrainGenRAGChain
+    from utils.kb_version import KBVersionMonitor
+    from utils.fake_redis import FakeRedis
+    from utils.session_manager import SessionManager
+
+    chain = BrainGenRAGChain.__new__(BrainGenRAGChain)
+    chain.llm = llm
+    if source == "index":
+        from retrieval import HybridSearcher
+        from utils.embeddings_provider import get_embeddings
+        from utils.knowledge_base import open_vectorstore
+
+        embeddings = get_embeddings()
+        chain.searcher = HybridSearcher(open_vectorstore(embeddings), embeddings)
+    else:
+        chain.searcher = DocumentSearcher()
+    if retrieval_delay:
+        chain.searcher = SlowSearcher(chain.searcher, retrieval_delay)
+    chain.session_manager = SessionManager(redis_client=FakeRedis())
+    chain.kb_monitor = KBVersionMonitor()
+    chain.business_prompt = chain._create_business_prompt()
+    chain.condense_prompt = chain._create_condense_prompt()
+    return chain
+
+def top_sources(ranked, k: int) -> List[tuple]:
+    return [(doc.metadata.get("source"), doc.metadata.get("chunk_index")) for doc, _ in ranked[:k]]
+
+async def replay(chain, conversations: List[Dict], speculative: bool) -> List[Dict]:
+    """One row per condensed turn"""
+    from chains.condense import condense_decision, needs_condensing, query_overlap
+    from config.settings import settings
+
+    settings.speculative_retrieval = speculative
+    rows = []
+    for conversation in conversations:
+        session_id = f"speculative-{speculative}-{conversation['name']}"
+        await chain.session_manager.clear_session(session_id)
+        for turn in conversation["turns"]:
+            history = (await chain.session_manager.get_session_history(session_id)).tail()
+            condensed = needs_condensing(condense_decision(turn["message"], history))
+            result = await chain.ask_question(turn["message"], session_id)
+            if "error" in result:
+                raise RuntimeError(result["error"])
+            if not condensed:
+                continue
+            timings = result["timings"]
+            row = {"seconds": timings["condense"] + timings["retrieve"]}
+            if speculative:
+                # Replay the decision outside the timed turn to compare with the refined search
+                standalone = turn.get("standalone", turn["message"])
+                raw = await chain._retrieve(turn["message"])
+                refined = await chain._retrieve(standalone)
+                row["hit"] = query_overlap(turn["message"], standalone) >= settings.speculative_retrieval_min_overlap
+                row["same_top"] = set(top_sources(raw, settings.retrieval_k)) == set(top_sources(refined, settings.retrieval_k))
+            rows.append(row)
+    return rows
+
+async def run_benchmark(source: str, delay: float, retrieval_delay: float, rounds: int, condense_mode: str):
+    from config.settings import settings
+
+    conversations = json.loads(CONVERSATIONS_FILE.read_text(encoding="utf-8"))
+    standalone = {
+        turn["message"]: turn["standalone"]
+        for conversation in conversations for turn in conversation["turns"] if "standalone" in turn
+    }
+    settings.condense_mode = condense_mode
+    chain = build_chain(source, ScriptedLLM(standalone, delay), retrieval_delay)
+    print(
+        f"condense mode {condense_mode}, retrieval: {source} (+{retrieval_delay * 1000:.0f} ms), "
+        f"condense delay {delay * 1000:.0f} ms, min overlap {settings.speculative_retrieval_min_overlap}\n"
+    )
+
+    await replay(chain, conversations, False)  # warm up
+    print(f"{'speculative':<12} {'turns':>6} {'condense+retrieve ms':>21} {'hit rate':>9} {'hits with same top-k':>21}")
+    for speculative in (False, True):
+        rows = []
+        for _ in range(rounds):
+            rows.extend(await replay(chain, conversations, speculative))
+        median = statistics.median(row["seconds"] for row in rows) * 1000
+        if speculative:
+            hits = [row for row in rows if row["hit"]]
+            same = f"{sum(row['same_top'] for row in hits)}/{len(hits)}"
+            print(f"{'on':<12} {len(rows) // rounds:>6} {median:>21.1f} {len(hits) / len(rows):>9.2f} {same:>21}")
+        else:
+            print(f"{'off':<12} {len(rows) // rounds:>6} {median:>21.1f} {'':>9} {'':>21}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Speculative retrieval latency and hit rate")
+    parser.add_argument("--source", choices=["index", "documents"], default="documents",
+                        help="Retrieve from the vector index, or BM25 over freshly split documents")
+    parser.add_argument("--delay", type=float, default=0.3, help="Seconds the scripted LLM takes to condense")
+    parser.add_argument("--retrieval-delay", type=float, default=0.0,
+                        help="Seconds added to every search, e.g. for embedding and re-ranking")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--condense-mode", choices=["auto", "always"], default="auto")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.source, args.delay, args.retrieval_delay, args.rounds, args.condense_mode))
+
+if __name__ == "__main__":
+    main()
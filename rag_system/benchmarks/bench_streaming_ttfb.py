@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-byte benchmark: /chat versus /chat/stream
+Runs working_server in-process against the local fake Groq API
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "fake-groq-key")
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from fake_groq import FakeGroqServer, ThreadedServer
+
+async def measure_blocking(client: httpx.AsyncClient, session_id: str) -> float:
+    """Seconds until the complete /chat JSON response is received"""
+    start = time.perf_counter()
+    response = await client.post("/chat", json={"message": "What AI services do you offer?", "session_id": session_id})
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+async def measure_stream(client: httpx.AsyncClient, session_id: str) -> tuple:
+    """Seconds until the first token event and until the done event of /chat/stream"""
+    start = time.perf_counter()
+    first_token = None
+    async with client.stream("POST", "/chat/stream", json={"message": "What AI services do you offer?", "session_id": session_id}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line == "event: token" and first_token is None:
+                first_token = time.perf_counter() - start
+            elif line == "event: done":
+                break
+    return first_token, time.perf_counter() - start
+
+async def run_benchmark(delay: float, token_delay: float, rounds: int):
+    import working_server
+    from utils.llm_clients import get_chat_model
+    from utils.fake_redis import FakeRedis
+    from utils.session_manager import SessionManager
+
+    with FakeGroqServer(delay=delay, token_delay=token_delay) as fake_groq:
+        working_server.groq_llm = get_chat_model(groq_api_base=fake_groq.base_url, max_retries=0)
+        working_server.vectorstore = None
+        working_server.laravel_bridge = None
+        working_server.session_manager = SessionManager(redis_client=FakeRedis())
+        # Components are injected above: skip init_system on server startup
+        working_server.app.router.on_startup.clear()
+
+        # A real socket is required: ASGITransport buffers the whole response body
+        with ThreadedServer(working_server.app) as server:
+            async with httpx.AsyncClient(base_url=server.base_url, timeout=60) as client:
+                await measure_blocking(client, "warmup")
+
+                blocking, first_tokens, stream_totals = [], [], []
+                for i in range(rounds):
+                    blocking.append(await measure_blocking(client, f"ttfb-block-{i}"))
+                    first_token, total = await measure_stream(client, f"ttfb-stream-{i}")
+                    first_tokens.append(first_token)
+                    stream_totals.append(total)
+
+    print(f"{'endpoint':<14} {'first byte ms':>14} {'complete ms':>12}")
+    print(f"{'/chat':<14} {statistics.median(blocking) * 1000:>14.1f} {statistics.median(blocking) * 1000:>12.1f}")
+    print(f"{'/chat/stream':<14} {statistics.median(first_tokens) * 1000:>14.1f} {statistics.median(stream_totals) * 1000:>12.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming time-to-first-byte benchmark")
+    parser.add_argument("--delay", type=float, default=0.3, help="Fake Groq delay before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.03, help="Fake Groq delay between tokens")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.delay, args.token_delay, args.rounds))
+
+if __name__ == "__main__":
+    main()
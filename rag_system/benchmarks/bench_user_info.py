@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+User info extraction cost per message: keyword scans versus one compiled regex
+"legacy" is the previous SessionManager._extract_user_info (lowercase copy,
+an `in` scan per cue and keyword, split() around every cue found),
+"compiled" is utils.user_info_extractor. A "new" session searches every
+field; a "known" one already has name, company and industry, which both
+extractors then skip. Reports microseconds per message for short, long and
+very long messages, and the fields found
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "fake-groq-key")
+
+import argparse
+import time
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from utils.user_info_extractor import INDUSTRY_KEYWORDS, ONCE_FIELDS, TOPIC_KEYWORDS, extract_user_info
+
+FILLER = (
+    "We run a mid-sized distribution business with several warehouses and a growing "
+    "online channel, and our team spends a lot of time reconciling orders by hand. "
+)
+INTRODUCTION = "My name is Dana and I work at Northwind Traders, we are looking at predictive maintenance and pricing. "
+
+def legacy_extract(message: str, known: Iterable[str] = ()) -> Dict[str, Any]:
+    """The previous extraction, applied to a context holding only the known fields"""
+    context: Dict[str, Any] = {"user_info": dict.fromkeys(known, "known"), "topics_discussed": []}
+    lower = message.lower()
+    if "name" not in known:
+        for pattern in ["my name is", "i am", "i'm", "call me", "name's"]:
+            if pattern in lower:
+                parts = lower.split(pattern)
+                potential_name = parts[1].strip().split()[0] if parts[1].strip() else ""
+                if len(potential_name) > 1 and potential_name.isalpha():
+                    context["user_info"]["name"] = potential_name.title()
+                    break
+    if "company" not in known:
+        for pattern in ["my company", "our company", "we are", "work at", "work for", "i work at", "i work for", "company is"]:
+            if pattern in lower:
+                company_words = lower.split(pattern)[1].strip().split()[:3]
+                if company_words:
+                    context["user_info"]["company"] = " ".join(company_words).title()
+                    break
+    if "industry" not in known:
+        for keyword, industry in INDUSTRY_KEYWORDS.items():
+            if keyword in lower:
+                context["user_info"]["industry"] = industry
+                break
+    if "email" in lower or "@" in message:
+        context["user_info"]["contact_method"] = "email"
+    if any(word in lower for word in ["phone", "call", "mobile"]):
+        context["user_info"]["contact_method"] = "phone"
+    for keyword, topic in TOPIC_KEYWORDS.items():
+        if keyword in lower and topic not in context["topics_discussed"]:
+            context["topics_discussed"].append(topic)
+    found = {key: value for key, value in context["user_info"].items() if key not in known}
+    return {**found, "topics": context["topics_discussed"]}
+
+EXTRACTORS: Dict[str, Callable[..., Dict[str, Any]]] = {"legacy": legacy_extract, "compiled": extract_user_info}
+
+def build_message(chars: int) -> str:
+    """Filler business text of about `chars` characters, the introduction at the end"""
+    repeats = max(0, (chars - len(INTRODUCTION)) // len(FILLER))
+    return FILLER * repeats + INTRODUCTION
+
+def per_message_us(extract: Callable[..., Dict[str, Any]], message: str, known: Tuple[str, ...], seconds: float) -> float:
+    runs = 0
+    started = time.perf_counter()
+    while True:
+        for _ in range(50):
+            extract(message, known)
+        runs += 50
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            return elapsed / runs * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="User info extraction microseconds per message")
+    parser.add_argument("--chars", nargs="+", type=int, default=[200, 2_000, 20_000], help="Message lengths")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Timing budget per extractor and length")
+    args = parser.parse_args()
+
+    print(f"{'chars':>7} {'session':<8} {'extractor':<9} {'us/message':>11}  found")
+    for chars in args.chars:
+        message = build_message(chars)
+        for session, known in (("new", ()), ("known", ONCE_FIELDS)):
+            for name, extract in EXTRACTORS.items():
+                found = extract(message, known)
+                fields = ", ".join(f"{key}={value}" for key, value in found.items() if value)
+                us = per_message_us(extract, message, known, args.seconds)
+                print(f"{len(message):>7,} {session:<8} {name:<9} {us:>11.1f}  {fields}")
+
+if __name__ == "__main__":
+    main()
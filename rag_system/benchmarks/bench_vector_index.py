@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Vector search benchmark: Chroma similarity_search vs the in-process NumPy index
+Runs the labelled questions against the indexed knowledge base and reports
+per-query latency, top-k agreement with Chroma and index load time. With
+--synthetic, times the NumPy index alone on random embeddings of a given size
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+import numpy as np
+
+def percentiles(latencies: List[float]) -> str:
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return f"{statistics.median(latencies) * 1000:>8.3f} {p95 * 1000:>8.3f}"
+
+def time_queries(search: Callable, queries: list, repeats: int) -> List[float]:
+    latencies = []
+    for query in queries:
+        search(query)  # warm up
+        for _ in range(repeats):
+            start = time.perf_counter()
+            search(query)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+def run_benchmark(k: int, repeats: int, dtypes: List[str]):
+    from config.settings import settings
+    from relevance import load_questions
+    from retrieval import NumpyVectorIndex
+    from utils.embeddings_provider import get_embeddings
+    from utils.knowledge_base import index_exists, open_vectorstore
+
+    if not index_exists():
+        sys.exit("No index found: run `python utils/indexer.py` first")
+
+    embeddings = get_embeddings()
+    vectorstore = open_vectorstore(embeddings)
+    collection = vectorstore._collection
+    questions = [q["question"] for q in load_questions()]
+    query_embeddings = embeddings.embed_documents(questions)
+    print(f"{len(questions)} questions, {collection.count()} chunks, k={k}, repeats={repeats}\n")
+
+    print(f"{'backend':<28} {'p50 ms':>8} {'p95 ms':>8} {'agree@k':>8}")
+    # Current path: embeds the query, then searches Chroma
+    latencies = time_queries(lambda q: vectorstore.similarity_search(q, k=k), questions, repeats)
+    print(f"{'chroma similarity_search':<28} {percentiles(latencies)} {'-':>8}")
+
+    reference = {}
+    def chroma_by_vector(i):
+        result = collection.query(query_embeddings=[query_embeddings[i]], n_results=k, include=[])
+        reference[i] = set(result["ids"][0])
+    latencies = time_queries(chroma_by_vector, range(len(questions)), repeats)
+    print(f"{'chroma query (pre-embedded)':<28} {percentiles(latencies)} {'1.00':>8}")
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        for dtype in dtypes:
+            start = time.perf_counter()
+            index = NumpyVectorIndex.from_collection(collection, dtype=dtype, index_dir=Path(index_dir))
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            NumpyVectorIndex.from_collection(collection, dtype=dtype, index_dir=Path(index_dir))
+            load = time.perf_counter() - start
+
+            results = {}
+            def numpy_search(i):
+                results[i] = {chunk_id for chunk_id, _, _ in index.search(query_embeddings[i], k)}
+            latencies = time_queries(numpy_search, range(len(questions)), repeats)
+            agreement = statistics.mean(len(results[i] & reference[i]) / k for i in reference)
+            print(f"{'numpy ' + dtype + ' (pre-embedded)':<28} {percentiles(latencies)} {agreement:>8.2f}")
+            print(
+                f"{'':<28} build {build * 1000:.0f} ms, snapshot load {load * 1000:.0f} ms, "
+                f"{index.nbytes / 1e6:.1f} MB"
+            )
+
+    print(f"\nnumpy_index_max_chunks={settings.numpy_index_max_chunks} (larger collections stay on Chroma)")
+
+def run_synthetic(sizes: List[int], dim: int, k: int, repeats: int, dtypes: List[str]):
+    """NumPy search cost alone, over random unit vectors"""
+    from retrieval import NumpyVectorIndex
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((50, dim)).astype(np.float32)
+    print(f"Synthetic corpus, dim={dim}, k={k}\n")
+    print(f"{'chunks':>8} {'dtype':<8} {'p50 ms':>8} {'p95 ms':>8} {'MB':>8}")
+    for size in sizes:
+        matrix = rng.standard_normal((size, dim)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        for dtype in dtypes:
+            ids = [str(i) for i in range(size)]
+            index = NumpyVectorIndex(ids, matrix.astype(dtype), [""] * size, [{}] * size)
+            latencies = time_queries(lambda q: index.search(q, k), queries, repeats)
+            print(f"{size:>8} {dtype:<8} {percentiles(latencies)} {index.nbytes / 1e6:>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Chroma vs in-process NumPy vector search benchmark")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--repeats", type=int, default=20, help="Timed searches per question")
+    parser.add_argument("--dtypes", nargs="+", default=["float32", "float16"], choices=["float32", "float16"])
+    parser.add_argument("--synthetic", nargs="+", type=int, metavar="CHUNKS",
+                        help="Time the NumPy index on random corpora of these sizes instead")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding size for --synthetic")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        run_synthetic(args.synthetic, args.dim, args.k, args.repeats, args.dtypes)
+    else:
+        run_benchmark(args.k, args.repeats, args.dtypes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Local fake Groq API for load testing
+Implements the OpenAI-compatible chat completions route used by ChatGroq
+with a configurable, non-blocking response delay and an optional
+requests-per-minute limit answered with 429 and Retry-After, like Groq's
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+FAKE_ANSWER = (
+    "BrainGenTechnology delivers AI, automation and blockchain solutions "
+    "tailored to your business. Which processes would you like to improve first?"
+)
+
+def create_fake_groq_app(
+    delay: float = 0.2,
+    answer: str = FAKE_ANSWER,
+    token_delay: float = 0.02,
+    rate_limit_rpm: int = 0,
+    rate_limit_burst: int = None
+) -> FastAPI:
+    """
+    Create a fake Groq app answering every completion after `delay` seconds
+
+    Streaming requests receive the first token after `delay` and one word
+    every `token_delay` seconds after that. Non-streamed requests are
+    answered once the whole answer would have streamed: after `delay` plus
+    `token_delay` per word (pass token_delay=0 for a flat `delay`). With `rate_limit_rpm`, requests
+    are admitted from a bucket of `rate_limit_burst` (default: a minute's
+    worth) refilled at rpm / 60 per second; the rest receive 429.
+    """
+    app = FastAPI(title="Fake Groq API")
+    app.state.delay = delay
+    app.state.token_delay = token_delay
+    app.state.answer = answer
+    app.state.requests = 0
+    app.state.client_ports = set()  # One per TCP connection opened by clients
+    app.state.throttled = 0
+    app.state.bucket = {"level": float(rate_limit_burst or rate_limit_rpm), "updated": time.monotonic()}
+
+    def take_rate_limit() -> float:
+        """0 if the request is within the limit, otherwise seconds until it would be"""
+        if not rate_limit_rpm:
+            return 0.0
+        bucket, now = app.state.bucket, time.monotonic()
+        refill = (now - bucket["updated"]) * rate_limit_rpm / 60
+        bucket["level"] = min(rate_limit_burst or rate_limit_rpm, bucket["level"] + refill)
+        bucket["updated"] = now
+        if bucket["level"] >= 1:
+            bucket["level"] -= 1
+            return 0.0
+        return (1 - bucket["level"]) * 60 / rate_limit_rpm
+
+    async def stream_completion(model: str):
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        await asyncio.sleep(app.state.delay)
+        words = app.state.answer.split(" ")
+        for i, word in enumerate(words):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"role": "assistant", "content": word if i == 0 else f" {word}"},
+                    "finish_reason": None
+                }]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(app.state.token_delay)
+        final = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+        }
+        yield f"data: {json.dumps(final)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        app.state.requests += 1
+        app.state.client_ports.add(request.client.port)
+        retry_after = take_rate_limit()
+        if retry_after:
+            app.state.throttled += 1
+            return JSONResponse(
+                {"error": {
+                    "message": f"Rate limit reached: {rate_limit_rpm} requests per minute",
+                    "type": "requests",
+                    "code": "rate_limit_exceeded"
+                }},
+                status_code=429,
+                headers={"retry-after": f"{retry_after:.2f}"}
+            )
+        if payload.get("stream"):
+            return StreamingResponse(
+                stream_completion(payload.get("model", "fake-model")),
+                media_type="text/event-stream"
+            )
+
+        # A non-streamed answer arrives once every token has been generated
+        await asyncio.sleep(app.state.delay + app.state.token_delay * len(app.state.answer.split(" ")))
+
+        prompt_tokens = sum(len(m.get("content", "").split()) for m in payload.get("messages", []))
+        completion_tokens = len(app.state.answer.split())
+        return JSONResponse({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "fake-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": app.state.answer},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    return app
+
+class ThreadedServer:
+    """Run an ASGI app with uvicorn in a background thread"""
+
+    def __init__(self, app, port: int = 0):
+        import uvicorn
+
+        self.app = app
+        self.port = port or self._free_port()
+        self.server = uvicorn.Server(uvicorn.Config(
+            self.app, host="127.0.0.1", port=self.port, log_level="warning"
+        ))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "ThreadedServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+class FakeGroqServer(ThreadedServer):
+    """Fake Groq API running in a background thread"""
+
+    def __init__(
+        self,
+        delay: float = 0.2,
+        answer: str = FAKE_ANSWER,
+        port: int = 0,
+        token_delay: float = 0.02,
+        rate_limit_rpm: int = 0,
+        rate_limit_burst: int = None
+    ):
+        super().__init__(create_fake_groq_app(
+            delay=delay,
+            answer=answer,
+            token_delay=token_delay,
+            rate_limit_rpm=rate_limit_rpm,
+            rate_limit_burst=rate_limit_burst
+        ), port=port)
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Groq API for load testing")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.2, help="Delay before the first token in seconds")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Delay between streamed tokens in seconds")
+    parser.add_argument("--rate-limit-rpm", type=int, default=0, help="Requests per minute before 429s (0 = unlimited)")
+    args = parser.parse_args()
+
+    print(f"🧪 Fake Groq API on http://127.0.0.1:{args.port} (delay {args.delay}s)")
+    uvicorn.run(
+        create_fake_groq_app(delay=args.delay, token_delay=args.token_delay, rate_limit_rpm=args.rate_limit_rpm),
+        host="127.0.0.1",
+        port=args.port
+    )
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Chat load test against a local fake Groq API
+Drives working_server's /chat endpoint in-process at increasing concurrency,
+with a stub vectorstore whose search blocks like Chroma's, and checks that no
+request blocks the event loop: p99 latency may only grow by the CPU time
+the requests themselves need (the server, client and fake API share one
+process), not by time spent waiting on another request's blocking call
+"""
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("GROQ_API_KEY", "fake-groq-key")
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+from langchain_core.documents import Document
+
+from fake_groq import FakeGroqServer
+
+CONCURRENCY_LEVELS = [1, 2, 4, 8, 16, 32, 64]
+STUB_CHUNKS = [
+    "BrainGenTechnology builds custom AI solutions: chatbots, document processing and predictive analytics.",
+    "Automation services cover RPA, workflow orchestration and integrations with ERP and CRM systems.",
+    "Blockchain solutions include smart contracts, supply chain traceability and tokenization."
+]
+
+class StubVectorStore:
+    """Stands in for Chroma: a synchronous search that holds its thread for `search_delay` seconds"""
+
+    def __init__(self, search_delay: float):
+        self.search_delay = search_delay
+        self.searches = 0
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        time.sleep(self.search_delay)
+        self.searches += 1
+        return [Document(page_content=text, metadata={"source": f"stub-{i}"}) for i, text in enumerate(STUB_CHUNKS[:k])]
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, requests_per_worker: int) -> Dict[str, float]:
+    """Run `concurrency` workers each sending `requests_per_worker` sequential chats"""
+    latencies: List[float] = []
+
+    async def worker(worker_id: int):
+        for i in range(requests_per_worker):
+            start = time.perf_counter()
+            response = await client.post("/chat", json={
+                "message": "What AI services do you offer?",
+                "session_id": f"load-c{concurrency}-w{worker_id}-{i}"
+            })
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "mean": statistics.mean(latencies),
+        "throughput": len(latencies) / wall,
+        "cpu_per_request": cpu / len(latencies)
+    }
+
+async def run_load_test(delay: float, requests_per_worker: int, tolerance: float, search_delay: float, inline_search: bool) -> bool:
+    import working_server
+    from config.settings import settings
+    from utils.llm_clients import get_chat_model
+    from utils.fake_redis import FakeRedis
+    from utils.session_manager import SessionManager
+
+    # Measures blocking in the server, not the upstream LLM connection and concurrency caps
+    settings.llm_default_concurrency = max(CONCURRENCY_LEVELS)
+    settings.llm_max_connections = max(CONCURRENCY_LEVELS)
+
+    with FakeGroqServer(delay=delay, token_delay=0.0) as fake_groq:
+        working_server.groq_llm = get_chat_model(groq_api_base=fake_groq.base_url, max_retries=0)
+        vectorstore = StubVectorStore(search_delay)
+        working_server.vectorstore = vectorstore
+        working_server.searcher = None
+        working_server.embeddings = None
+        if inline_search:
+            # What the server did before: search on the event loop (the test must fail)
+            async def search_inline(query, query_embedding=None):
+                return working_server.get_context_for_query(query, query_embedding)
+            working_server.aget_context_for_query = search_inline
+        working_server.laravel_bridge = None
+        working_server.session_manager = SessionManager(redis_client=FakeRedis())
+
+        transport = httpx.ASGITransport(app=working_server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://working-server", timeout=60) as client:
+            # Warm up connection pools and lazy imports
+            await run_level(client, 2, 2)
+
+            results = []
+            print(
+                f"{'conc':>5} {'reqs':>6} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9} {'req/s':>8} "
+                f"{'cpu ms/req':>11} {'p99/expected':>13}"
+            )
+            for concurrency in CONCURRENCY_LEVELS:
+                result = await run_level(client, concurrency, requests_per_worker)
+                # A non-blocking server still runs every request's CPU work on one core:
+                # the last of c simultaneous requests waits for the other c - 1
+                baseline = results[0]["p99"] if results else result["p99"]
+                result["expected"] = baseline + (concurrency - 1) * result["cpu_per_request"]
+                result["ratio"] = result["p99"] / result["expected"]
+                results.append(result)
+                print(
+                    f"{result['concurrency']:>5} {result['requests']:>6} "
+                    f"{result['p50'] * 1000:>9.1f} {result['p99'] * 1000:>9.1f} "
+                    f"{result['mean'] * 1000:>9.1f} {result['throughput']:>8.1f} "
+                    f"{result['cpu_per_request'] * 1000:>11.1f} {result['ratio']:>13.2f}"
+                )
+
+        print(f"Fake Groq received {fake_groq.app.state.requests} completions, stub vectorstore {vectorstore.searches} searches")
+
+    worst = max(results, key=lambda r: r["ratio"])
+    passed = worst["ratio"] <= tolerance
+    print(
+        f"\np99 at c=1: {results[0]['p99'] * 1000:.1f} ms; worst p99 / (p99 at c=1 + CPU of the other requests): "
+        f"{worst['ratio']:.2f} at c={worst['concurrency']} (limit {tolerance})"
+    )
+    print("✅ No request blocks the event loop" if passed else "❌ Requests wait on each other beyond their CPU time")
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat load test with a fake Groq backend")
+    parser.add_argument("--delay", type=float, default=1.0, help="Fake Groq latency in seconds")
+    parser.add_argument("--requests-per-worker", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="Max allowed p99(c) / (p99(1) + (c - 1) * CPU seconds per request)")
+    parser.add_argument("--search-delay", type=float, default=0.01, help="Seconds each stub vector search blocks its thread")
+    parser.add_argument("--inline-search", action="store_true",
+                        help="Search on the event loop instead of a worker thread (shows the test failing)")
+    args = parser.parse_args()
+
+    passed = asyncio.run(run_load_test(
+        args.delay, args.requests_per_worker, args.tolerance, args.search_delay, args.inline_search
+    ))
+    sys.exit(0 if passed else 1)
+
+if __name__ == "__main__":
+    main()
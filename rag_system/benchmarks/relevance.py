@@ -0,0 +1,31 @@
+"""
+Labelled relevance helpers shared by the retrieval benchmarks
+A chunk is relevant to a question when it comes from one of the question's
+relevant sources and mentions one of its answer terms
+"""
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.index_manifest import source_key
+
+QUESTIONS_FILE = Path(__file__).parent / "data" / "retrieval_questions.json"
+
+def load_questions() -> List[Dict]:
+    return json.loads(QUESTIONS_FILE.read_text(encoding="utf-8"))
+
+def is_relevant(source: str, text: str, question: Dict) -> bool:
+    """source may be absolute (Chroma metadata) or relative to DOCUMENTS_DIR"""
+    if source_key(Path(source)) not in question["relevant_sources"]:
+        return False
+    lowered = text.lower()
+    return any(term.lower() in lowered for term in question["answer_terms"])
+
+def first_relevant_rank(results: List[Dict[str, str]], question: Dict) -> int:
+    """1-based rank of the first relevant result ({source, text} dicts), 0 if none"""
+    for rank, result in enumerate(results, start=1):
+        if is_relevant(result["source"], result["text"], question):
+            return rank
+    return 0
@@ -0,0 +1,77 @@
+"""
+Follow-up Detection for BrainGenTechnology RAG System
+Decides, without an LLM call, whether a chat message must be rewritten into a
+standalone question before retrieval. Only follow-ups that lean on earlier
+turns ("how much does it cost?", "what about retail?") pay for condensing
+"""
+import re
+from typing import Any, List
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from retrieval import tokenize
+
+# auto: heuristic below; always: every turn with history (ConversationalRetrievalChain behaviour); never
+CONDENSE_MODES = ("auto", "always", "never")
+
+# Words pointing back into the conversation. "that"/"this" only where they
+# stand alone ("does that include...", "how long does this take?"), not as
+# a relative pronoun ("a system that automates invoices")
+REFERENCES = re.compile(
+    r"\b(?:it|its|itself|they|them|their|theirs|these|those|ones?|same|former|latter|"
+    r"above|previous|earlier|mentioned|else)\b"
+    r"|\bmore\s*(?:[?.!,]|$)"
+    r"|\b(?:does|do|is|was|are|would|will|can|could|about|with|for|of|like|on)\s+(?:that|this)\b"
+    r"|\b(?:that|this)\s*(?:[?.!,]|$)"
+    r"|^\s*(?:that|this)\b",
+    re.IGNORECASE
+)
+# Openings that continue the previous exchange
+CONTINUATIONS = re.compile(
+    r"^\s*(?:and|but|so|or|also|then|plus|what about|how about|more|ok(?:ay)?|great|thanks)\b",
+    re.IGNORECASE
+)
+# Messages made only of question and filler words ("how much?", "why not?", "when?")
+# or one- and two-word questions ("pricing?", "for retail?")
+CONTENT_FREE = re.compile(
+    r"^\s*(?:(?:how|what|when|where|which|who|why|much|many|long|soon|not|so|really|exactly|"
+    r"please|is|are|the|a|an|yes|no)\b[\s?!.,]*)+$"
+    r"|^\s*\S+(?:\s+\S+)?\s*\?\s*$",
+    re.IGNORECASE
+)
+
+def condense_decision(question: str, chat_history: List[Any], mode: str = None) -> str:
+    """
+    Why a turn does or does not get a condense LLM call
+
+    Returns:
+        "follow_up" or "always" when the question must be condensed;
+        "first_turn", "self_contained" or "never" when it is retrieved as asked
+    """
+    mode = mode or settings.condense_mode
+    if mode not in CONDENSE_MODES:
+        raise ValueError(f"Unknown condense mode '{mode}', expected one of {CONDENSE_MODES}")
+    if not chat_history:
+        return "first_turn"
+    if mode != "auto":
+        return mode
+    if REFERENCES.search(question) or CONTINUATIONS.search(question) or CONTENT_FREE.match(question):
+        return "follow_up"
+    return "self_contained"
+
+def needs_condensing(decision: str) -> bool:
+    return decision in ("follow_up", "always")
+
+def query_overlap(question: str, standalone_question: str) -> float:
+    """
+    Share of the standalone question's search terms already in the question
+    1.0 when condensing added no new terms, so a search for the question as
+    asked finds the same chunks
+    """
+    terms = set(tokenize(standalone_question))
+    if not terms:
+        return 1.0
+    return len(terms & set(tokenize(question))) / len(terms)
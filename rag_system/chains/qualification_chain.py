@@ -7,7 +7,6 @@ import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 
-from langchain_groq import ChatGroq
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 from langchain.output_parsers import PydanticOutputParser, OutputFixingParser
@@ -24,6 +23,7 @@ from models.lead_qualification import (
     ChatMessage
 )
 from config.settings import settings
+from utils.llm_clients import get_chat_model
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -50,13 +50,12 @@ class LeadQualificationChain:
     def _initialize_llm(self):
         """Initialize Groq LLM for qualification analysis"""
         try:
-            self.llm = ChatGroq(
-                groq_api_key=settings.groq_api_key,
-                model_name=settings.llm_model,
+            self.llm = get_chat_model(
                 temperature=0.1,  # Lower temperature for consistent analysis
                 max_tokens=1500,  # Sufficient for qualification output
                 timeout=settings.qualification_timeout,
-                max_retries=2
+                max_retries=2,
+                priority="background"  # Admitted after waiting chat requests
             )
             logger.info("Groq LLM initialized for qualification")
         except Exception as e:
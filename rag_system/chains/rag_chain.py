@@ -2,12 +2,10 @@
 RAG Chain Implementation with Groq LLM for BrainGenTechnology
 Optimized for English-speaking business prospects
 """
-from typing import Dict, List, Any, Optional
-from langchain_groq import ChatGroq
-from langchain_community.embeddings import HuggingFaceEmbeddings
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Any, Optional
 from langchain_community.vectorstores import Chroma
-from langchain.chains import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferWindowMemory
 from langchain.prompts import PromptTemplate
 from langchain.schema import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -20,11 +18,23 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import settings, DOCUMENTS_DIR, CHROMA_DIR
 from utils.session_manager import get_session_manager
+from utils.kb_version import bump_kb_version, KBVersionMonitor
+from utils.knowledge_base import open_vectorstore, reload_vectorstore
+from retrieval import HybridSearcher, get_reranker, retrieve_reranked, pack_context
+from utils.embeddings_provider import get_embeddings
+from utils.llm_clients import get_chat_model
+from monitoring import StageTimer, get_metrics
+from chains.condense import condense_decision, needs_condensing, query_overlap
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, settings.log_level))
 logger = logging.getLogger(__name__)
 
+def _observe_speculative(task: asyncio.Task):
+    """Retrieve the outcome of a speculative search nobody awaits, so it is never logged as unhandled"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Speculative retrieval failed: {task.exception()}")
+
 class BrainGenRAGChain:
     """
     Advanced RAG Chain for BrainGenTechnology with Groq LLM
@@ -35,8 +45,13 @@ class BrainGenRAGChain:
         self.llm = None
         self.embeddings = None
         self.vectorstore = None
-        self.retriever = None
+        self.searcher = None
         self.session_manager = None
+        self.kb_monitor = KBVersionMonitor()
+        
+        # Prompt templates are per-process: built once, shared by every session
+        self.business_prompt = self._create_business_prompt()
+        self.condense_prompt = self._create_condense_prompt()
         
         # Initialize components
         self._initialize_llm()
@@ -49,14 +64,9 @@ class BrainGenRAGChain:
     def _initialize_llm(self):
         """Initialize Groq LLM with optimal settings for business conversations"""
         try:
-            self.llm = ChatGroq(
-                groq_api_key=settings.groq_api_key,
-                model_name=settings.llm_model,
-                temperature=settings.llm_temperature,
-                max_tokens=settings.llm_max_tokens,
-                timeout=settings.llm_timeout,
+            self.llm = get_chat_model(
                 max_retries=3,
-                streaming=False  # Disable streaming for consistency
+                streaming=True  # Token streaming for astream_question
             )
             logger.info(f"Groq LLM initialized: {settings.llm_model}")
         except Exception as e:
@@ -64,16 +74,9 @@ class BrainGenRAGChain:
             raise
     
     def _initialize_embeddings(self):
-        """Initialize HuggingFace embeddings optimized for English business content"""
+        """Initialize the shared process-wide embeddings (see utils/embeddings_provider.py)"""
         try:
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name=settings.embeddings_model,
-                model_kwargs={'device': settings.embeddings_device},
-                encode_kwargs={
-                    'normalize_embeddings': True,
-                    'batch_size': 16
-                }
-            )
+            self.embeddings = get_embeddings()
             logger.info(f"Embeddings initialized: {settings.embeddings_model}")
         except Exception as e:
             logger.error(f"Failed to initialize embeddings: {e}")
@@ -87,30 +90,37 @@ class BrainGenRAGChain:
             
             # Load existing vectorstore or create new one
             if (CHROMA_DIR / "chroma.sqlite3").exists():
-                self.vectorstore = Chroma(
-                    persist_directory=str(CHROMA_DIR),
-                    embedding_function=self.embeddings,
-                    collection_name="braingentech_knowledge"
-                )
+                self.vectorstore = open_vectorstore(self.embeddings)
                 logger.info("Loaded existing Chroma vectorstore")
             else:
                 # Create new vectorstore and index documents
                 self._index_documents()
                 logger.info("Created new Chroma vectorstore")
             
-            # Configure retriever
-            self.retriever = self.vectorstore.as_retriever(
-                search_type="similarity",
-                search_kwargs={
-                    "k": settings.retrieval_k,
-                    "score_threshold": 0.7
-                }
-            )
+            self._configure_searcher()
+            # Load the cross-encoder (when enabled) before the first request
+            get_reranker()
             
         except Exception as e:
             logger.error(f"Failed to initialize vectorstore: {e}")
             raise
     
+    def _configure_searcher(self):
+        """Point the searcher at the current vectorstore (settings.retrieval_mode)"""
+        # BM25 and/or vector search (fused with RRF in hybrid mode); indexes follow the collection.
+        # The only retrieval path: turns (via retrieve_reranked) and retrieve_batch()
+        if self.searcher is None:
+            self.searcher = HybridSearcher(self.vectorstore, self.embeddings)
+        else:
+            self.searcher.set_vectorstore(self.vectorstore)
+    
+    def _reload_vectorstore(self):
+        """Pick up content the indexer wrote since the vectorstore was opened"""
+        vectorstore = reload_vectorstore(self.embeddings, self.vectorstore)
+        if vectorstore is not self.vectorstore:
+            self.vectorstore = vectorstore
+            self._configure_searcher()
+    
     def _index_documents(self):
         """Index company documents into vectorstore"""
         try:
@@ -168,33 +178,6 @@ class BrainGenRAGChain:
             logger.error(f"Failed to initialize session manager: {e}")
             raise
     
-    def _create_session_qa_chain(self, session_id: str) -> ConversationalRetrievalChain:
-        """Create QA chain for a specific session"""
-        try:
-            # Get session memory
-            session_memory = self.session_manager.get_session_memory(session_id)
-            
-            # Create business-focused prompt template
-            system_prompt = self._create_business_prompt()
-            
-            # Create the conversational retrieval chain for this session
-            qa_chain = ConversationalRetrievalChain.from_llm(
-                llm=self.llm,
-                retriever=self.retriever,
-                memory=session_memory,
-                return_source_documents=True,
-                verbose=settings.api_debug,
-                combine_docs_chain_kwargs={
-                    "prompt": system_prompt
-                },
-                condense_question_prompt=self._create_condense_prompt()
-            )
-            logger.debug(f"Created QA Chain for session {session_id}")
-            return qa_chain
-        except Exception as e:
-            logger.error(f"Failed to create QA chain for session {session_id}: {e}")
-            raise
-    
     def _create_business_prompt(self) -> PromptTemplate:
         """Create business-optimized prompt template for Groq LLM"""
         template = """You are an intelligent sales assistant for BrainGenTechnology, a leading provider of AI, automation, and blockchain solutions for enterprises.
@@ -286,53 +269,36 @@ Standalone question:"""
         """
         try:
             logger.info(f"Processing question for session {session_id}")
+            timer = StageTimer()
             
-            # Create session-specific QA chain
-            qa_chain = self._create_session_qa_chain(session_id)
-            
-            # Get session memory and context
-            session_memory = self.session_manager.get_session_memory(session_id)
-            user_context = self.session_manager.get_user_info_summary(session_id)
-            
-            # Enhance question with session context if needed
-            enhanced_question = self._enhance_question(question, metadata)
+            turn = await self._prepare_turn(question, session_id, metadata, timer)
             
-            # Prepare documents for context
-            retrieved_docs = self.retriever.get_relevant_documents(enhanced_question)
-            context = "\n\n".join([doc.page_content for doc in retrieved_docs[:3]])
+            with timer.stage("prompt"):
+                formatted_prompt = self._build_prompt(turn)
             
             # Get response using LLM directly with enhanced context
-            response = await self._get_contextual_response(
-                question=enhanced_question,
-                context=context,
-                user_context=user_context,
-                chat_history=session_memory.chat_memory.messages,
-                session_id=session_id
-            )
+            with timer.stage("llm"):
+                response = await self._get_contextual_response(formatted_prompt, session_id)
+            get_metrics().record_chat_llm_calls(turn["llm_calls"] + 1)
             
             # Store conversation in session manager
-            self.session_manager.add_message_to_session(
-                session_id=session_id,
-                user_message=question,
-                ai_response=response["answer"],
-                metadata=metadata
-            )
+            with timer.stage("persist"):
+                await self.session_manager.add_message_to_session(
+                    session_id=session_id,
+                    user_message=question,
+                    ai_response=response["answer"],
+                    metadata=metadata
+                )
             
             # Extract and format response
             result = {
                 "answer": response["answer"],
-                "source_documents": [
-                    {
-                        "content": doc.page_content[:500] + "...",
-                        "source": doc.metadata.get("source", "Unknown"),
-                        "relevance_score": getattr(doc, 'relevance_score', 0.0)
-                    }
-                    for doc in retrieved_docs[:3]
-                ],
+                "source_documents": turn["sources"],
                 "session_id": session_id,
-                "conversation_length": len(session_memory.chat_memory.messages),
+                "conversation_length": len(turn["history"]),
                 "timestamp": self._get_timestamp(),
-                "metadata": metadata or {}
+                "metadata": metadata or {},
+                "timings": timer.finish()
             }
             
             logger.info(f"Question processed successfully for session {session_id}")
@@ -347,31 +313,225 @@ Standalone question:"""
                 "timestamp": self._get_timestamp()
             }
     
-    async def _get_contextual_response(
-        self, 
-        question: str, 
-        context: str, 
-        user_context: str, 
-        chat_history: List[Any], 
-        session_id: str
-    ) -> Dict[str, Any]:
-        """Get response using LLM with full context"""
+    async def astream_question(
+        self,
+        question: str,
+        session_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the answer to a question token by token
+        
+        Yields event dicts in order: one "sources" event with the retrieved
+        documents, one "token" event per LLM chunk, then a final "done" event
+        (with the stage timings) once the full answer has been persisted to the
+        session. Failures yield a single "error" event.
+        """
         try:
-            # Format chat history
-            formatted_history = ""
-            for msg in chat_history[-6:]:  # Last 6 messages
-                role = "Human" if hasattr(msg, 'type') and msg.type == "human" else "Assistant"
-                formatted_history += f"{role}: {msg.content}\n"
+            logger.info(f"Streaming question for session {session_id}")
+            timer = StageTimer()
             
-            # Create the prompt
-            prompt_template = self._create_business_prompt()
-            formatted_prompt = prompt_template.format(
-                context=context,
-                user_context=user_context,
-                chat_history=formatted_history,
-                question=question
-            )
+            turn = await self._prepare_turn(question, session_id, metadata, timer)
+            yield {"event": "sources", "data": {"sources": turn["sources"], "session_id": session_id}}
+            
+            with timer.stage("prompt"):
+                formatted_prompt = self._build_prompt(turn)
+            
+            answer_parts = []
+            with timer.stage("llm"):
+                # Closed when the client disconnects mid-answer, freeing the admission slot
+                async with aclosing(self.llm.astream(formatted_prompt)) as chunks:
+                    async for chunk in chunks:
+                        if chunk.content:
+                            answer_parts.append(chunk.content)
+                            yield {"event": "token", "data": {"token": chunk.content}}
+            get_metrics().record_chat_llm_calls(turn["llm_calls"] + 1)
+            
+            answer = "".join(answer_parts)
+            with timer.stage("persist"):
+                await self.session_manager.add_message_to_session(
+                    session_id=session_id,
+                    user_message=question,
+                    ai_response=answer,
+                    metadata=metadata
+                )
+            
+            yield {
+                "event": "done",
+                "data": {
+                    "answer": answer,
+                    "session_id": session_id,
+                    "conversation_length": len(turn["history"]),
+                    "timestamp": self._get_timestamp(),
+                    "timings": timer.finish()
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Error streaming question: {e}")
+            yield {
+                "event": "error",
+                "data": {
+                    "answer": "I apologize, but I'm experiencing technical difficulties. Please try again or contact our support team for assistance.",
+                    "error": str(e),
+                    "session_id": session_id
+                }
+            }
+    
+    async def retrieve_batch(self, queries: List[str], k: int = None) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve ranked chunks for many queries at once (qualification,
+        analytics back-fills, offline evaluation)
+        
+        Args:
+            queries: Questions to search for
+            k: Chunks per query (settings.retrieval_k by default)
+        
+        Returns:
+            One ranked list of chunks with scores per query, in query order
+        """
+        if self.kb_monitor.changed():
+            await asyncio.to_thread(self._reload_vectorstore)
+        
+        results = await self.searcher.asearch_batch(queries, k or settings.retrieval_k)
+        return [
+            [
+                {
+                    "content": doc.page_content,
+                    "source": doc.metadata.get("source", "Unknown"),
+                    "chunk_index": doc.metadata.get("chunk_index"),
+                    "score": score
+                }
+                for doc, score in ranked
+            ]
+            for ranked in results
+        ]
+    
+    async def _prepare_turn(
+        self,
+        question: str,
+        session_id: str,
+        metadata: Optional[Dict[str, Any]],
+        timer: StageTimer
+    ) -> Dict[str, Any]:
+        """
+        Load session state and retrieve context for one conversation turn
+        
+        The turn's retrieval runs for a standalone question: follow-ups are
+        condensed first, every other message is retrieved as asked. With
+        settings.speculative_retrieval, a follow-up is also searched as asked
+        while the LLM condenses it, and those results are kept when the
+        condensed question adds (almost) no new search terms
+        """
+        # Per-session state: message history and extracted user details
+        with timer.stage("session"):
+            history = await self.session_manager.get_session_history(session_id)
+            user_context = await self.session_manager.get_user_info_summary(session_id)
+        
+        # Enhance question with session context if needed
+        enhanced_question = self._enhance_question(question, metadata)
+        
+        chat_history = history.tail()
+        decision = condense_decision(question, chat_history)
+        speculative = None
+        with timer.stage("condense"):
+            if needs_condensing(decision) and settings.speculative_retrieval:
+                speculative = asyncio.create_task(self._retrieve(enhanced_question))
+                # Also covers the task being dropped when condensing raises
+                speculative.add_done_callback(_observe_speculative)
+            standalone_question, llm_calls = await self._condense_question(question, chat_history, decision)
+        
+        with timer.stage("retrieve"):
+            ranked = None
+            if speculative is not None:
+                hit = query_overlap(question, standalone_question) >= settings.speculative_retrieval_min_overlap
+                get_metrics().record_speculative_retrieval(hit)
+                if hit:
+                    try:
+                        ranked = await speculative
+                    except Exception as e:
+                        logger.warning(f"Speculative retrieval failed, retrieving for the condensed question: {e}")
+                else:
+                    speculative.cancel()
+            if ranked is None:
+                ranked = await self._retrieve(self._enhance_question(standalone_question, metadata))
             
+            # Candidates (re-ranked when enabled) packed into the context token budget
+            packed = pack_context([doc for doc, _ in ranked])
+            retrieved_docs = packed["documents"]
+            context = packed["text"]
+        
+        return {
+            "question": enhanced_question,
+            "context": context,
+            "user_context": user_context,
+            "history": history,
+            "chat_history": chat_history,
+            "llm_calls": llm_calls,
+            "sources": [
+                {
+                    "content": doc.page_content[:500] + "...",
+                    "source": doc.metadata.get("source", "Unknown"),
+                    "relevance_score": getattr(doc, 'relevance_score', 0.0)
+                }
+                for doc in retrieved_docs
+            ]
+        }
+    
+    async def _retrieve(self, query: str) -> List[Any]:
+        """Ranked context candidates (re-ranked when enabled) for one query"""
+        # Reopen the collection if the indexer changed the knowledge base
+        if self.kb_monitor.changed():
+            await asyncio.to_thread(self._reload_vectorstore)
+        return await asyncio.to_thread(retrieve_reranked, self.searcher, query)
+    
+    async def _condense_question(self, question: str, chat_history: List[Any], decision: str) -> tuple:
+        """
+        Rewrite a follow-up into a standalone question for retrieval
+        
+        Args:
+            decision: condense_decision() for the question
+        
+        Returns:
+            (question to retrieve for, LLM calls spent on it)
+        """
+        standalone_question, llm_calls = question, 0
+        if needs_condensing(decision):
+            llm_calls = 1
+            try:
+                response = await self.llm.ainvoke(self.condense_prompt.format(
+                    chat_history=self._format_chat_history(chat_history),
+                    question=question
+                ))
+                standalone_question = response.content.strip() or question
+                logger.debug(f"Condensed '{question}' to '{standalone_question}'")
+            except Exception as e:
+                logger.warning(f"Condensing failed, retrieving for the question as asked: {e}")
+                decision = "error"
+        
+        get_metrics().record_condense_decision(decision)
+        return standalone_question, llm_calls
+    
+    def _format_chat_history(self, chat_history: List[Any]) -> str:
+        """Format the last messages of a session for the prompt"""
+        formatted_history = ""
+        for msg in chat_history[-6:]:  # Last 6 messages
+            role = "Human" if hasattr(msg, 'type') and msg.type == "human" else "Assistant"
+            formatted_history += f"{role}: {msg.content}\n"
+        return formatted_history
+    
+    def _build_prompt(self, turn: Dict[str, Any]) -> str:
+        """Fill the prebuilt business prompt for one turn"""
+        return self.business_prompt.format(
+            context=turn["context"],
+            user_context=turn["user_context"],
+            chat_history=self._format_chat_history(turn["chat_history"]),
+            question=turn["question"]
+        )
+    
+    async def _get_contextual_response(self, formatted_prompt: str, session_id: str) -> Dict[str, Any]:
+        """Get response using LLM with full context"""
+        try:
             # Get response from LLM
             response = await self.llm.ainvoke(formatted_prompt)
             
@@ -404,18 +564,18 @@ Standalone question:"""
         
         return question
     
-    def get_conversation_history(self, session_id: str) -> List[Dict[str, str]]:
+    async def get_conversation_history(self, session_id: str) -> List[Dict[str, str]]:
         """Get formatted conversation history for a session"""
         try:
-            return self.session_manager.get_conversation_history(session_id)
+            return await self.session_manager.get_conversation_history(session_id)
         except Exception as e:
             logger.error(f"Error getting conversation history: {e}")
             return []
     
-    def clear_conversation(self, session_id: str):
+    async def clear_conversation(self, session_id: str):
         """Clear conversation memory for a session"""
         try:
-            self.session_manager.clear_session(session_id)
+            await self.session_manager.clear_session(session_id)
             logger.info(f"Cleared conversation for session {session_id}")
         except Exception as e:
             logger.error(f"Error clearing conversation: {e}")
@@ -442,6 +602,7 @@ Standalone question:"""
             # Add to vectorstore
             self.vectorstore.add_documents(chunks)
             self.vectorstore.persist()
+            bump_kb_version()
             
             logger.info(f"Added {len(chunks)} chunks from {len(documents)} documents")
         except Exception as e:
@@ -459,7 +620,7 @@ Standalone question:"""
             "status": "healthy",
             "llm_model": settings.llm_model,
             "embeddings_model": settings.embeddings_model,
-            "vectorstore_type": settings.vector_store_type,
+            "vectorstore_type": self.searcher.dense_backend if self.searcher else settings.vector_store_type,
             "document_count": self.vectorstore._collection.count() if self.vectorstore else 0,
             "memory_messages": len(self.memory.chat_memory.messages) if self.memory else 0,
             "timestamp": self._get_timestamp()
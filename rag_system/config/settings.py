@@ -3,7 +3,7 @@ Configuration settings for BrainGenTechnology RAG System
 """
 from pathlib import Path
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
@@ -17,17 +17,73 @@ class Settings(BaseSettings):
     llm_temperature: float = 0.3
     llm_max_tokens: int = 2048
     llm_timeout: int = 60
+    llm_max_retries: int = 2
+    llm_http2: bool = True  # Multiplex LLM requests over shared connections (needs the h2 package)
+    llm_max_connections: int = 20  # Shared keep-alive pool for every LLM client in the process
+    llm_keepalive_seconds: float = 120.0
+    llm_default_concurrency: int = 16  # Max in-flight requests per model (AIMD ceiling)
+    llm_model_concurrency: Dict[str, int] = {}  # Per-model overrides, e.g. '{"llama-3.1-8b-instant": 32}'
+    llm_min_concurrency: int = 1  # AIMD floor
+    llm_latency_target_seconds: float = 5.0  # Slower responses (to first byte) shrink the concurrency limit
+    llm_requests_per_minute: int = 0  # Provider budget per model (0 = unlimited)
+    llm_tokens_per_minute: int = 0  # Provider budget per model, prompt + completion (0 = unlimited)
+    llm_expected_completion_tokens: int = 300  # Completion tokens reserved per request against the TPM budget
+    llm_max_queue: int = 200  # Waiting requests per priority lane before shedding
+    llm_interactive_max_wait_seconds: float = 15.0  # Chat requests waiting longer are shed
+    llm_background_max_wait_seconds: float = 120.0  # Qualification and other background requests
+    condense_mode: str = "auto"  # Follow-up rewriting before retrieval: auto (heuristic) | always | never
     
     # Embeddings Configuration
     embeddings_model: str = "sentence-transformers/all-mpnet-base-v2"
     embeddings_device: str = "cpu"
+    embeddings_backend: str = "sentence_transformers"  # or "onnx" (CPU, optional int8 quantization)
+    onnx_model_dir: str = "vectorstore/onnx_models"
+    onnx_quantize: bool = True
+    embeddings_batch_size: int = 16
+    embeddings_normalize: bool = True
+    embeddings_num_threads: int = 0  # 0 keeps the torch default
+    embedding_service_url: Optional[str] = None  # e.g. "http://127.0.0.1:8010" to share one model across workers
+    embedding_service_timeout: float = 10.0
+    
+    # Query Embedding Cache
+    embedding_cache_enabled: bool = True
+    embedding_cache_max_entries: int = 10000
+    embedding_cache_path: Optional[str] = None  # e.g. "vectorstore/embedding_cache.sqlite3"
     
     # Vector Store Configuration
-    vector_store_type: str = "chroma"
+    vector_store_type: str = "chroma"  # or "numpy" (in-process exact search, falls back to Chroma when large)
+    numpy_index_dtype: str = "float32"  # or "float16" (half the memory)
+    numpy_index_max_chunks: int = 50000
+    rerank_enabled: bool = False  # Cross-encoder re-ranking of over-fetched candidates
+    rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rerank_candidates: int = 20
+    rerank_budget_ms: float = 150.0  # Retrieval + re-ranking; re-ranking is skipped when it would not fit
+    context_candidates: int = 6  # Chunks retrieved for context packing (without re-ranking)
+    context_token_budget: int = 450  # Prompt context size after overlap removal and merging
+    context_tokenizer: str = "cl100k_base"  # Local tiktoken encoding used to count context tokens
+    speculative_retrieval: bool = False  # Search follow-ups as asked while they are condensed
+    speculative_retrieval_min_overlap: float = 0.8  # Share of condensed search terms the message must contain for reuse
     chroma_persist_directory: str = "rag_system/vectorstore/chroma_db"
     chunk_size: int = 1000
     chunk_overlap: int = 200
     retrieval_k: int = 3
+    retrieval_mode: str = "dense"  # dense | sparse (BM25) | hybrid (both, fused with RRF)
+    rrf_k: int = 60  # Reciprocal rank fusion constant
+    hybrid_candidates: int = 20  # Candidates taken from each retriever before fusion
+
+    # Document Ingestion
+    ingest_workers: int = 0  # Processes reading/chunking files (0 = all cores)
+    ingest_queue_size: int = 1024  # Max chunks waiting for embedding
+    ingest_embed_batch_size: int = 64
+    ingest_upsert_batch_size: int = 256
+    index_watch_debounce_seconds: float = 2.0  # Quiet period before a watch-mode update
+    index_watch_poll_interval: float = 2.0  # Used when inotify (watchdog) is unavailable
+
+    # Semantic Response Cache (first-turn questions only)
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.92  # Minimum cosine similarity for a hit
+    semantic_cache_ttl_seconds: int = 3600
+    semantic_cache_max_entries: int = 1000
     
     # API Configuration
     api_host: str = "0.0.0.0"
@@ -41,6 +97,15 @@ class Settings(BaseSettings):
     # Session Management
     session_timeout_minutes: int = 60
     max_conversation_length: int = 20
+    session_ttl_hours: int = 24  # Redis expiry of session memory and context
+    session_cache_max_sessions: int = 10000  # Hot sessions kept in process (least recently used evicted first)
+    session_cache_max_bytes: int = 64 * 1024 * 1024  # Approximate size of resident history and context
+    session_write_behind_seconds: float = 0.2  # Batches session writes to Redis (0 = write-through)
+    session_cleanup_interval_seconds: float = 300.0  # Background sweep evicting idle sessions (0 = only on session access)
+    redis_url: str = "redis://redis:6379/0"  # Docker service name
+    redis_password: Optional[str] = None
+    redis_max_connections: int = 20  # Shared async connection pool
+    redis_socket_timeout: float = 5.0
     
     # Monitoring
     langchain_tracing: bool = False
@@ -58,6 +123,13 @@ class Settings(BaseSettings):
         "env_prefix": "",
         "extra": "ignore"
     }
+    
+    @property
+    def embeddings_model_id(self) -> str:
+        """Identifies the vectors produced by the configured model and backend"""
+        if self.embeddings_backend == "onnx":
+            return f"{self.embeddings_model}#onnx-{'int8' if self.onnx_quantize else 'fp32'}"
+        return self.embeddings_model
 
 # Global settings instance
 settings = Settings()
@@ -1,6 +1,6 @@
 """
 RAG System Monitoring Module
 """
-from .metrics import get_metrics, timed_operation, RAGMetrics
+from .metrics import get_metrics, timed_operation, RAGMetrics, StageTimer
 
-__all__ = ['get_metrics', 'timed_operation', 'RAGMetrics']
\ No newline at end of file
+__all__ = ['get_metrics', 'timed_operation', 'RAGMetrics', 'StageTimer']
\ No newline at end of file
@@ -4,6 +4,7 @@ Tracks AI/ML specific metrics and business KPIs
 """
 import time
 import logging
+from contextlib import contextmanager
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 from prometheus_client import Counter, Histogram, Gauge, Info, CollectorRegistry, generate_latest
@@ -60,6 +61,155 @@ class RAGMetrics:
             registry=self.registry
         )
         
+        self.retrieval_duration = Histogram(
+            'retrieval_duration_seconds',
+            'Top-k retrieval time by mode (dense, sparse, hybrid)',
+            ['mode'],
+            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
+            registry=self.registry
+        )
+        
+        self.retrieval_batch_queries = Histogram(
+            'retrieval_batch_queries',
+            'Queries per batch retrieval call',
+            ['mode'],
+            buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256],
+            registry=self.registry
+        )
+        
+        self.retrieval_batch_duration = Histogram(
+            'retrieval_batch_duration_seconds',
+            'Batch retrieval time (embedding included) by mode',
+            ['mode'],
+            buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+            registry=self.registry
+        )
+        
+        self.rerank_duration = Histogram(
+            'rerank_duration_seconds',
+            'Cross-encoder re-ranking time per request',
+            buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.15, 0.25, 0.5, 1.0],
+            registry=self.registry
+        )
+        
+        self.rerank_candidates = Histogram(
+            'rerank_candidates',
+            'Candidates scored by the cross-encoder per request',
+            buckets=[1, 3, 5, 10, 20, 50, 100],
+            registry=self.registry
+        )
+        
+        self.rerank_skipped_total = Counter(
+            'rerank_skipped_total',
+            'Requests served without re-ranking',
+            ['reason'],  # 'budget' or 'error'
+            registry=self.registry
+        )
+        
+        # Chat Turn Stage Metrics
+        self.chat_stage_duration = Histogram(
+            'chat_stage_duration_seconds',
+            'Time per chat turn stage (session, retrieve, prompt, llm, persist, total)',
+            ['stage'],
+            buckets=[0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0],
+            registry=self.registry
+        )
+        
+        self.condense_decisions_total = Counter(
+            'condense_decisions_total',
+            'Chat turns by follow-up condensing decision',
+            ['decision'],  # 'follow_up', 'always' (condensed) or 'first_turn', 'self_contained', 'never', 'error'
+            registry=self.registry
+        )
+        
+        self.speculative_retrieval_total = Counter(
+            'speculative_retrieval_total',
+            'Follow-up turns searched as asked while condensing',
+            ['result'],  # 'hit' (results reused) or 'miss' (searched again for the condensed question)
+            registry=self.registry
+        )
+        
+        self.chat_llm_calls = Histogram(
+            'chat_llm_calls_per_turn',
+            'LLM calls made to answer one chat turn',
+            buckets=[1, 2, 3, 5],
+            registry=self.registry
+        )
+        
+        # Session Store Metrics
+        self.redis_operation_duration = Histogram(
+            'redis_operation_duration_seconds',
+            'Session store Redis round trip time',
+            ['operation'],  # 'load', 'save', 'delete' or 'ping'
+            buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0],
+            registry=self.registry
+        )
+        
+        self.session_cache_sessions = Gauge(
+            'session_cache_resident_sessions',
+            'Chat sessions resident in process memory',
+            registry=self.registry
+        )
+        
+        self.session_cache_bytes = Gauge(
+            'session_cache_resident_bytes',
+            'Approximate size of resident session history and context',
+            registry=self.registry
+        )
+        
+        self.session_cache_evictions_total = Counter(
+            'session_cache_evictions_total',
+            'Sessions evicted from process memory',
+            ['reason'],  # 'sessions', 'bytes' or 'idle'
+            registry=self.registry
+        )
+        
+        # Query Embedding Cache Metrics
+        self.embedding_cache_requests_total = Counter(
+            'embedding_cache_requests_total',
+            'Query embedding cache lookups',
+            ['result'],  # 'hit' or 'miss'
+            registry=self.registry
+        )
+        
+        self.embedding_cache_entries = Gauge(
+            'embedding_cache_entries',
+            'Query embeddings currently cached',
+            registry=self.registry
+        )
+        
+        # Semantic Response Cache Metrics
+        self.semantic_cache_requests_total = Counter(
+            'semantic_cache_requests_total',
+            'Semantic response cache lookups',
+            ['result'],  # 'hit' or 'miss'
+            registry=self.registry
+        )
+        
+        self.semantic_cache_hit_ratio = Gauge(
+            'semantic_cache_hit_ratio',
+            'Semantic response cache hit ratio since startup',
+            registry=self.registry
+        )
+        
+        self.semantic_cache_saved_tokens_total = Counter(
+            'semantic_cache_saved_tokens_total',
+            'Estimated LLM tokens saved by semantic cache hits',
+            registry=self.registry
+        )
+        
+        self.semantic_cache_saved_seconds_total = Counter(
+            'semantic_cache_saved_seconds_total',
+            'Processing time saved by semantic cache hits',
+            registry=self.registry
+        )
+        
+        self.semantic_cache_entries = Gauge(
+            'semantic_cache_entries',
+            'Answers currently held in the semantic cache',
+            registry=self.registry
+        )
+        
         # LLM API Metrics
         self.llm_api_duration = Histogram(
             'llm_api_duration_seconds',
@@ -75,6 +225,70 @@ class RAGMetrics:
             registry=self.registry
         )
         
+        self.llm_time_to_first_token = Histogram(
+            'llm_time_to_first_token_seconds',
+            'Time from chat request to first streamed token',
+            buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0],
+            registry=self.registry
+        )
+        
+        self.llm_http_requests_total = Counter(
+            'llm_http_requests_total',
+            'LLM HTTP requests by connection use',
+            ['model', 'connection'],  # 'reused' keep-alive connection or 'new' (TCP + TLS handshake)
+            registry=self.registry
+        )
+        
+        self.llm_http_connect_duration = Histogram(
+            'llm_http_connect_seconds',
+            'Time to open a new LLM API connection (TCP + TLS)',
+            buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+            registry=self.registry
+        )
+        
+        self.llm_http_in_flight = Gauge(
+            'llm_http_in_flight',
+            'LLM HTTP requests currently in flight',
+            ['model'],
+            registry=self.registry
+        )
+        
+        self.llm_admission_wait = Histogram(
+            'llm_admission_wait_seconds',
+            'Time an LLM request waited for admission',
+            ['model', 'lane'],
+            buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0],
+            registry=self.registry
+        )
+        
+        self.llm_admission_queue_depth = Gauge(
+            'llm_admission_queue_depth',
+            'LLM requests waiting for admission',
+            ['model', 'lane'],
+            registry=self.registry
+        )
+        
+        self.llm_admission_shed_total = Counter(
+            'llm_admission_shed_total',
+            'LLM requests rejected by admission control',
+            ['model', 'lane', 'reason'],  # 'queue_full' or 'timeout'
+            registry=self.registry
+        )
+        
+        self.llm_concurrency_limit = Gauge(
+            'llm_concurrency_limit',
+            'Adaptive (AIMD) in-flight LLM request limit',
+            ['model'],
+            registry=self.registry
+        )
+        
+        self.llm_throttled_total = Counter(
+            'llm_throttled_total',
+            'LLM requests the provider rejected with 429',
+            ['model'],
+            registry=self.registry
+        )
+        
         self.llm_tokens_processed_total = Counter(
             'llm_tokens_processed_total',
             'Total tokens processed by LLM',
@@ -200,12 +414,118 @@ class RAGMetrics:
         if duration:
             self.vector_search_duration.observe(duration)
     
+    def record_retrieval(self, mode: str, duration: float):
+        """Record a top-k retrieval"""
+        self.retrieval_duration.labels(mode=mode).observe(duration)
+    
+    def record_retrieval_batch(self, mode: str, queries: int, duration: float):
+        """Record a batch retrieval call"""
+        self.retrieval_batch_queries.labels(mode=mode).observe(queries)
+        self.retrieval_batch_duration.labels(mode=mode).observe(duration)
+    
+    def record_rerank(self, duration: float, candidates: int):
+        """Record a cross-encoder re-ranking pass"""
+        self.rerank_duration.observe(duration)
+        self.rerank_candidates.observe(candidates)
+    
+    def record_rerank_skipped(self, reason: str):
+        """Record a request that skipped re-ranking"""
+        self.rerank_skipped_total.labels(reason=reason).inc()
+    
+    def record_chat_stages(self, timings: Dict[str, float]):
+        """Record the stage breakdown of one chat turn"""
+        for stage, duration in timings.items():
+            self.chat_stage_duration.labels(stage=stage).observe(duration)
+    
+    def record_condense_decision(self, decision: str):
+        """Record whether a chat turn was condensed before retrieval"""
+        self.condense_decisions_total.labels(decision=decision).inc()
+    
+    def record_speculative_retrieval(self, hit: bool):
+        """Record whether speculative retrieval results were reused"""
+        self.speculative_retrieval_total.labels(result="hit" if hit else "miss").inc()
+    
+    def record_chat_llm_calls(self, calls: int):
+        """Record the number of LLM calls one chat turn needed"""
+        self.chat_llm_calls.observe(calls)
+    
+    def record_redis_operation(self, operation: str, duration: float):
+        """Record one session store Redis round trip"""
+        self.redis_operation_duration.labels(operation=operation).observe(duration)
+    
+    def update_session_cache(self, sessions: int, size_bytes: int):
+        """Update resident session count and size"""
+        self.session_cache_sessions.set(sessions)
+        self.session_cache_bytes.set(size_bytes)
+    
+    def record_session_eviction(self, reason: str):
+        """Record a session evicted from process memory"""
+        self.session_cache_evictions_total.labels(reason=reason).inc()
+    
+    def record_embedding_cache_lookup(self, hit: bool):
+        """Record a query embedding cache lookup"""
+        self.embedding_cache_requests_total.labels(result="hit" if hit else "miss").inc()
+    
+    def update_embedding_cache_size(self, entries: int):
+        """Update number of cached query embeddings"""
+        self.embedding_cache_entries.set(entries)
+    
+    def record_semantic_cache_hit(self, hit_ratio: float, saved_tokens: int = 0, saved_seconds: float = 0.0):
+        """Record a semantic cache hit and the work it saved"""
+        self.semantic_cache_requests_total.labels(result="hit").inc()
+        self.semantic_cache_hit_ratio.set(hit_ratio)
+        self.semantic_cache_saved_tokens_total.inc(saved_tokens)
+        self.semantic_cache_saved_seconds_total.inc(saved_seconds)
+    
+    def record_semantic_cache_miss(self, hit_ratio: float):
+        """Record a semantic cache miss"""
+        self.semantic_cache_requests_total.labels(result="miss").inc()
+        self.semantic_cache_hit_ratio.set(hit_ratio)
+    
+    def update_semantic_cache_size(self, entries: int):
+        """Update number of cached answers"""
+        self.semantic_cache_entries.set(entries)
+    
     def record_llm_request(self, status: str, model: str, duration: Optional[float] = None):
         """Record an LLM API request"""
         self.llm_api_requests_total.labels(status=status, model=model).inc()
         if duration:
             self.llm_api_duration.observe(duration)
     
+    def record_llm_connection(self, model: str, reused: bool, connect_seconds: Optional[float] = None):
+        """Record whether an LLM request reused a pooled connection"""
+        self.llm_http_requests_total.labels(model=model, connection="reused" if reused else "new").inc()
+        if connect_seconds is not None:
+            self.llm_http_connect_duration.observe(connect_seconds)
+    
+    def update_llm_in_flight(self, model: str, requests: int):
+        """Update in-flight LLM requests for a model"""
+        self.llm_http_in_flight.labels(model=model).set(requests)
+    
+    def record_llm_admission_wait(self, model: str, lane: str, duration: float):
+        """Record time an LLM request waited for admission"""
+        self.llm_admission_wait.labels(model=model, lane=lane).observe(duration)
+    
+    def update_llm_queue_depth(self, model: str, lane: str, depth: int):
+        """Update LLM requests waiting for admission"""
+        self.llm_admission_queue_depth.labels(model=model, lane=lane).set(depth)
+    
+    def record_llm_shed(self, model: str, lane: str, reason: str):
+        """Record an LLM request rejected by admission control"""
+        self.llm_admission_shed_total.labels(model=model, lane=lane, reason=reason).inc()
+    
+    def update_llm_concurrency_limit(self, model: str, limit: float):
+        """Update the adaptive LLM concurrency limit"""
+        self.llm_concurrency_limit.labels(model=model).set(limit)
+    
+    def record_llm_throttled(self, model: str):
+        """Record a provider rate limit (429) response"""
+        self.llm_throttled_total.labels(model=model).inc()
+    
+    def record_time_to_first_token(self, duration: float):
+        """Record latency until the first streamed token"""
+        self.llm_time_to_first_token.observe(duration)
+    
     def record_tokens(self, input_tokens: int, output_tokens: int):
         """Record token usage"""
         self.llm_tokens_processed_total.labels(type="input").inc(input_tokens)
@@ -249,6 +569,30 @@ class RAGMetrics:
         """Generate Prometheus metrics output"""
         return generate_latest(self.registry).decode('utf-8')
 
+class StageTimer:
+    """
+    Per-request timing breakdown: time each stage with `with timer.stage(name)`,
+    then finish() reports the stages to the chat stage histogram
+    """
+    
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._start = time.perf_counter()
+    
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+    
+    def finish(self) -> Dict[str, float]:
+        """Stage durations in seconds plus the total, recorded to metrics"""
+        self.timings["total"] = time.perf_counter() - self._start
+        get_metrics().record_chat_stages(self.timings)
+        return {stage: round(duration, 6) for stage, duration in self.timings.items()}
+
 # Global metrics instance
 _metrics_instance: Optional[RAGMetrics] = None
 
@@ -0,0 +1,16 @@
+"""
+RAG System Retrieval Module
+"""
+from .bm25 import BM25Index, tokenize
+from .hybrid import HybridSearcher, reciprocal_rank_fusion, RETRIEVAL_MODES
+from .vector_index import NumpyVectorIndex, VECTOR_STORE_TYPES
+from .context import count_tokens, pack_context
+from .reranker import CrossEncoderReranker, get_reranker, retrieve_reranked
+
+__all__ = [
+    'BM25Index', 'tokenize',
+    'HybridSearcher', 'reciprocal_rank_fusion', 'RETRIEVAL_MODES',
+    'NumpyVectorIndex', 'VECTOR_STORE_TYPES',
+    'count_tokens', 'pack_context',
+    'CrossEncoderReranker', 'get_reranker', 'retrieve_reranked'
+]
@@ -0,0 +1,141 @@
+"""
+In-Memory BM25 Index for BrainGenTechnology RAG System
+Inverted index over the chunks stored in the Chroma collection, for exact
+matches on product names and acronyms (RPA, RAG, smart contracts) that dense
+retrieval tends to miss
+"""
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.+#][a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a about an and are as at be but by can do does for from has have how i if in
+into is it its me my of on or our so that the their them they this to us was
+we what when where which who why will with you your
+""".split())
+
+def _stem(token: str) -> str:
+    """Very light plural folding so "contracts" matches "contract" """
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords; acronyms survive as their own token"""
+    return [_stem(token) for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+class BM25Index:
+    """
+    Okapi BM25 over chunk IDs, updatable in place
+    Thread safe: searches and updates may run concurrently
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._docs: Dict[str, Tuple[str, dict]] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def ids(self) -> Set[str]:
+        with self._lock:
+            return set(self._docs)
+
+    def add(self, chunk_id: str, text: str, metadata: Optional[dict] = None):
+        """Index a chunk (replacing any previous version with the same ID)"""
+        term_counts = Counter(tokenize(text))
+        with self._lock:
+            if chunk_id in self._docs:
+                self._remove(chunk_id)
+            for term, count in term_counts.items():
+                self._postings.setdefault(term, {})[chunk_id] = count
+            length = sum(term_counts.values())
+            self._lengths[chunk_id] = length
+            self._total_length += length
+            self._docs[chunk_id] = (text, metadata or {})
+
+    def remove(self, chunk_id: str):
+        with self._lock:
+            if chunk_id in self._docs:
+                self._remove(chunk_id)
+
+    def get(self, chunk_id: str) -> Optional[Document]:
+        entry = self._docs.get(chunk_id)
+        if entry is None:
+            return None
+        return Document(page_content=entry[0], metadata=dict(entry[1]))
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """Top-k chunk IDs with their BM25 scores"""
+        terms = set(tokenize(query))
+        with self._lock:
+            total_docs = len(self._docs)
+            if not terms or not total_docs:
+                return []
+            average_length = self._total_length / total_docs
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[chunk_id] / average_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def sync_from_collection(self, collection, batch_size: int = 500) -> Tuple[int, int]:
+        """
+        Bring the index in line with a Chroma collection
+        Chunk IDs are content addressed, so diffing ID sets catches every
+        change; only new chunks are fetched
+
+        Returns:
+            (chunks added, chunks removed)
+        """
+        current = set(collection.get(include=[])["ids"])
+        indexed = self.ids()
+
+        removed = indexed - current
+        for chunk_id in removed:
+            self.remove(chunk_id)
+
+        added = list(current - indexed)
+        for start in range(0, len(added), batch_size):
+            batch = collection.get(ids=added[start:start + batch_size], include=["documents", "metadatas"])
+            for chunk_id, text, metadata in zip(batch["ids"], batch["documents"], batch["metadatas"]):
+                self.add(chunk_id, text or "", metadata)
+
+        if added or removed:
+            logger.info(f"BM25 index synced: +{len(added)} -{len(removed)} chunks ({len(self._docs)} total)")
+        return len(added), len(removed)
+
+    def _remove(self, chunk_id: str):
+        """Drop a chunk (caller holds the lock)"""
+        text, _ = self._docs.pop(chunk_id)
+        for term in set(tokenize(text)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(chunk_id)
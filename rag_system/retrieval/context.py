@@ -0,0 +1,183 @@
+"""
+Context Packing for BrainGenTechnology RAG System
+Turns ranked chunks into the prompt's context section: drops text repeated by
+chunk overlap, joins adjacent chunks of the same source and fills a token
+budget measured with a local tokenizer, cutting only at sentence boundaries
+"""
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Fallback when the tokenizer is unavailable: rough English average for Llama models
+CHARS_PER_TOKEN = 4
+# Shortest suffix/prefix match treated as chunk overlap rather than coincidence
+MIN_OVERLAP = 8
+# A chunk cut shorter than this carries too little to be worth including
+MIN_CUT_TOKENS = 24
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+_encoding = None
+_encoding_failed = False
+_encoding_lock = threading.Lock()
+
+def _get_encoding():
+    """The tiktoken encoding named by settings.context_tokenizer (None if unavailable)"""
+    global _encoding, _encoding_failed
+    if _encoding is not None or _encoding_failed:
+        return _encoding
+    with _encoding_lock:
+        if _encoding is None and not _encoding_failed:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding(settings.context_tokenizer)
+            except Exception as e:
+                logger.warning(f"Tokenizer {settings.context_tokenizer} unavailable, estimating tokens: {e}")
+                _encoding_failed = True
+    return _encoding
+
+def tokenizer_name() -> str:
+    return settings.context_tokenizer if _get_encoding() is not None else f"~{CHARS_PER_TOKEN} chars/token"
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return max(1, len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def _overlap(first: str, second: str, max_overlap: int) -> int:
+    """Length of the longest suffix of first that is a prefix of second"""
+    for size in range(min(max_overlap, len(first), len(second)), MIN_OVERLAP - 1, -1):
+        if first.endswith(second[:size]):
+            return size
+    return 0
+
+def _attach(passages: List[Dict[str, Any]], source: str, index: Optional[int], text: str, max_overlap: int):
+    """
+    Where a chunk continues an already packed passage of the same source
+
+    Returns:
+        (passage, "append" | "prepend", overlap length) or None
+    """
+    for passage in passages:
+        if passage["source"] != source:
+            continue
+        indexed = index is not None and None not in passage["chunk_indexes"]
+        overlap = _overlap(passage["text"], text, max_overlap)
+        if overlap or (indexed and index == max(passage["chunk_indexes"]) + 1):
+            return passage, "append", overlap
+        overlap = _overlap(text, passage["text"], max_overlap)
+        if overlap or (indexed and index == min(passage["chunk_indexes"]) - 1):
+            return passage, "prepend", overlap
+    return None
+
+def _trim_to_sentences(text: str, token_budget: int) -> str:
+    """Longest leading run of whole sentences within token_budget"""
+    kept = ""
+    for match in list(SENTENCE_BOUNDARY.finditer(text)) + [None]:
+        candidate = text[:match.start() if match else len(text)].rstrip()
+        if count_tokens(candidate) > token_budget:
+            break
+        kept = candidate
+    return kept
+
+def pack_context(
+    documents: List[Document],
+    token_budget: Optional[int] = None,
+    separator: str = "\n\n"
+) -> Dict[str, Any]:
+    """
+    Pack ranked chunks into at most token_budget tokens of context
+
+    Chunks are admitted best-first. Exact duplicates are dropped; a chunk
+    adjacent to an already packed chunk of the same source (consecutive
+    chunk_index, or overlapping text) is joined to it and only its new text
+    counts against the budget. A chunk that no longer fits whole is cut at
+    the last sentence that fits, and smaller lower-ranked chunks may still
+    fill the rest
+
+    Returns:
+        Dict with the context text, its token count, the packed passages as
+        Documents and the number of chunks they contain
+    """
+    token_budget = token_budget or settings.context_token_budget
+    max_overlap = settings.chunk_overlap * 2
+    separator_tokens = count_tokens(separator)
+
+    passages: List[Dict[str, Any]] = []
+    used = 0
+    for document in documents:
+        text = document.page_content.strip()
+        source = document.metadata.get("source", "Unknown")
+        if not text or any(passage["source"] == source and text in passage["text"] for passage in passages):
+            continue
+        index = document.metadata.get("chunk_index")
+
+        placement = _attach(passages, source, index, text, max_overlap)
+        if placement is None:
+            addition, joiner = text, separator if passages else ""
+        else:
+            passage, side, overlap = placement
+            # Without overlap the split fell on a separator, most likely a paragraph break
+            addition = text[overlap:] if side == "append" else text[:len(text) - overlap]
+            joiner = "" if overlap else separator
+
+        available = token_budget - used - (separator_tokens if joiner else 0)
+        tokens = count_tokens(addition)
+        if tokens > available:
+            if placement is not None and side == "prepend":
+                continue  # A cut here would leave a gap before the passage
+            addition = _trim_to_sentences(addition, available)
+            if count_tokens(addition) < MIN_CUT_TOKENS:
+                continue
+            tokens = count_tokens(addition)
+        used += tokens + (separator_tokens if joiner else 0)
+
+        if placement is None:
+            passages.append({"source": source, "text": addition, "chunk_indexes": [index]})
+        elif side == "append":
+            passage["text"] += joiner + addition
+            passage["chunk_indexes"].append(index)
+        else:
+            passage["text"] = addition + joiner + passage["text"]
+            passage["chunk_indexes"].insert(0, index)
+
+    # Token counts are not exactly additive across joins: trim the tail until within budget
+    context = separator.join(passage["text"] for passage in passages)
+    excess = count_tokens(context) - token_budget
+    while passages and excess > 0:
+        last = passages[-1]
+        last["text"] = _trim_to_sentences(last["text"], count_tokens(last["text"]) - excess)
+        if not last["text"]:
+            passages.pop()
+        context = separator.join(passage["text"] for passage in passages)
+        excess = count_tokens(context) - token_budget
+
+    return {
+        "text": context,
+        "tokens": count_tokens(context),
+        "documents": [
+            Document(
+                page_content=passage["text"],
+                metadata={
+                    "source": passage["source"],
+                    "chunk_index": passage["chunk_indexes"][0],
+                    "chunk_indexes": passage["chunk_indexes"]
+                }
+            )
+            for passage in passages
+        ],
+        "chunks": sum(len(passage["chunk_indexes"]) for passage in passages)
+    }
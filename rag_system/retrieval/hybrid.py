@@ -0,0 +1,214 @@
+"""
+Hybrid Retrieval for BrainGenTechnology RAG System
+Runs BM25 (lexical) and dense search (Chroma, or the in-process NumPy index)
+concurrently and fuses the two rankings with reciprocal rank fusion
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from monitoring import get_metrics
+from utils.embedding_cache import embed_queries
+from retrieval.bm25 import BM25Index
+from retrieval.vector_index import NumpyVectorIndex, VECTOR_STORE_TYPES
+
+logger = logging.getLogger(__name__)
+
+RETRIEVAL_MODES = ("dense", "sparse", "hybrid")
+
+# (chunk ID, chunk, score) in rank order
+Ranking = List[Tuple[str, Document, float]]
+
+# Lexical search runs here while the calling thread does the dense search
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bm25")
+
+def reciprocal_rank_fusion(rankings: List[Ranking], rrf_k: int = 60) -> Ranking:
+    """Fuse rankings: score(d) = sum over rankings of 1 / (rrf_k + rank(d))"""
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, (chunk_id, document, _) in enumerate(ranking, start=1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (rrf_k + rank)
+            documents.setdefault(chunk_id, document)
+
+    fused = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return [(chunk_id, documents[chunk_id], score) for chunk_id, score in fused]
+
+class HybridSearcher:
+    """
+    Dense, sparse or hybrid top-k search over the knowledge base collection
+    The BM25 index (and NumPy vector index, if selected) mirror the collection
+    and are refreshed on reload
+    """
+
+    def __init__(
+        self,
+        vectorstore,
+        embeddings: Embeddings,
+        mode: str = None,
+        rrf_k: int = None,
+        candidates: int = None,
+        vector_store_type: str = None
+    ):
+        self.embeddings = embeddings
+        self.mode = mode or settings.retrieval_mode
+        if self.mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{self.mode}', expected one of {RETRIEVAL_MODES}")
+        self.rrf_k = rrf_k or settings.rrf_k
+        self.candidates = candidates or settings.hybrid_candidates
+        self.vector_store_type = vector_store_type or settings.vector_store_type
+        if self.vector_store_type not in VECTOR_STORE_TYPES:
+            raise ValueError(
+                f"Unknown vector store type '{self.vector_store_type}', expected one of {VECTOR_STORE_TYPES}"
+            )
+        self.bm25 = BM25Index()
+        self.vector_index: Optional[NumpyVectorIndex] = None
+        self.vectorstore = None
+        self.set_vectorstore(vectorstore)
+
+    def set_vectorstore(self, vectorstore):
+        """Search a (re)opened collection, bringing the BM25 and vector indexes up to date"""
+        self.vectorstore = vectorstore
+        if self.mode != "sparse" and self.vector_store_type == "numpy":
+            try:
+                self.vector_index = NumpyVectorIndex.from_collection(vectorstore._collection)
+            except Exception as e:
+                logger.error(f"NumPy vector index unavailable, searching Chroma: {e}")
+                self.vector_index = None
+        if self.mode != "dense":
+            start = time.perf_counter()
+            added, removed = self.bm25.sync_from_collection(vectorstore._collection)
+            logger.info(
+                f"BM25 index ready: {len(self.bm25)} chunks (+{added} -{removed}) "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+
+    @property
+    def dense_backend(self) -> str:
+        return "numpy" if self.vector_index is not None else "chroma"
+
+    def dense_search(self, query_embedding: List[float], n: int) -> Ranking:
+        """Nearest chunks by embedding; score is cosine similarity for normalized vectors"""
+        return self.dense_search_batch([query_embedding], n)[0]
+
+    def dense_search_batch(self, query_embeddings: List[List[float]], n: int) -> List[Ranking]:
+        """dense_search() for many queries in one index call"""
+        if self.vector_index is not None:
+            return self.vector_index.search_batch(query_embeddings, n)
+        result = self.vectorstore._collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n,
+            include=["documents", "metadatas", "distances"]
+        )
+        return [
+            [
+                (chunk_id, Document(page_content=text or "", metadata=metadata or {}), 1.0 - distance / 2)
+                for chunk_id, text, metadata, distance in zip(ids, texts, metadatas, distances)
+            ]
+            for ids, texts, metadatas, distances in zip(
+                result["ids"], result["documents"], result["metadatas"], result["distances"]
+            )
+        ]
+
+    def sparse_search(self, query: str, n: int) -> Ranking:
+        """Best BM25 matches"""
+        ranking = []
+        for chunk_id, score in self.bm25.search(query, n):
+            # A reload may remove the chunk between search() and get()
+            document = self.bm25.get(chunk_id)
+            if document is not None:
+                ranking.append((chunk_id, document, score))
+        return ranking
+
+    def search(
+        self,
+        query: str,
+        k: int = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Top-k chunks with scores (cosine for dense, BM25 for sparse, RRF for hybrid)
+
+        Args:
+            query_embedding: Reuse an embedding computed earlier in the request
+        """
+        k = k or settings.retrieval_k
+        start = time.perf_counter()
+
+        if self.mode == "sparse":
+            ranking = self.sparse_search(query, k)
+        elif self.mode == "dense":
+            ranking = self.dense_search(query_embedding or self.embeddings.embed_query(query), k)
+        else:
+            n = max(k, self.candidates)
+            lexical = _executor.submit(self.sparse_search, query, n)
+            dense = self.dense_search(query_embedding or self.embeddings.embed_query(query), n)
+            ranking = reciprocal_rank_fusion([dense, lexical.result()], self.rrf_k)
+
+        get_metrics().record_retrieval(self.mode, time.perf_counter() - start)
+        return [(document, score) for _, document, score in ranking[:k]]
+
+    async def asearch(
+        self,
+        query: str,
+        k: int = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Tuple[Document, float]]:
+        """search() without blocking the event loop"""
+        return await asyncio.to_thread(self.search, query, k, query_embedding)
+
+    def search_batch(
+        self,
+        queries: List[str],
+        k: int = None,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        search() for many queries: one embedding forward pass and one dense
+        index call for the whole batch, with BM25 running alongside
+
+        Returns:
+            Ranked (chunk, score) lists in the order of queries
+        """
+        if not queries:
+            return []
+        k = k or settings.retrieval_k
+        start = time.perf_counter()
+
+        if self.mode == "sparse":
+            rankings = [self.sparse_search(query, k) for query in queries]
+        else:
+            n = k if self.mode == "dense" else max(k, self.candidates)
+            lexical = None
+            if self.mode == "hybrid":
+                lexical = _executor.submit(lambda: [self.sparse_search(query, n) for query in queries])
+            if query_embeddings is None:
+                query_embeddings = embed_queries(self.embeddings, queries)
+            rankings = self.dense_search_batch(query_embeddings, n)
+            if lexical is not None:
+                rankings = [
+                    reciprocal_rank_fusion([dense, sparse], self.rrf_k)
+                    for dense, sparse in zip(rankings, lexical.result())
+                ]
+
+        get_metrics().record_retrieval_batch(self.mode, len(queries), time.perf_counter() - start)
+        return [[(document, score) for _, document, score in ranking[:k]] for ranking in rankings]
+
+    async def asearch_batch(
+        self,
+        queries: List[str],
+        k: int = None,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """search_batch() without blocking the event loop"""
+        return await asyncio.to_thread(self.search_batch, queries, k, query_embeddings)
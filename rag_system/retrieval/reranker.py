@@ -0,0 +1,163 @@
+"""
+Cross-Encoder Re-Ranking for BrainGenTechnology RAG System
+Over-fetches retrieval candidates and scores (query, chunk) pairs with a
+small CPU cross-encoder in one batched call; the context packer then fills
+the token budget from the new order. A per-request latency budget decides,
+before scoring, how many candidates can be re-ranked in time and skips the
+stage otherwise
+"""
+import logging
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from monitoring import get_metrics
+
+logger = logging.getLogger(__name__)
+
+class CrossEncoderReranker:
+    """
+    Batched cross-encoder scoring with a learned per-pair cost estimate used to
+    stay inside the latency budget
+    """
+
+    def __init__(self, model_name: str = None, device: str = None, batch_size: int = 32):
+        from sentence_transformers import CrossEncoder
+
+        self.model_name = model_name or settings.rerank_model
+        self.model = CrossEncoder(
+            self.model_name,
+            device=device or settings.embeddings_device,
+            max_length=512
+        )
+        self.batch_size = batch_size
+        self._seconds_per_pair: Optional[float] = None
+        self._lock = threading.Lock()
+        self._warm_up()
+
+    def _warm_up(self):
+        """Run one batch so the first request neither pays nor mis-estimates the setup cost"""
+        pairs = [("warm up", "warm up " * 50)] * 8
+        self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+        self.score_pairs(pairs)
+        logger.info(
+            f"Cross-encoder {self.model_name} ready "
+            f"({self._seconds_per_pair * 1000:.2f} ms per pair)"
+        )
+
+    def affordable_pairs(self, seconds: float) -> int:
+        """How many pairs can be scored in the given time"""
+        if not self._seconds_per_pair:
+            return 0
+        return int(seconds / self._seconds_per_pair)
+
+    def score_pairs(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Relevance logits for (query, passage) pairs, one batched forward pass"""
+        start = time.perf_counter()
+        scores = self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+        per_pair = (time.perf_counter() - start) / max(1, len(pairs))
+        with self._lock:
+            # Pessimistic: adopt slowdowns at once (e.g. CPU contention), recover gradually
+            if self._seconds_per_pair is None or per_pair > self._seconds_per_pair:
+                self._seconds_per_pair = per_pair
+            else:
+                self._seconds_per_pair = 0.8 * self._seconds_per_pair + 0.2 * per_pair
+        return [float(score) for score in scores]
+
+    def rerank(
+        self,
+        query: str,
+        candidates: List[Tuple[Document, float]],
+        deadline: float
+    ) -> Optional[List[Tuple[Document, float]]]:
+        """
+        Candidates re-ordered by cross-encoder score
+
+        Args:
+            deadline: time.perf_counter() value the re-ranking must finish by
+
+        Returns:
+            None when not even the minimum useful number of candidates fits
+            before the deadline (re-ranking skipped). Candidates beyond the
+            budget follow the re-ranked ones in retrieval order, with scores
+            stepped down from the lowest cross-encoder score (order only)
+        """
+        if not candidates:
+            return []
+        metrics = get_metrics()
+        minimum = min(len(candidates), settings.retrieval_k)
+        affordable = self.affordable_pairs(deadline - time.perf_counter())
+        if affordable < minimum:
+            metrics.record_rerank_skipped("budget")
+            # Skipped requests measure nothing: let the estimate relax so a later request probes again
+            with self._lock:
+                self._seconds_per_pair *= 0.9
+            return None
+
+        # Re-rank as many of the best candidates as the budget allows; the rest keep retrieval order
+        head, tail = candidates[:affordable], candidates[affordable:]
+        start = time.perf_counter()
+        scores = self.score_pairs([(query, document.page_content) for document, _ in head])
+        metrics.record_rerank(time.perf_counter() - start, len(head))
+
+        ranked = sorted(zip((document for document, _ in head), scores), key=lambda item: item[1], reverse=True)
+        # Retrieval scores (cosine, BM25, RRF) are not comparable to logits: rank the tail below
+        floor = ranked[-1][1] if ranked else 0.0
+        return ranked + [(document, floor - position) for position, (document, _) in enumerate(tail, start=1)]
+
+_reranker: Optional[CrossEncoderReranker] = None
+_reranker_failed = False
+_reranker_lock = threading.Lock()
+
+def get_reranker() -> Optional[CrossEncoderReranker]:
+    """The shared cross-encoder, or None when re-ranking is disabled or unavailable"""
+    global _reranker, _reranker_failed
+    if not settings.rerank_enabled or _reranker_failed:
+        return None
+    with _reranker_lock:
+        if _reranker is None and not _reranker_failed:
+            try:
+                _reranker = CrossEncoderReranker()
+            except Exception as e:
+                logger.error(f"Re-ranking disabled, cross-encoder failed to load: {e}")
+                _reranker_failed = True
+    return _reranker
+
+def retrieve_reranked(
+    searcher,
+    query: str,
+    query_embedding: Optional[List[float]] = None,
+    started_at: Optional[float] = None
+) -> List[Tuple[Document, float]]:
+    """
+    Ranked context candidates for pack_context()
+    Re-ranked when enabled; retrieval order when re-ranking is disabled,
+    skipped for the latency budget, or fails
+
+    Args:
+        started_at: time.perf_counter() at request start; the latency budget
+            covers retrieval and re-ranking from there
+    """
+    reranker = get_reranker()
+    if reranker is None:
+        return searcher.search(query, settings.context_candidates, query_embedding=query_embedding)
+
+    started_at = started_at or time.perf_counter()
+    deadline = started_at + settings.rerank_budget_ms / 1000
+    candidates = searcher.search(query, settings.rerank_candidates, query_embedding=query_embedding)
+
+    try:
+        ranked = reranker.rerank(query, candidates, deadline)
+    except Exception as e:
+        logger.error(f"Re-ranking failed: {e}")
+        get_metrics().record_rerank_skipped("error")
+        ranked = None
+
+    return candidates if ranked is None else ranked
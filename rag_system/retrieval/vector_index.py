@@ -0,0 +1,217 @@
+"""
+In-Process NumPy Vector Index for BrainGenTechnology RAG System
+Exact top-k over all chunk embeddings as one matrix-vector product, for
+knowledge bases small enough that Chroma's client/SQLite/HNSW overhead costs
+more than the math. The matrix is memory-mapped from a .npy snapshot of the
+collection so server workers share one copy through the page cache
+"""
+import hashlib
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings, CHROMA_DIR
+from utils.kb_version import read_kb_version
+
+logger = logging.getLogger(__name__)
+
+VECTOR_STORE_TYPES = ("chroma", "numpy")
+# Beside, not inside, the Chroma directory: snapshots are derived data, never committed
+INDEX_DIR = CHROMA_DIR.parent / "numpy_index"
+DTYPES = {"float32": np.float32, "float16": np.float16}
+BLOCK_ROWS = 2048
+
+class NumpyVectorIndex:
+    """
+    Read-only exact cosine search over a normalized (n_chunks, dim) matrix
+    Rebuild it (from_collection) after the knowledge base changes
+    """
+
+    def __init__(self, ids: List[str], matrix: np.ndarray, documents: List[str], metadatas: List[dict]):
+        self.ids = ids
+        self.matrix = matrix
+        self.documents = documents
+        self.metadatas = metadatas
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes
+
+    @classmethod
+    def from_collection(
+        cls,
+        collection,
+        dtype: str = None,
+        max_chunks: int = None,
+        index_dir: Path = INDEX_DIR,
+        batch_size: int = 1000
+    ) -> Optional["NumpyVectorIndex"]:
+        """
+        Load (or snapshot, then load) the collection's embeddings
+
+        Returns:
+            None when the collection is empty or larger than max_chunks, in which
+            case callers keep searching Chroma
+        """
+        dtype = dtype or settings.numpy_index_dtype
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown numpy index dtype '{dtype}', expected one of {tuple(DTYPES)}")
+        max_chunks = max_chunks or settings.numpy_index_max_chunks
+
+        count = collection.count()
+        if not count:
+            return None
+        if count > max_chunks:
+            logger.info(f"{count} chunks exceed numpy_index_max_chunks={max_chunks}, searching Chroma instead")
+            return None
+
+        start = time.perf_counter()
+        info = {
+            # A knowledge base the indexer never versioned is keyed by its chunk IDs instead
+            "kb_version": read_kb_version() or cls._fingerprint(collection),
+            "collection": collection.name,
+            "embeddings_model": settings.embeddings_model_id,
+            "dtype": dtype,
+            "count": count
+        }
+        matrix_file = index_dir / f"{collection.name}.{dtype}.npy"
+        chunks_file = index_dir / f"{collection.name}.{dtype}.json"
+
+        index = cls._load(matrix_file, chunks_file, info)
+        source = "snapshot"
+        if index is None:
+            index = cls._build(collection, matrix_file, chunks_file, info, DTYPES[dtype], batch_size)
+            source = "collection"
+
+        logger.info(
+            f"NumPy vector index ready: {len(index)} chunks x {index.matrix.shape[1]} {dtype} "
+            f"({index.nbytes / 1e6:.1f} MB, from {source}) in {time.perf_counter() - start:.2f}s"
+        )
+        return index
+
+    @staticmethod
+    def _fingerprint(collection) -> str:
+        """Version stand-in for an unversioned knowledge base: a hash of the sorted chunk IDs"""
+        ids = sorted(collection.get(include=[])["ids"])
+        return "ids-" + hashlib.sha1("\n".join(ids).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _load(cls, matrix_file: Path, chunks_file: Path, info: dict) -> Optional["NumpyVectorIndex"]:
+        """Memory-map an existing snapshot if it was taken from the same knowledge base version"""
+        if not (matrix_file.exists() and chunks_file.exists()):
+            return None
+        try:
+            chunks = json.loads(chunks_file.read_text(encoding="utf-8"))
+            if chunks.get("info") != info:
+                return None
+            matrix = np.load(matrix_file, mmap_mode="r")
+            if matrix.shape[0] != len(chunks["ids"]):
+                return None
+            return cls(chunks["ids"], matrix, chunks["documents"], chunks["metadatas"])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable numpy index snapshot: {e}")
+            return None
+
+    @classmethod
+    def _build(
+        cls,
+        collection,
+        matrix_file: Path,
+        chunks_file: Path,
+        info: dict,
+        dtype,
+        batch_size: int
+    ) -> "NumpyVectorIndex":
+        """Read every embedding out of Chroma, normalize, snapshot to disk and memory-map"""
+        ids, documents, metadatas, vectors = [], [], [], []
+        for offset in range(0, info["count"], batch_size):
+            batch = collection.get(
+                include=["embeddings", "documents", "metadatas"],
+                limit=batch_size,
+                offset=offset
+            )
+            ids.extend(batch["ids"])
+            documents.extend(text or "" for text in batch["documents"])
+            metadatas.extend(metadata or {} for metadata in batch["metadatas"])
+            vectors.append(np.asarray(batch["embeddings"], dtype=np.float32))
+
+        matrix = np.concatenate(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.ascontiguousarray(matrix / np.maximum(norms, 1e-12), dtype=dtype)
+
+        # Snapshot keyed by kb_version: other workers and restarts map it instead of re-reading Chroma
+        info = dict(info, count=len(ids))
+        # Unique temporary names: workers rebuilding at the same time never write the same file
+        tmp_files = []
+        try:
+            matrix_file.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=matrix_file.parent, suffix=".npy.tmp", delete=False) as tmp_matrix:
+                tmp_files.append(tmp_matrix.name)
+                np.save(tmp_matrix, matrix)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=chunks_file.parent, suffix=".json.tmp", encoding="utf-8", delete=False
+            ) as tmp_chunks:
+                tmp_files.append(tmp_chunks.name)
+                json.dump({"info": info, "ids": ids, "documents": documents, "metadatas": metadatas}, tmp_chunks)
+            os.replace(tmp_files[0], matrix_file)
+            os.replace(tmp_files[1], chunks_file)
+            tmp_files = []
+            matrix = np.load(matrix_file, mmap_mode="r")
+        except Exception as e:
+            logger.warning(f"Could not write numpy index snapshot, keeping it in memory: {e}")
+        finally:
+            for name in tmp_files:
+                Path(name).unlink(missing_ok=True)
+
+        return cls(ids, matrix, documents, metadatas)
+
+    def search(self, query_embedding: List[float], k: int) -> List[Tuple[str, Document, float]]:
+        """Top-k (chunk ID, chunk, cosine similarity), best first"""
+        return self.search_batch([query_embedding], k)[0]
+
+    def search_batch(self, query_embeddings: List[List[float]], k: int) -> List[List[Tuple[str, Document, float]]]:
+        """search() for many queries with one matrix-matrix product"""
+        if not self.ids:
+            return [[] for _ in query_embeddings]
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(len(query_embeddings), -1)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+        if self.matrix.dtype == np.float32:
+            scores = queries @ self.matrix.T
+        else:
+            # NumPy has no BLAS kernel for float16: upcast cache-sized row blocks instead
+            scores = np.empty((len(queries), len(self.ids)), dtype=np.float32)
+            for start in range(0, len(self.ids), BLOCK_ROWS):
+                block = self.matrix[start:start + BLOCK_ROWS]
+                scores[:, start:start + len(block)] = queries @ block.astype(np.float32).T
+
+        k = min(k, len(self.ids))
+        if k < len(self.ids):
+            top = np.argpartition(scores, -k, axis=1)[:, -k:]
+        else:
+            top = np.tile(np.arange(len(self.ids)), (len(queries), 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            [
+                (self.ids[i], Document(page_content=self.documents[i], metadata=dict(self.metadatas[i])), float(score))
+                for i, score in zip(row, row_scores)
+            ]
+            for row, row_scores in zip(top, top_scores)
+        ]
@@ -20,10 +20,12 @@ from pydantic import BaseModel
 
 # Try imports with fallbacks
 try:
-    from langchain_groq import ChatGroq
-    from langchain_community.embeddings import HuggingFaceEmbeddings
-    from langchain_community.vectorstores import Chroma
-    from config.settings import settings, CHROMA_DIR
+    from config.settings import settings
+    from utils.llm_clients import get_chat_model
+    from utils.embeddings_provider import get_embeddings
+    from utils.knowledge_base import index_exists, open_vectorstore, reload_vectorstore
+    from utils.kb_version import KBVersionMonitor
+    from retrieval import pack_context
     IMPORTS_OK = True
 except Exception as e:
     print(f"⚠️ Import warning: {e}")
@@ -61,6 +63,7 @@ class ChatResponse(BaseModel):
 # Global variables
 groq_llm = None
 vectorstore = None
+kb_monitor = None
 conversations = {}
 
 def initialize_groq():
@@ -70,13 +73,7 @@ def initialize_groq():
         if not IMPORTS_OK:
             return False
             
-        groq_llm = ChatGroq(
-            groq_api_key=settings.groq_api_key,
-            model_name=settings.llm_model,
-            temperature=0.3,
-            max_tokens=1000,
-            timeout=30
-        )
+        groq_llm = get_chat_model(temperature=0.3, max_tokens=1000, timeout=30)
         
         # Test the connection
         test_response = groq_llm.invoke("Say 'Groq connected' and nothing else.")
@@ -89,21 +86,16 @@ def initialize_groq():
 
 def initialize_vectorstore():
     """Initialize vectorstore if available"""
-    global vectorstore
+    global vectorstore, kb_monitor
     try:
         if not IMPORTS_OK:
             return False
             
-        if (CHROMA_DIR / "chroma.sqlite3").exists():
-            embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-mpnet-base-v2"
-            )
+        if index_exists():
+            embeddings = get_embeddings()
             
-            vectorstore = Chroma(
-                persist_directory=str(CHROMA_DIR),
-                embedding_function=embeddings,
-                collection_name="braingentech_knowledge"
-            )
+            kb_monitor = KBVersionMonitor()
+            vectorstore = open_vectorstore(embeddings)
             
             print(f"✅ Vectorstore loaded with {vectorstore._collection.count()} documents")
             return True
@@ -115,18 +107,26 @@ def initialize_vectorstore():
         print(f"❌ Vectorstore initialization failed: {e}")
         return False
 
+def current_vectorstore():
+    """The vectorstore, reopened when the indexer has changed the knowledge base"""
+    global vectorstore
+    if vectorstore is not None and kb_monitor.changed():
+        vectorstore = reload_vectorstore(get_embeddings(), vectorstore)
+    return vectorstore
+
 def get_relevant_context(query: str, k: int = 3) -> str:
     """Get relevant context from vectorstore"""
     try:
+        vectorstore = current_vectorstore()
         if vectorstore is None:
             return ""
             
-        docs = vectorstore.similarity_search(query, k=k)
+        docs = vectorstore.similarity_search(query, k=max(k, settings.context_candidates))
         if not docs:
             return ""
             
-        context = "\n\n".join([doc.page_content for doc in docs])
-        return context[:2000]  # Limit context length
+        # Overlap-free, sentence-aligned context within settings.context_token_budget
+        return pack_context(docs)["text"]
         
     except Exception as e:
         print(f"⚠️ Context retrieval failed: {e}")
@@ -205,7 +205,7 @@ async def generate_response(message: str, session_id: str) -> Dict[str, Any]:
         prompt = create_business_prompt(message, context)
         
         # Get Groq response
-        response = groq_llm.invoke(prompt)
+        response = await groq_llm.ainvoke(prompt)
         
         # Prepare sources
         sources = []
@@ -141,8 +141,7 @@ def show_status():
     if (chroma_dir / "chroma.sqlite3").exists():
         try:
             from utils.indexer import DocumentIndexer
-            indexer = DocumentIndexer()
-            stats = indexer.get_index_statistics()
+            stats = DocumentIndexer.get_index_statistics()
             print(f"Total chunks: {stats.get('total_chunks', 'Unknown')}")
             print(f"Embeddings model: {stats.get('embeddings_model', 'Unknown')}")
         except Exception as e:
@@ -35,12 +35,10 @@ def test_groq():
 
 def test_embeddings():
     try:
-        from langchain_community.embeddings import HuggingFaceEmbeddings
+        from utils.embeddings_provider import get_embeddings
         print("✅ Embeddings import successful")
         
-        embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-mpnet-base-v2"
-        )
+        embeddings = get_embeddings()
         print("✅ Embeddings initialized")
         
         # Test embedding
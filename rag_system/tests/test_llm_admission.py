@@ -0,0 +1,56 @@
+"""
+Admission control regression tests for BrainGenTechnology RAG System
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GROQ_API_KEY", "test-groq-key")
+
+import asyncio
+
+from utils.llm_admission import AdmissionController
+
+def make_controller(limit: int = 1) -> AdmissionController:
+    return AdmissionController(
+        "test-model", max_limit=limit, min_limit=1, requests_per_minute=0, tokens_per_minute=0,
+        max_wait={"interactive": 5.0, "background": 5.0}
+    )
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        controller = make_controller()
+        assert await controller.acquire("interactive", 10)
+
+        waiter = asyncio.create_task(controller.acquire("interactive", 10))
+        await asyncio.sleep(0)
+        assert controller.stats()["queued_interactive"] == 1
+
+        # The waiter's future is cancelled, its cleanup has not run yet
+        waiter.cancel()
+        controller.release(200, 0.01)
+        assert controller.in_flight == 0
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        assert controller.stats()["queued_interactive"] == 0
+
+        # The full capacity is still available
+        assert await asyncio.wait_for(controller.acquire("interactive", 10), 1.0)
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
+
+def test_released_slot_goes_to_next_waiter():
+    async def scenario():
+        controller = make_controller()
+        assert await controller.acquire("interactive", 10)
+        waiter = asyncio.create_task(controller.acquire("background", 10))
+        await asyncio.sleep(0)
+        controller.release(200, 0.01)
+        assert await asyncio.wait_for(waiter, 1.0)
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
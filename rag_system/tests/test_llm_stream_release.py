@@ -0,0 +1,87 @@
+"""
+Streamed LLM response admission tests for BrainGenTechnology RAG System
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GROQ_API_KEY", "test-groq-key")
+
+import asyncio
+import gc
+import json
+
+import httpx
+from langchain_groq import ChatGroq
+
+from utils.llm_admission import AdmissionController
+from utils.llm_clients import PooledAsyncTransport
+
+class SlowStreamPool(httpx.AsyncBaseTransport):
+    """Answers every completion with an SSE stream of one token every 10 ms"""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async def events():
+            for i in range(50):
+                await asyncio.sleep(0.01)
+                chunk = {
+                    "id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "test-model",
+                    "choices": [{"index": 0, "delta": {"role": "assistant", "content": f"token{i} "}, "finish_reason": None}]
+                }
+                yield f"data: {json.dumps(chunk)}\n\n".encode()
+            yield b"data: [DONE]\n\n"
+
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=events(), request=request)
+
+def make_llm():
+    controller = AdmissionController(
+        "test-model", max_limit=4, min_limit=1, requests_per_minute=0, tokens_per_minute=0,
+        max_wait={"interactive": 5.0, "background": 5.0}
+    )
+    client = httpx.AsyncClient(transport=PooledAsyncTransport(SlowStreamPool(), controller, "interactive"))
+    llm = ChatGroq(groq_api_key="test-groq-key", model_name="test-model", max_retries=0, http_async_client=client)
+    return llm, controller
+
+async def settle():
+    # Abandoned generators are finalized by the event loop on collection
+    for _ in range(3):
+        gc.collect()
+        await asyncio.sleep(0.02)
+
+def test_cancelled_stream_releases_its_slot():
+    async def scenario():
+        llm, controller = make_llm()
+        first_token = asyncio.Event()
+
+        async def consume():
+            async for _ in llm.astream("hello"):
+                first_token.set()
+
+        task = asyncio.create_task(consume())
+        await first_token.wait()
+        assert controller.in_flight == 1
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await settle()
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+def test_stream_left_early_releases_its_slot():
+    async def scenario():
+        llm, controller = make_llm()
+        async for _ in llm.astream("hello"):
+            break
+        await settle()
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+def test_stream_read_to_the_end_releases_its_slot():
+    async def scenario():
+        llm, controller = make_llm()
+        tokens = [chunk.content async for chunk in llm.astream("hello")]
+        assert len([token for token in tokens if token]) == 50
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,43 @@
+"""
+Cross-encoder re-ranking tests for BrainGenTechnology RAG System
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GROQ_API_KEY", "test-groq-key")
+
+import threading
+import time
+
+from langchain_core.documents import Document
+
+from retrieval.reranker import CrossEncoderReranker
+
+class StubReranker(CrossEncoderReranker):
+    """The re-ranking logic without loading a model: fixed cost, scores given per call"""
+
+    def __init__(self, scores):
+        self.model_name = "stub"
+        self.batch_size = 32
+        self._seconds_per_pair = 0.001
+        self._lock = threading.Lock()
+        self.scores = scores
+        self.scored = []
+
+    def score_pairs(self, pairs):
+        self.scored.append(pairs)
+        return self.scores[:len(pairs)]
+
+def test_no_candidates_skips_scoring():
+    reranker = StubReranker([])
+    assert reranker.rerank("pricing", [], time.perf_counter() + 1) == []
+    assert reranker.scored == []
+
+def test_candidates_beyond_the_budget_rank_below_the_scored_ones():
+    reranker = StubReranker([-2.0, 5.0, 1.0])
+    reranker.affordable_pairs = lambda seconds: 3
+    candidates = [(Document(page_content=f"chunk {i}"), 0.9 - i / 10) for i in range(5)]
+    ranked = reranker.rerank("pricing", candidates, time.perf_counter() + 1)
+    assert [document.page_content for document, _ in ranked] == ["chunk 1", "chunk 2", "chunk 0", "chunk 3", "chunk 4"]
+    assert [score for _, score in ranked] == [5.0, 1.0, -2.0, -3.0, -4.0]
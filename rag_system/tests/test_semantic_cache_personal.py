@@ -0,0 +1,43 @@
+"""
+Semantic cache privacy tests for BrainGenTechnology RAG System
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GROQ_API_KEY", "test-groq-key")
+
+import working_server
+
+class RecordingCache:
+    def __init__(self):
+        self.stored = []
+
+    def store(self, message, query_embedding, answer, sources, tokens, processing_time):
+        self.stored.append(message)
+
+def cache_answer(message: str) -> list:
+    cache = RecordingCache()
+    original = working_server.semantic_cache
+    working_server.semantic_cache = cache
+    try:
+        turn = {"first_turn": True, "query_embedding": [0.1, 0.2, 0.3]}
+        working_server._cache_answer(message, turn, "answer", [], 10, 0.1)
+    finally:
+        working_server.semantic_cache = original
+    return cache.stored
+
+def test_generic_question_is_cached():
+    assert cache_answer("What automation services do you offer?") == ["What automation services do you offer?"]
+
+def test_message_with_a_name_is_not_cached():
+    assert cache_answer("Hi, my name is Dana. What automation services do you offer?") == []
+
+def test_message_with_a_company_is_not_cached():
+    assert cache_answer("I work at Northwind Traders, what does a demo cost?") == []
+
+def test_message_with_an_email_is_not_cached():
+    assert cache_answer("My email is bob@acme.com, what's your pricing?") == []
+
+def test_message_with_a_phone_number_is_not_cached():
+    assert cache_answer("What's your pricing? 555-123-4567") == []
@@ -0,0 +1,38 @@
+"""
+Session store migration tests for BrainGenTechnology RAG System
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GROQ_API_KEY", "test-groq-key")
+
+import asyncio
+import json
+
+from utils.fake_redis import FakeRedis
+from utils.session_manager import SessionManager
+
+LEGACY_MESSAGES = [
+    {"type": "human", "content": "Do you build chatbots?", "timestamp": "2025-09-01T10:00:00"},
+    {"type": "ai", "content": "Yes, custom AI chatbots.", "timestamp": "2025-09-01T10:00:01"}
+]
+
+def test_legacy_session_memory_is_migrated_on_load():
+    async def scenario():
+        redis_client = FakeRedis()
+        await redis_client.setex("session_memory:s1", 3600, json.dumps(LEGACY_MESSAGES))
+        manager = SessionManager(redis_client=redis_client)
+
+        history = await manager.get_conversation_history("s1")
+        assert [message["content"] for message in history] == [m["content"] for m in LEGACY_MESSAGES]
+        assert await redis_client.get("session_memory:s1") is None
+        assert len(await redis_client.lrange("session_log:s1", 0, -1)) == 2
+
+        # New turns append after the migrated history
+        await manager.add_message_to_session("s1", "What about pricing?", "It depends on scope.")
+        await manager.flush()
+        log = [json.loads(entry)["content"] for entry in await redis_client.lrange("session_log:s1", 0, -1)]
+        assert log == [m["content"] for m in LEGACY_MESSAGES] + ["What about pricing?", "It depends on scope."]
+
+    asyncio.run(scenario())
@@ -0,0 +1,92 @@
+"""
+Compact Chat History for BrainGenTechnology RAG System
+Each session keeps its last messages in a list-backed ring buffer of
+__slots__ objects, with the time each message was stored. LangChain message
+objects are only built at the edge, for callers that need them
+"""
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+class ChatMessage:
+    """One message; type is LangChain's 'human' or 'ai', timestamp is epoch seconds"""
+
+    __slots__ = ("type", "content", "timestamp")
+
+    def __init__(self, type: str, content: str, timestamp: Optional[float] = None):
+        self.type = type
+        self.content = content
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @property
+    def role(self) -> str:
+        return "user" if self.type == "human" else "assistant"
+
+    def isoformat(self) -> str:
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+
+    def to_dict(self) -> Dict[str, str]:
+        """API representation: role, content and ISO timestamp"""
+        return {"role": self.role, "content": self.content, "timestamp": self.isoformat()}
+
+    def to_log_entry(self) -> str:
+        """Redis session log entry"""
+        return json.dumps({"type": self.type, "content": self.content, "timestamp": self.isoformat()})
+
+    @classmethod
+    def from_log_entry(cls, entry: Dict[str, Any]) -> "ChatMessage":
+        timestamp = entry.get("timestamp")
+        return cls(
+            entry["type"],
+            entry["content"],
+            datetime.fromisoformat(timestamp).timestamp() if timestamp else None
+        )
+
+    def to_langchain(self):
+        from langchain.schema import AIMessage, HumanMessage
+
+        message_class = HumanMessage if self.type == "human" else AIMessage
+        return message_class(content=self.content)
+
+    def __repr__(self) -> str:
+        return f"ChatMessage({self.type!r}, {self.content[:40]!r})"
+
+class SessionHistory:
+    """A session's last `limit` messages, oldest first; adding beyond the limit overwrites the oldest"""
+
+    __slots__ = ("limit", "_items", "_start")
+
+    def __init__(self, limit: int, messages: Optional[List[ChatMessage]] = None):
+        self.limit = limit
+        self._items: List[ChatMessage] = list(messages[-limit:]) if messages else []
+        self._start = 0  # Index of the oldest message once the buffer is full
+
+    def add(self, type: str, content: str, timestamp: Optional[float] = None) -> ChatMessage:
+        message = ChatMessage(type, content, timestamp)
+        if len(self._items) < self.limit:
+            self._items.append(message)
+        else:
+            self._items[self._start] = message
+            self._start = (self._start + 1) % self.limit
+        return message
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[ChatMessage]:
+        items, start = self._items, self._start
+        for i in range(len(items)):
+            yield items[(start + i) % len(items)]
+
+    def tail(self, n: Optional[int] = None) -> List[ChatMessage]:
+        """The last n messages (all by default), oldest first"""
+        ordered = self._items[self._start:] + self._items[:self._start]
+        return ordered if n is None else ordered[max(0, len(ordered) - n):]
+
+    def to_dicts(self) -> List[Dict[str, str]]:
+        return [message.to_dict() for message in self]
+
+    def to_langchain(self) -> List[Any]:
+        """HumanMessage / AIMessage objects for LangChain chat models and memories"""
+        return [message.to_langchain() for message in self]
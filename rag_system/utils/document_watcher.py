@@ -0,0 +1,154 @@
+"""
+Document Directory Watcher for BrainGenTechnology RAG System
+Observes DOCUMENTS_DIR with inotify (via watchdog) or stat polling as a
+fallback, and reports debounced bursts of markdown changes
+"""
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Called with the changed paths and the wall-clock time of the first change in the burst
+ChangeCallback = Callable[[Set[Path], float], None]
+
+class DocumentWatcher:
+    """
+    Collects file changes and calls back once no new change has arrived for
+    `debounce` seconds, so an editor's save burst triggers a single update
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        on_change: ChangeCallback,
+        debounce: float = 2.0,
+        poll_interval: float = 2.0,
+        suffix: str = ".md",
+        force_polling: bool = False
+    ):
+        self.directory = Path(directory)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.suffix = suffix
+        self.force_polling = force_polling
+
+        self._pending: Dict[Path, float] = {}
+        self._last_event = 0.0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self.mode: Optional[str] = None
+
+    def record(self, path: Path, changed_at: float = None):
+        """Register a change to path (thread safe)"""
+        path = Path(path)
+        if path.suffix != self.suffix:
+            return
+        with self._lock:
+            self._pending.setdefault(path, changed_at or time.time())
+            self._last_event = time.monotonic()
+        self._wakeup.set()
+
+    def run(self):
+        """Watch until stop() or Ctrl+C"""
+        observer = None if self.force_polling else self._start_observer()
+        if observer is None:
+            threading.Thread(target=self._poll_loop, daemon=True).start()
+        self.mode = "inotify" if observer is not None else "polling"
+        logger.info(f"Watching {self.directory} ({self.mode}, debounce {self.debounce}s)")
+
+        try:
+            while not self._stopped.is_set():
+                self._wakeup.wait(self._time_to_flush())
+                self._wakeup.clear()
+                self._flush_if_quiet()
+        except KeyboardInterrupt:
+            logger.info("Watch stopped")
+        finally:
+            self._stopped.set()
+            if observer is not None:
+                observer.stop()
+                observer.join()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def _time_to_flush(self) -> float:
+        """Seconds until the pending burst has been quiet for `debounce`"""
+        with self._lock:
+            if not self._pending:
+                return 1.0
+            return max(0.01, self.debounce - (time.monotonic() - self._last_event))
+
+    def _flush_if_quiet(self):
+        """Hand the pending burst to the callback once it has settled"""
+        with self._lock:
+            if not self._pending or time.monotonic() - self._last_event < self.debounce:
+                return
+            changes, self._pending = self._pending, {}
+
+        try:
+            self.on_change(set(changes), min(changes.values()))
+        except Exception as e:
+            logger.error(f"Update after document change failed: {e}")
+
+    def _start_observer(self):
+        """Start an inotify (or platform native) observer, None if watchdog is unavailable"""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.info("watchdog not installed, falling back to polling")
+            return None
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                watcher.record(Path(event.src_path))
+                dest_path = getattr(event, "dest_path", None)
+                if dest_path:
+                    watcher.record(Path(dest_path))
+
+        observer = Observer()
+        observer.schedule(Handler(), str(self.directory), recursive=True)
+        observer.start()
+        return observer
+
+    def _poll_loop(self):
+        """Polling fallback: diff stat snapshots every poll_interval"""
+        snapshot = self._snapshot()
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                snapshot = self._poll(snapshot)
+            except Exception as e:
+                logger.warning(f"Polling {self.directory} failed: {e}")
+
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.directory.rglob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Deleted mid-scan: the next snapshot reports it as removed
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def _poll(self, previous: Dict[Path, Tuple[int, int]]) -> Dict[Path, Tuple[int, int]]:
+        """Compare a new stat snapshot with the previous one and record differences"""
+        current = self._snapshot()
+        for path, state in current.items():
+            if previous.get(path) != state:
+                # The mtime is when the file was saved, not when we noticed
+                self.record(path, state[1] / 1e9)
+        for path in previous.keys() - current.keys():
+            self.record(path)
+        return current
@@ -0,0 +1,225 @@
+"""
+Query Embedding Cache for BrainGenTechnology RAG System
+Bounded, thread-safe LRU in front of an Embeddings model with optional
+SQLite persistence so warm entries survive restarts
+"""
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings, BASE_DIR
+from monitoring import get_metrics
+
+logger = logging.getLogger(__name__)
+
+def normalize_query(text: str) -> str:
+    """Cache key for a query: collapsed whitespace, lowercase"""
+    return " ".join(text.split()).lower()
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper caching query vectors by normalized text
+    Document embeddings are passed through unchanged
+    """
+
+    def __init__(
+        self,
+        base: Embeddings,
+        model_name: str,
+        max_entries: int = None,
+        persist_path: Optional[Path] = None
+    ):
+        self.base = base
+        self.model_name = model_name
+        self.max_entries = max_entries or settings.embedding_cache_max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if persist_path:
+            self._open_store(Path(persist_path))
+
+    def embed_query(self, text: str) -> List[float]:
+        key = normalize_query(text)
+        metrics = get_metrics()
+
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if vector is not None:
+            metrics.record_embedding_cache_lookup(hit=True)
+            return vector
+
+        # Encode outside the lock so concurrent misses don't serialize
+        vector = self.base.embed_query(text)
+        with self._lock:
+            self.misses += 1
+            self._put(key, vector)
+            self._persist(key, vector)
+            size = len(self._cache)
+        metrics.record_embedding_cache_lookup(hit=False)
+        metrics.update_embedding_cache_size(size)
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed many queries, encoding all cache misses in one batch"""
+        keys = [normalize_query(text) for text in texts]
+        metrics = get_metrics()
+
+        vectors: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    vectors[key] = vector
+        hits = sum(1 for key in keys if key in vectors)
+
+        misses: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                misses.setdefault(key, text)
+        if misses:
+            encoded = embed_queries(self.base, list(misses.values()))
+            with self._lock:
+                for key, vector in zip(misses, encoded):
+                    vectors[key] = vector
+                    self._put(key, vector)
+                    self._persist(key, vector)
+                size = len(self._cache)
+            metrics.update_embedding_cache_size(size)
+
+        with self._lock:
+            self.hits += hits
+            self.misses += len(keys) - hits
+        for key in keys:
+            metrics.record_embedding_cache_lookup(hit=key not in misses)
+        return [vectors[key] for key in keys]
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "persistent": self._db is not None
+        }
+
+    def clear(self):
+        """Drop all cached vectors, including persisted ones"""
+        with self._lock:
+            self._cache.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM query_embeddings WHERE model = ?", (self.model_name,))
+                self._db.commit()
+        get_metrics().update_embedding_cache_size(0)
+
+    def _put(self, key: str, vector: List[float]):
+        """Insert into the LRU (caller holds the lock)"""
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            evicted, _ = self._cache.popitem(last=False)
+            if self._db is not None:
+                self._db.execute(
+                    "DELETE FROM query_embeddings WHERE model = ? AND query = ?",
+                    (self.model_name, evicted)
+                )
+
+    def _open_store(self, path: Path):
+        """Open the SQLite store and warm the LRU from it"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "model TEXT NOT NULL, query TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, query))"
+            )
+            self._db.commit()
+
+            rows = self._db.execute(
+                "SELECT query, vector FROM query_embeddings WHERE model = ? "
+                "ORDER BY rowid DESC LIMIT ?",
+                (self.model_name, self.max_entries)
+            ).fetchall()
+            # Oldest first so the most recent entries end up most recently used
+            for query, blob in reversed(rows):
+                self._cache[query] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            logger.info(f"Embedding cache warmed with {len(rows)} entries from {path}")
+        except Exception as e:
+            logger.warning(f"Embedding cache persistence disabled: {e}")
+            self._db = None
+
+    def _persist(self, key: str, vector: List[float]):
+        """Write one entry to the SQLite store (caller holds the lock)"""
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO query_embeddings (model, query, vector) VALUES (?, ?, ?)",
+                (self.model_name, key, np.asarray(vector, dtype=np.float32).tobytes())
+            )
+            self._db.commit()
+        except Exception as e:
+            logger.warning(f"Could not persist embedding cache entry: {e}")
+
+# Backends whose embed_query() is embed_documents() of one text: queries batch as documents
+SYMMETRIC_BACKENDS = ("langchain_community.embeddings.huggingface.HuggingFaceEmbeddings",)
+
+def embed_queries(embeddings: Embeddings, texts: List[str]) -> List[List[float]]:
+    """
+    Embed a batch of queries in one forward pass where the model allows it:
+    backends with embed_queries() (cache, remote service, ONNX) and symmetric
+    ones. Others may encode queries differently from passages (e5 / bge
+    instruction prefixes) and embed each query with embed_query()
+    """
+    if not texts:
+        return []
+    batch = getattr(embeddings, "embed_queries", None)
+    if batch is not None:
+        return batch(texts)
+    backend = type(embeddings)
+    if f"{backend.__module__}.{backend.__qualname__}" in SYMMETRIC_BACKENDS:
+        return embeddings.embed_documents(texts)
+    return [embeddings.embed_query(text) for text in texts]
+
+def with_query_cache(embeddings: Embeddings, model_name: str = None) -> Embeddings:
+    """Wrap an embeddings model with the query cache when enabled in settings"""
+    if not settings.embedding_cache_enabled:
+        return embeddings
+
+    persist_path = None
+    if settings.embedding_cache_path:
+        persist_path = Path(settings.embedding_cache_path)
+        if not persist_path.is_absolute():
+            persist_path = BASE_DIR / persist_path
+
+    # Vectors from different backends differ slightly: keep their cache entries apart
+    return CachedEmbeddings(
+        embeddings,
+        model_name=model_name or settings.embeddings_model_id,
+        persist_path=persist_path
+    )
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Local Embedding Service for BrainGenTechnology RAG System
+Holds a single copy of the embedding model and serves it over HTTP to
+every uvicorn worker configured with EMBEDDING_SERVICE_URL
+"""
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import logging
+from typing import List
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+from config.settings import settings
+from utils.embeddings_provider import get_local_embeddings
+
+logger = logging.getLogger(__name__)
+
+app = FastAPI(
+    title="BrainGenTechnology Embedding Service",
+    description="Shared sentence-transformers model for RAG workers",
+    version="1.0.0"
+)
+
+class EmbedRequest(BaseModel):
+    texts: List[str] = Field(..., description="Texts to embed")
+    kind: str = Field(default="documents", description="'query' or 'documents'")
+
+class EmbedResponse(BaseModel):
+    embeddings: List[List[float]]
+    model: str
+
+# Encoding is CPU bound: serialize it so one request uses all model threads
+_encode_lock = asyncio.Lock()
+
+@app.on_event("startup")
+async def startup_event():
+    """Load the model before accepting requests"""
+    await asyncio.to_thread(get_local_embeddings)
+
+@app.get("/health")
+async def health_check():
+    return {
+        "status": "healthy",
+        "model": settings.embeddings_model,
+        "device": settings.embeddings_device,
+        "batch_size": settings.embeddings_batch_size
+    }
+
+@app.post("/embed", response_model=EmbedResponse)
+async def embed(request: EmbedRequest):
+    """Embed queries or documents with the shared model"""
+    if request.kind not in ("query", "documents"):
+        raise HTTPException(status_code=400, detail="kind must be 'query' or 'documents'")
+
+    embeddings = get_local_embeddings()
+    async with _encode_lock:
+        if request.kind == "query" and len(request.texts) == 1:
+            vectors = [await asyncio.to_thread(embeddings.embed_query, request.texts[0])]
+        else:
+            # Query batches too: the local backends encode queries and documents alike
+            vectors = await asyncio.to_thread(embeddings.embed_documents, request.texts)
+
+    return EmbedResponse(embeddings=list(vectors), model=settings.embeddings_model)
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="BrainGenTechnology Embedding Service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8010)
+    args = parser.parse_args()
+
+    print(f"🧠 Embedding service: {settings.embeddings_model} on http://{args.host}:{args.port}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
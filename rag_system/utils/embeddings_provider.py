@@ -0,0 +1,113 @@
+"""
+Shared Embedding Provider for BrainGenTechnology RAG System
+Loads the embedding model once per process with the configured device,
+batch size, normalization and thread count. When EMBEDDING_SERVICE_URL is
+set, embeddings are computed by the local embedding service instead so
+several uvicorn workers share one model in memory.
+"""
+import logging
+import threading
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from utils.embedding_cache import with_query_cache
+
+logger = logging.getLogger(__name__)
+
+class RemoteEmbeddings(Embeddings):
+    """Embeddings computed by the out-of-process embedding service"""
+
+    def __init__(self, base_url: str, timeout: float = None):
+        import httpx
+
+        self.base_url = base_url.rstrip("/")
+        # One keep-alive connection pool shared by every thread of this worker
+        self.client = httpx.Client(
+            base_url=self.base_url,
+            timeout=timeout or settings.embedding_service_timeout
+        )
+
+    def _embed(self, texts: List[str], kind: str) -> List[List[float]]:
+        response = self.client.post("/embed", json={"texts": texts, "kind": kind})
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self._embed(texts, "documents")
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], "query")[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self._embed(texts, "query")
+
+_local_embeddings: Optional[Embeddings] = None
+_shared_embeddings: Optional[Embeddings] = None
+_lock = threading.Lock()
+
+def get_local_embeddings() -> Embeddings:
+    """Get the in-process embedding model, loading it on first use"""
+    global _local_embeddings
+    with _lock:
+        if _local_embeddings is None:
+            _local_embeddings = _load_local_model()
+    return _local_embeddings
+
+def get_embeddings() -> Embeddings:
+    """
+    Get the process-wide embeddings used by servers, chains and the indexer
+    (remote service client or local model, behind the query cache)
+    """
+    global _shared_embeddings
+    if _shared_embeddings is not None:
+        return _shared_embeddings
+
+    if settings.embedding_service_url:
+        base = RemoteEmbeddings(settings.embedding_service_url)
+        logger.info(f"Using embedding service at {settings.embedding_service_url}")
+    else:
+        base = get_local_embeddings()
+
+    with _lock:
+        if _shared_embeddings is None:
+            _shared_embeddings = with_query_cache(base)
+    return _shared_embeddings
+
+def _load_local_model() -> Embeddings:
+    """Load the embedding model with the configured backend"""
+    if settings.embeddings_backend == "onnx":
+        from utils.onnx_embeddings import ONNXEmbeddings
+        return ONNXEmbeddings()
+
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    if settings.embeddings_num_threads > 0:
+        try:
+            import torch
+            torch.set_num_threads(settings.embeddings_num_threads)
+        except ImportError:
+            logger.warning("torch not available, ignoring embeddings_num_threads")
+
+    embeddings = HuggingFaceEmbeddings(
+        model_name=settings.embeddings_model,
+        model_kwargs={'device': settings.embeddings_device},
+        encode_kwargs={
+            'normalize_embeddings': settings.embeddings_normalize,
+            'batch_size': settings.embeddings_batch_size
+        }
+    )
+    logger.info(
+        f"Embeddings loaded: {settings.embeddings_model} "
+        f"(device={settings.embeddings_device}, batch_size={settings.embeddings_batch_size})"
+    )
+    return embeddings
@@ -0,0 +1,225 @@
+"""
+In-process Redis Stand-in for BrainGenTechnology RAG System
+Implements the subset of the redis.asyncio client (decode_responses=True)
+used by the session store, including lists, pipelines and key expiry, so
+sessions can be exercised in tests and benchmarks without a Redis server.
+An optional per-round-trip latency makes pipelining visible, and the bytes
+of written values are counted
+"""
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Union
+
+Expiry = Union[int, float, timedelta]
+
+def _seconds(expiry: Expiry) -> float:
+    return expiry.total_seconds() if isinstance(expiry, timedelta) else float(expiry)
+
+class FakeRedis:
+    """Async Redis look-alike; every command (or pipeline execute) is one round trip"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.round_trips = 0
+        self.bytes_written = 0
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _live(self, key: str) -> bool:
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    # Commands, applied without a round trip (shared with pipelines)
+
+    def _written(self, value: Any) -> str:
+        value = str(value)
+        self.bytes_written += len(value.encode("utf-8"))
+        return value
+
+    def _list(self, key: str) -> List[str]:
+        if not self._live(key):
+            return []
+        if not isinstance(self._data[key], list):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return self._data[key]
+
+    def _get(self, key: str) -> Optional[str]:
+        if not self._live(key):
+            return None
+        if isinstance(self._data[key], list):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return self._data[key]
+
+    def _set(self, key: str, value: Any, ex: Optional[Expiry] = None) -> bool:
+        self._data[key] = self._written(value)
+        self._expires.pop(key, None)
+        if ex is not None:
+            self._expires[key] = time.monotonic() + _seconds(ex)
+        return True
+
+    def _delete(self, *keys: str) -> int:
+        deleted = 0
+        for key in keys:
+            if self._live(key):
+                del self._data[key]
+                self._expires.pop(key, None)
+                deleted += 1
+        return deleted
+
+    def _expire(self, key: str, expiry: Expiry) -> bool:
+        if not self._live(key):
+            return False
+        self._expires[key] = time.monotonic() + _seconds(expiry)
+        return True
+
+    def _rpush(self, key: str, *values: Any) -> int:
+        items = self._list(key)
+        items.extend(self._written(value) for value in values)
+        self._data[key] = items
+        return len(items)
+
+    def _lrange(self, key: str, start: int, end: int) -> List[str]:
+        items = self._list(key)
+        start, end = self._bounds(len(items), start, end)
+        return items[start:end]
+
+    def _ltrim(self, key: str, start: int, end: int) -> bool:
+        items = self._list(key)
+        start, end = self._bounds(len(items), start, end)
+        if start >= end:
+            self._delete(key)
+        elif items:
+            self._data[key] = items[start:end]
+        return True
+
+    def _llen(self, key: str) -> int:
+        return len(self._list(key))
+
+    @staticmethod
+    def _bounds(length: int, start: int, end: int) -> tuple:
+        """Redis inclusive (possibly negative) indexes as a Python slice"""
+        start = max(0, length + start if start < 0 else start)
+        end = length + end if end < 0 else min(end, length - 1)
+        return start, end + 1
+
+    def _ttl(self, key: str) -> int:
+        if not self._live(key):
+            return -2
+        expires = self._expires.get(key)
+        return -1 if expires is None else int(round(expires - time.monotonic()))
+
+    # redis.asyncio.Redis API
+
+    async def ping(self) -> bool:
+        await self._round_trip()
+        return True
+
+    async def get(self, key: str) -> Optional[str]:
+        await self._round_trip()
+        return self._get(key)
+
+    async def set(self, key: str, value: Any, ex: Optional[Expiry] = None) -> bool:
+        await self._round_trip()
+        return self._set(key, value, ex)
+
+    async def setex(self, key: str, expiry: Expiry, value: Any) -> bool:
+        await self._round_trip()
+        return self._set(key, value, expiry)
+
+    async def delete(self, *keys: str) -> int:
+        await self._round_trip()
+        return self._delete(*keys)
+
+    async def expire(self, key: str, expiry: Expiry) -> bool:
+        await self._round_trip()
+        return self._expire(key, expiry)
+
+    async def ttl(self, key: str) -> int:
+        await self._round_trip()
+        return self._ttl(key)
+
+    async def rpush(self, key: str, *values: Any) -> int:
+        await self._round_trip()
+        return self._rpush(key, *values)
+
+    async def lrange(self, key: str, start: int, end: int) -> List[str]:
+        await self._round_trip()
+        return self._lrange(key, start, end)
+
+    async def ltrim(self, key: str, start: int, end: int) -> bool:
+        await self._round_trip()
+        return self._ltrim(key, start, end)
+
+    async def llen(self, key: str) -> int:
+        await self._round_trip()
+        return self._llen(key)
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    async def aclose(self):
+        pass
+
+class FakePipeline:
+    """Buffers commands and applies them in one round trip on execute()"""
+
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands: List[tuple] = []
+
+    def _queue(self, method: str, *args, **kwargs) -> "FakePipeline":
+        self.commands.append((method, args, kwargs))
+        return self
+
+    def get(self, key: str) -> "FakePipeline":
+        return self._queue("_get", key)
+
+    def set(self, key: str, value: Any, ex: Optional[Expiry] = None) -> "FakePipeline":
+        return self._queue("_set", key, value, ex)
+
+    def setex(self, key: str, expiry: Expiry, value: Any) -> "FakePipeline":
+        return self._queue("_set", key, value, expiry)
+
+    def delete(self, *keys: str) -> "FakePipeline":
+        return self._queue("_delete", *keys)
+
+    def expire(self, key: str, expiry: Expiry) -> "FakePipeline":
+        return self._queue("_expire", key, expiry)
+
+    def ttl(self, key: str) -> "FakePipeline":
+        return self._queue("_ttl", key)
+
+    def rpush(self, key: str, *values: Any) -> "FakePipeline":
+        return self._queue("_rpush", key, *values)
+
+    def lrange(self, key: str, start: int, end: int) -> "FakePipeline":
+        return self._queue("_lrange", key, start, end)
+
+    def ltrim(self, key: str, start: int, end: int) -> "FakePipeline":
+        return self._queue("_ltrim", key, start, end)
+
+    def llen(self, key: str) -> "FakePipeline":
+        return self._queue("_llen", key)
+
+    async def execute(self) -> List[Any]:
+        commands, self.commands = self.commands, []
+        await self.redis._round_trip()
+        return [getattr(self.redis, method)(*args, **kwargs) for method, args, kwargs in commands]
+
+    async def reset(self):
+        self.commands = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.reset()
@@ -0,0 +1,179 @@
+"""
+Index Manifest for BrainGenTechnology RAG System
+SQLite sidecar next to chroma.sqlite3 recording, per source file, the content
+hash, mtime and deterministic chunk IDs, so incremental indexing can diff at
+chunk level in O(files) and index statistics never scan the collection
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings, DOCUMENTS_DIR, CHROMA_DIR
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = CHROMA_DIR / "index_manifest.sqlite3"
+MANIFEST_FORMAT = 2
+
+def content_hash(text: str) -> str:
+    """SHA-256 of a text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def source_key(file_path: Path) -> str:
+    """Stable manifest key of a document: its path relative to DOCUMENTS_DIR"""
+    try:
+        return Path(file_path).relative_to(DOCUMENTS_DIR).as_posix()
+    except ValueError:
+        return Path(file_path).as_posix()
+
+def chunk_ids(source: str, texts: List[str]) -> List[str]:
+    """
+    Deterministic chunk IDs derived from the source and the chunk text
+    Repeated identical chunks within a file are told apart by occurrence number
+    """
+    seen: Dict[str, int] = {}
+    ids = []
+    for text in texts:
+        digest = content_hash(text)
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        ids.append(hashlib.sha256(f"{source}\0{digest}\0{occurrence}".encode("utf-8")).hexdigest()[:32])
+    return ids
+
+class IndexManifest:
+    """
+    What the collection currently holds for every indexed file
+    Changes accumulate in one transaction until save(); only valid for the
+    embedding model and chunking recorded in it
+    """
+
+    def __init__(self, path: Path = MANIFEST_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS manifest_info ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS indexed_files ("
+            "source TEXT PRIMARY KEY, hash TEXT NOT NULL, size INTEGER NOT NULL, "
+            "mtime REAL NOT NULL, chunk_ids TEXT NOT NULL, chunk_count INTEGER NOT NULL, "
+            "document_type TEXT, embeddings_model TEXT NOT NULL, indexed_at TEXT NOT NULL);"
+        )
+        self._db.commit()
+
+    def reset(self):
+        """Forget every file (used before a full rebuild)"""
+        with self._lock:
+            self._db.execute("DELETE FROM indexed_files")
+            self._db.execute("DELETE FROM manifest_info")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def info(self) -> Dict[str, str]:
+        """Format, embedding model, chunking and last update of the manifest"""
+        with self._lock:
+            return dict(self._db.execute("SELECT key, value FROM manifest_info").fetchall())
+
+    def is_compatible(self) -> bool:
+        """True if the manifest describes an index built with the current settings"""
+        info = self.info()
+        return (
+            info.get("format") == str(MANIFEST_FORMAT)
+            and info.get("embeddings_model") == settings.embeddings_model_id
+            and info.get("chunk_size") == str(settings.chunk_size)
+            and info.get("chunk_overlap") == str(settings.chunk_overlap)
+        )
+
+    def sources(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT source FROM indexed_files")]
+
+    def get(self, source: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT hash, size, mtime, chunk_ids FROM indexed_files WHERE source = ?",
+                (source,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"hash": row[0], "size": row[1], "mtime": row[2], "chunk_ids": json.loads(row[3])}
+
+    def is_unchanged(self, source: str, file_path: Path) -> bool:
+        """Cheap check (no read): same size and mtime as when last indexed"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, mtime FROM indexed_files WHERE source = ?", (source,)
+            ).fetchone()
+        if row is None:
+            return False
+        stat = file_path.stat()
+        return row[0] == stat.st_size and row[1] == stat.st_mtime
+
+    def set_file(self, file_info: Dict[str, Any], ids: List[str]):
+        """Record a file's state (pending until save)"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO indexed_files (source, hash, size, mtime, chunk_ids, "
+                "chunk_count, document_type, embeddings_model, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    file_info["source"], file_info["hash"], file_info["size"], file_info["mtime"],
+                    json.dumps(ids), len(ids), file_info.get("document_type"),
+                    settings.embeddings_model_id, datetime.now().isoformat()
+                )
+            )
+
+    def remove(self, source: str):
+        """Forget a deleted file (pending until save)"""
+        with self._lock:
+            self._db.execute("DELETE FROM indexed_files WHERE source = ?", (source,))
+
+    def save(self):
+        """Commit pending changes together with the current settings"""
+        values = {
+            "format": str(MANIFEST_FORMAT),
+            "embeddings_model": settings.embeddings_model_id,
+            "chunk_size": str(settings.chunk_size),
+            "chunk_overlap": str(settings.chunk_overlap),
+            "updated_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO manifest_info (key, value) VALUES (?, ?)",
+                list(values.items())
+            )
+            self._db.commit()
+
+    def rollback(self):
+        """Discard pending changes"""
+        with self._lock:
+            self._db.rollback()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Document and chunk counts per document type, without touching Chroma"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT document_type, COUNT(*), SUM(chunk_count) FROM indexed_files "
+                "GROUP BY document_type"
+            ).fetchall()
+            last_indexed = self._db.execute("SELECT MAX(indexed_at) FROM indexed_files").fetchone()[0]
+
+        return {
+            "total_documents": sum(row[1] for row in rows),
+            "total_chunks": sum(row[2] or 0 for row in rows),
+            "document_types": {(row[0] or "unknown"): row[2] or 0 for row in rows},
+            "last_indexed_at": last_indexed
+        }
@@ -1,28 +1,38 @@
 """
 Document Indexing Utility for BrainGenTechnology RAG System
 Handles bulk indexing and updating of knowledge base documents
+through the streaming ingestion pipeline (utils/ingestion.py)
 """
 import sys
 import logging
+import os
+import shutil
+import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set, Tuple
 from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from langchain_community.document_loaders import DirectoryLoader, TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
-from langchain.schema import Document
 
 from config.settings import settings, DOCUMENTS_DIR, CHROMA_DIR
+from utils.kb_version import bump_kb_version, KB_VERSION_FILE
+from utils.embeddings_provider import get_embeddings
+from utils.ingestion import IngestionPipeline
+from utils.index_manifest import IndexManifest, MANIFEST_FILE, source_key
+from utils.knowledge_base import COLLECTION_NAME, clear_client_cache
+from utils.document_watcher import DocumentWatcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# A rebuild is written next to the live index and swapped in when complete
+REBUILD_DIR = CHROMA_DIR.with_name(CHROMA_DIR.name + ".rebuild")
+RETIRED_DIR = CHROMA_DIR.with_name(CHROMA_DIR.name + ".old")
+
 class DocumentIndexer:
     """
     Document indexing utility for the RAG system
@@ -31,31 +41,16 @@ class DocumentIndexer:
     
     def __init__(self):
         self.embeddings = None
-        self.text_splitter = None
         self.vectorstore = None
+        self.manifest = None
         
         self._initialize_components()
     
     def _initialize_components(self):
-        """Initialize embeddings and text splitter"""
+        """Initialize embeddings (chunking happens in the ingestion workers)"""
         try:
             # Initialize embeddings
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name=settings.embeddings_model,
-                model_kwargs={'device': settings.embeddings_device},
-                encode_kwargs={
-                    'normalize_embeddings': True,
-                    'batch_size': 16
-                }
-            )
-            
-            # Initialize text splitter
-            self.text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=settings.chunk_size,
-                chunk_overlap=settings.chunk_overlap,
-                separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""],
-                length_function=len
-            )
+            self.embeddings = get_embeddings()
             
             logger.info("Document indexer components initialized")
             
@@ -80,24 +75,32 @@ class DocumentIndexer:
             
             # Check if we need to rebuild or create new index
             index_exists = (CHROMA_DIR / "chroma.sqlite3").exists()
-            
-            if force_reindex or not index_exists:
-                if index_exists:
-                    logger.info("Force reindex requested - rebuilding entire index")
-                else:
-                    logger.info("No existing index found - creating new index")
-                
-                # Remove existing index if force reindex
-                if force_reindex and index_exists:
-                    import shutil
-                    shutil.rmtree(CHROMA_DIR)
-                
-                # Create new index
+            if self.manifest is not None:
+                self.manifest.close()
+            self.manifest = IndexManifest()
+            
+            # Chunk IDs and vectors can only be reused when the manifest matches
+            # the current embedding model and chunking
+            if index_exists and not force_reindex and not self.manifest.is_compatible():
+                logger.info("Index manifest missing or built with other settings - rebuilding")
+                force_reindex = True
+            
+            if index_exists and force_reindex:
+                # Servers (and watch-mode readers) keep searching the live index meanwhile
+                logger.info("Rebuilding entire index alongside the live one")
+                result = self._rebuild_index()
+            elif not index_exists:
+                logger.info("No existing index found - creating new index")
+                self.manifest.reset()
                 result = self._create_new_index()
             else:
                 logger.info("Existing index found - performing incremental update")
                 result = self._update_existing_index()
             
+            # Let running servers drop answers derived from the old content
+            if result.get("chunks_created") or result.get("chunks_deleted"):
+                result["kb_version"] = bump_kb_version()
+            
             # Calculate processing time
             processing_time = (datetime.now() - start_time).total_seconds()
             result["processing_time"] = processing_time
@@ -109,16 +112,43 @@ class DocumentIndexer:
             logger.error(f"Document indexing failed: {e}")
             raise
     
-    def _create_new_index(self) -> Dict[str, Any]:
-        """Create a new vectorstore index from scratch"""
+    def watch(self, debounce: float = None, poll_interval: float = None, force_polling: bool = False):
+        """
+        Keep the index in sync with DOCUMENTS_DIR until interrupted
+        Each settled burst of edits is applied as an incremental update to the
+        live collection; running servers reopen it when the version bumps
+        """
+        # Catch up with edits made while nobody was watching
+        logger.info(self.index_documents()["message"])
+        
+        def apply_changes(paths: Set[Path], first_change_at: float):
+            logger.info(f"{len(paths)} document(s) changed, updating index")
+            result = self.index_documents()
+            # Save -> committed to Chroma with the version bumped (servers check every second)
+            latency = time.time() - first_change_at
+            logger.info(
+                f"Index updated {latency:.2f}s after save: {result.get('chunks_created', 0)} chunks embedded, "
+                f"{result.get('chunks_deleted', 0)} deleted"
+            )
+        
+        DocumentWatcher(
+            DOCUMENTS_DIR,
+            apply_changes,
+            debounce=debounce if debounce is not None else settings.index_watch_debounce_seconds,
+            poll_interval=poll_interval or settings.index_watch_poll_interval,
+            force_polling=force_polling
+        ).run()
+    
+    def _create_new_index(self, directory: Path = CHROMA_DIR) -> Dict[str, Any]:
+        """Create a new vectorstore index from scratch in `directory`"""
         try:
             # Ensure directories exist
-            CHROMA_DIR.mkdir(parents=True, exist_ok=True)
+            directory.mkdir(parents=True, exist_ok=True)
             
-            # Load all documents
-            documents = self._load_documents()
+            # List all documents (contents are read by the ingestion workers)
+            files = self._list_document_files()
             
-            if not documents:
+            if not files:
                 return {
                     "status": "completed",
                     "documents_processed": 0,
@@ -126,55 +156,82 @@ class DocumentIndexer:
                     "message": "No documents found to index"
                 }
             
-            # Split documents into chunks
-            chunks = self.text_splitter.split_documents(documents)
-            
-            # Create vectorstore
-            self.vectorstore = Chroma.from_documents(
-                documents=chunks,
-                embedding=self.embeddings,
-                persist_directory=str(CHROMA_DIR),
-                collection_name="braingentech_knowledge"
-            )
-            
-            # Persist the vectorstore
-            self.vectorstore.persist()
+            self.vectorstore = self._open_vectorstore(directory)
+            ingestion = IngestionPipeline(
+                self.embeddings, self.vectorstore._collection, manifest=self.manifest
+            ).run(files)
             
             return {
                 "status": "completed",
                 "action": "created_new_index",
-                "documents_processed": len(documents),
-                "chunks_created": len(chunks),
-                "message": f"Successfully indexed {len(documents)} documents into {len(chunks)} chunks"
+                **ingestion,
+                "message": (
+                    f"Successfully indexed {ingestion['documents_processed']} documents "
+                    f"into {ingestion['chunks_created']} chunks"
+                )
             }
             
         except Exception as e:
             logger.error(f"Failed to create new index: {e}")
             raise
     
+    def _rebuild_index(self) -> Dict[str, Any]:
+        """
+        Build a complete index in REBUILD_DIR, then swap it in for CHROMA_DIR
+        The live index is never emptied: readers search it until the swap and
+        reopen the new one when the version bumps
+        """
+        self.manifest.close()
+        self.vectorstore = None
+        # Leftover of an interrupted rebuild; its client may still be cached
+        shutil.rmtree(REBUILD_DIR, ignore_errors=True)
+        clear_client_cache()
+        
+        self.manifest = IndexManifest(REBUILD_DIR / MANIFEST_FILE.name)
+        try:
+            result = self._create_new_index(REBUILD_DIR)
+        except Exception:
+            shutil.rmtree(REBUILD_DIR, ignore_errors=True)
+            raise
+        finally:
+            self.manifest.close()
+            self.vectorstore = None
+        
+        if (REBUILD_DIR / "chroma.sqlite3").exists():
+            self._swap_in_rebuild()
+            result["action"] = "rebuilt_index"
+        else:
+            # Nothing was indexed: keep serving the current index
+            shutil.rmtree(REBUILD_DIR, ignore_errors=True)
+        
+        self.manifest = IndexManifest()
+        return result
+    
+    def _swap_in_rebuild(self):
+        """Replace CHROMA_DIR with REBUILD_DIR by two renames, then drop the old index"""
+        if KB_VERSION_FILE.exists():
+            # Readers comparing versions see one change, the bump that follows
+            shutil.copy2(KB_VERSION_FILE, REBUILD_DIR / KB_VERSION_FILE.name)
+        shutil.rmtree(RETIRED_DIR, ignore_errors=True)
+        # Between the renames CHROMA_DIR is missing and reloads keep their current store;
+        # files already open in the old index stay readable until it is deleted
+        os.replace(CHROMA_DIR, RETIRED_DIR)
+        os.replace(REBUILD_DIR, CHROMA_DIR)
+        # This process's clients still point at the renamed directories
+        clear_client_cache()
+        shutil.rmtree(RETIRED_DIR, ignore_errors=True)
+        logger.info(f"Rebuilt index swapped in at {CHROMA_DIR}")
+    
     def _update_existing_index(self) -> Dict[str, Any]:
-        """Update existing vectorstore with new or modified documents"""
+        """Apply chunk-level changes of new, modified and deleted documents"""
         try:
             # Load existing vectorstore
-            self.vectorstore = Chroma(
-                persist_directory=str(CHROMA_DIR),
-                embedding_function=self.embeddings,
-                collection_name="braingentech_knowledge"
-            )
-            
-            # Get existing document metadata
-            existing_docs = self._get_existing_document_info()
-            
-            # Load current documents
-            current_documents = self._load_documents()
+            self.vectorstore = self._open_vectorstore()
             
-            # Find new or modified documents
-            new_or_modified = self._find_new_or_modified_documents(
-                current_documents, 
-                existing_docs
-            )
+            # Find new, modified and removed documents
+            new_or_modified, removed = self._find_changed_documents(self._list_document_files())
             
-            if not new_or_modified:
+            if not new_or_modified and not removed:
                 return {
                     "status": "completed",
                     "action": "no_updates_needed",
@@ -183,125 +240,73 @@ class DocumentIndexer:
                     "message": "No new or modified documents found"
                 }
             
-            # Process new/modified documents
-            chunks = self.text_splitter.split_documents(new_or_modified)
-            
-            # Add new chunks to vectorstore
-            self.vectorstore.add_documents(chunks)
-            self.vectorstore.persist()
+            # Only chunks whose text changed are embedded, stale chunks are deleted
+            ingestion = IngestionPipeline(
+                self.embeddings, self.vectorstore._collection, manifest=self.manifest
+            ).run(new_or_modified, removed_sources=removed)
             
             return {
                 "status": "completed",
                 "action": "updated_existing_index",
-                "documents_processed": len(new_or_modified),
-                "chunks_created": len(chunks),
-                "message": f"Updated index with {len(new_or_modified)} documents ({len(chunks)} chunks)"
+                **ingestion,
+                "message": (
+                    f"Updated index with {ingestion['documents_processed']} documents: "
+                    f"{ingestion['chunks_created']} chunks embedded, "
+                    f"{ingestion['chunks_unchanged']} unchanged, "
+                    f"{ingestion['chunks_deleted']} deleted"
+                )
             }
             
         except Exception as e:
             logger.error(f"Failed to update existing index: {e}")
             raise
     
-    def _load_documents(self) -> List[Document]:
-        """Load all documents from the documents directory"""
-        try:
-            loader = DirectoryLoader(
-                str(DOCUMENTS_DIR),
-                glob="**/*.md",
-                loader_cls=TextLoader,
-                loader_kwargs={'encoding': 'utf-8'},
-                recursive=True,
-                show_progress=True
-            )
-            
-            documents = loader.load()
-            
-            # Enhance document metadata
-            for doc in documents:
-                file_path = Path(doc.metadata.get("source", ""))
-                doc.metadata.update({
-                    "file_name": file_path.name,
-                    "file_path": str(file_path),
-                    "file_size": file_path.stat().st_size if file_path.exists() else 0,
-                    "last_modified": datetime.fromtimestamp(
-                        file_path.stat().st_mtime
-                    ).isoformat() if file_path.exists() else None,
-                    "document_type": self._get_document_type(file_path),
-                    "indexed_at": datetime.now().isoformat()
-                })
-            
-            logger.info(f"Loaded {len(documents)} documents")
-            return documents
-            
-        except Exception as e:
-            logger.error(f"Failed to load documents: {e}")
-            return []
-    
-    def _get_document_type(self, file_path: Path) -> str:
-        """Determine document type based on file path"""
-        path_parts = file_path.parts
-        
-        if "company" in path_parts:
-            return "company_info"
-        elif "services" in path_parts:
-            return "service_description"
-        elif "case_studies" in path_parts:
-            return "case_study"
-        elif "technical" in path_parts:
-            return "technical_documentation"
-        else:
-            return "general"
+    def _open_vectorstore(self, directory: Path = CHROMA_DIR) -> Chroma:
+        """Open (or create) the persistent knowledge base collection"""
+        return Chroma(
+            persist_directory=str(directory),
+            embedding_function=self.embeddings,
+            collection_name=COLLECTION_NAME
+        )
     
-    def _get_existing_document_info(self) -> Dict[str, Dict[str, Any]]:
-        """Get information about existing documents in the vectorstore"""
-        try:
-            # This is a simplified approach - in practice, you might want to
-            # store document metadata separately for more efficient tracking
-            collection = self.vectorstore._collection
-            
-            # Get all documents with metadata
-            results = collection.get(include=["metadatas"])
-            
-            existing_docs = {}
-            for metadata in results.get("metadatas", []):
-                if "source" in metadata:
-                    source = metadata["source"]
-                    existing_docs[source] = metadata
-            
-            return existing_docs
-            
-        except Exception as e:
-            logger.warning(f"Could not get existing document info: {e}")
-            return {}
+    def _list_document_files(self) -> List[Path]:
+        """List all markdown documents in the documents directory"""
+        files = sorted(DOCUMENTS_DIR.rglob("*.md"))
+        logger.info(f"Found {len(files)} documents")
+        return files
     
-    def _find_new_or_modified_documents(
-        self, 
-        current_documents: List[Document],
-        existing_docs: Dict[str, Dict[str, Any]]
-    ) -> List[Document]:
-        """Find documents that are new or have been modified"""
+    def _find_changed_documents(self, current_files: List[Path]) -> Tuple[List[Path], List[str]]:
+        """
+        Find documents that are new or may have been modified (size or mtime
+        differ from the manifest) and manifest sources whose file is gone
+        """
         new_or_modified = []
+        current_sources = set()
         
-        for doc in current_documents:
-            source = doc.metadata.get("source", "")
+        for file_path in current_files:
+            source = source_key(file_path)
+            current_sources.add(source)
             
-            if source not in existing_docs:
-                # New document
+            if self.manifest.get(source) is None:
                 logger.info(f"New document found: {source}")
-                new_or_modified.append(doc)
-            else:
-                # Check if modified
-                existing_modified = existing_docs[source].get("last_modified")
-                current_modified = doc.metadata.get("last_modified")
-                
-                if current_modified and existing_modified != current_modified:
-                    logger.info(f"Modified document found: {source}")
-                    new_or_modified.append(doc)
+                new_or_modified.append(file_path)
+            elif not self.manifest.is_unchanged(source, file_path):
+                # Content hashes decide later which chunks really changed
+                logger.info(f"Modified document found: {source}")
+                new_or_modified.append(file_path)
         
-        return new_or_modified
+        removed = [source for source in self.manifest.sources() if source not in current_sources]
+        for source in removed:
+            logger.info(f"Removed document found: {source}")
+        
+        return new_or_modified, removed
     
-    def get_index_statistics(self) -> Dict[str, Any]:
-        """Get statistics about the current index"""
+    @staticmethod
+    def get_index_statistics() -> Dict[str, Any]:
+        """
+        Get statistics about the current index from the manifest
+        (no embedding model or collection scan needed)
+        """
         try:
             if not (CHROMA_DIR / "chroma.sqlite3").exists():
                 return {
@@ -309,37 +314,24 @@ class DocumentIndexer:
                     "message": "No index found"
                 }
             
-            # Load vectorstore
-            vectorstore = Chroma(
-                persist_directory=str(CHROMA_DIR),
-                embedding_function=self.embeddings,
-                collection_name="braingentech_knowledge"
-            )
-            
-            # Get collection statistics
-            collection = vectorstore._collection
-            count = collection.count()
-            
-            # Get sample documents to analyze document types
-            sample_results = collection.get(
-                limit=min(100, count),
-                include=["metadatas"]
-            )
-            
-            # Analyze document types
-            doc_types = {}
-            for metadata in sample_results.get("metadatas", []):
-                doc_type = metadata.get("document_type", "unknown")
-                doc_types[doc_type] = doc_types.get(doc_type, 0) + 1
+            manifest = IndexManifest()
+            try:
+                info = manifest.info()
+                stats = manifest.get_statistics()
+                compatible = manifest.is_compatible()
+            finally:
+                manifest.close()
             
             return {
-                "status": "indexed",
-                "total_chunks": count,
-                "document_types": doc_types,
+                "status": "indexed" if compatible else "rebuild_needed",
+                "total_documents": stats["total_documents"],
+                "total_chunks": stats["total_chunks"],
+                "document_types": stats["document_types"],
+                "last_indexed_at": stats["last_indexed_at"],
                 "index_location": str(CHROMA_DIR),
-                "embeddings_model": settings.embeddings_model,
-                "chunk_size": settings.chunk_size,
-                "chunk_overlap": settings.chunk_overlap
+                "embeddings_model": info.get("embeddings_model", settings.embeddings_model_id),
+                "chunk_size": int(info.get("chunk_size", settings.chunk_size)),
+                "chunk_overlap": int(info.get("chunk_overlap", settings.chunk_overlap))
             }
             
         except Exception as e:
@@ -364,19 +356,39 @@ def main():
         action="store_true",
         help="Show index statistics only"
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep watching the documents directory and apply changes incrementally"
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=None,
+        help="Seconds without further edits before a watch-mode update"
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Watch by polling instead of inotify"
+    )
     
     args = parser.parse_args()
     
-    indexer = DocumentIndexer()
-    
     if args.stats_only:
         # Show statistics only
-        stats = indexer.get_index_statistics()
+        stats = DocumentIndexer.get_index_statistics()
         print("Index Statistics:")
         for key, value in stats.items():
             print(f"  {key}: {value}")
+    elif args.watch:
+        indexer = DocumentIndexer()
+        if args.force_reindex:
+            indexer.index_documents(force_reindex=True)
+        indexer.watch(debounce=args.debounce, force_polling=args.poll)
     else:
         # Perform indexing
+        indexer = DocumentIndexer()
         result = indexer.index_documents(force_reindex=args.force_reindex)
         print("Indexing Results:")
         for key, value in result.items():
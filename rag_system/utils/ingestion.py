@@ -0,0 +1,411 @@
+"""
+Streaming Document Ingestion for BrainGenTechnology RAG System
+Files are read and chunked in a process pool, chunks flow through a bounded
+queue into batched embedding, and vectors are upserted to Chroma in batches,
+so peak memory stays bounded whatever the corpus size. With an index manifest,
+only chunks whose content changed are embedded and stale chunks are deleted.
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from utils.index_manifest import IndexManifest, content_hash, source_key, chunk_ids
+
+logger = logging.getLogger(__name__)
+
+# End-of-stream marker passed through the queues
+_DONE = object()
+
+# Log progress every this many embedded chunks
+PROGRESS_EVERY = 1000
+
+def get_document_type(file_path: Path) -> str:
+    """Determine document type based on file path"""
+    path_parts = file_path.parts
+
+    if "company" in path_parts:
+        return "company_info"
+    elif "services" in path_parts:
+        return "service_description"
+    elif "case_studies" in path_parts:
+        return "case_study"
+    elif "technical" in path_parts:
+        return "technical_documentation"
+    else:
+        return "general"
+
+def file_metadata(file_path: Path) -> Dict[str, Any]:
+    """Document-level metadata shared by every chunk of a file"""
+    stat = file_path.stat()
+    return {
+        "source": str(file_path),
+        "file_name": file_path.name,
+        "file_path": str(file_path),
+        "file_size": stat.st_size,
+        "last_modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        "document_type": get_document_type(file_path)
+    }
+
+_splitters: Dict[Tuple[int, int], RecursiveCharacterTextSplitter] = {}
+
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """Text splitter for this process (built once per worker)"""
+    key = (chunk_size, chunk_overlap)
+    if key not in _splitters:
+        _splitters[key] = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""],
+            length_function=len
+        )
+    return _splitters[key]
+
+def load_and_split(
+    file_path: str,
+    chunk_size: int,
+    chunk_overlap: int
+) -> Tuple[List[Document], Dict[str, Any], float]:
+    """
+    Read and chunk one file (runs in a worker process)
+
+    Returns:
+        The file's chunks (with deterministic chunk_id metadata), the file's
+        source key, hash, size and mtime, and the seconds spent on it
+    """
+    start = time.perf_counter()
+    path = Path(file_path)
+    stat = path.stat()
+    metadata = file_metadata(path)
+    metadata["indexed_at"] = datetime.now().isoformat()
+
+    text = path.read_text(encoding="utf-8")
+    chunks = _get_splitter(chunk_size, chunk_overlap).create_documents([text], metadatas=[metadata])
+
+    source = source_key(path)
+    ids = chunk_ids(source, [chunk.page_content for chunk in chunks])
+    for index, (chunk, chunk_id) in enumerate(zip(chunks, ids)):
+        chunk.metadata["chunk_index"] = index
+        chunk.metadata["chunk_id"] = chunk_id
+
+    file_info = {
+        "source": source,
+        "hash": content_hash(text),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "document_type": metadata["document_type"]
+    }
+    return chunks, file_info, time.perf_counter() - start
+
+class IngestionPipeline:
+    """
+    Three-stage indexing pipeline: read/split (process pool) -> embed -> upsert
+    The stages overlap, and the queues between them bound how much is in flight
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        collection,
+        manifest: IndexManifest = None,
+        workers: int = None,
+        queue_size: int = None,
+        embed_batch_size: int = None,
+        upsert_batch_size: int = None
+    ):
+        self.embeddings = embeddings
+        self.collection = collection
+        self.manifest = manifest
+        self.workers = workers or settings.ingest_workers or os.cpu_count() or 1
+        self.queue_size = queue_size or settings.ingest_queue_size
+        self.embed_batch_size = embed_batch_size or settings.ingest_embed_batch_size
+        self.upsert_batch_size = upsert_batch_size or settings.ingest_upsert_batch_size
+
+    def run(self, files: List[Path], removed_sources: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Index the given files into the collection
+
+        Args:
+            files: New or possibly modified files
+            removed_sources: Manifest keys of deleted files whose chunks must go
+
+        Returns:
+            Counts, throughput and per-stage timing
+        """
+        start = time.perf_counter()
+        chunk_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        # A couple of embedded batches may wait while the previous one is written
+        upsert_queue: queue.Queue = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        stats = {
+            "documents": 0,
+            "documents_unchanged": 0,
+            "chunks": 0,
+            "chunks_unchanged": 0,
+            "read_split_seconds": 0.0,
+            "embed_seconds": 0.0,
+            "upsert_seconds": 0.0,
+            "errors": []
+        }
+        # Collection and manifest changes applied once every new chunk is stored
+        changes = {"files": [], "moved": [], "delete_ids": []}
+
+        producer = threading.Thread(
+            target=self._produce, args=(files, chunk_queue, stats, changes, stop), daemon=True
+        )
+        writer = threading.Thread(
+            target=self._write, args=(upsert_queue, stats, stop), daemon=True
+        )
+        producer.start()
+        writer.start()
+
+        try:
+            self._embed(chunk_queue, upsert_queue, stats, stop)
+        except Exception as e:
+            stats["errors"].append(e)
+        finally:
+            if stats["errors"]:
+                stop.set()
+            self._put(upsert_queue, _DONE, stop, force=True)
+            writer.join()
+            producer.join()
+
+        if stats["errors"]:
+            raise stats["errors"][0]
+
+        cleanup_start = time.perf_counter()
+        removed_sources = list(removed_sources)
+        chunks_deleted = self._apply_changes(changes, removed_sources)
+        cleanup_seconds = time.perf_counter() - cleanup_start
+
+        elapsed = time.perf_counter() - start
+        return {
+            "documents_processed": stats["documents"],
+            "documents_unchanged": stats["documents_unchanged"],
+            "documents_removed": len(removed_sources),
+            "chunks_created": stats["chunks"],
+            "chunks_unchanged": stats["chunks_unchanged"],
+            "chunks_deleted": chunks_deleted,
+            "chunks_per_second": round(stats["chunks"] / elapsed, 1) if elapsed else 0.0,
+            "workers": self.workers,
+            "stage_timing": {
+                "read_split": round(stats["read_split_seconds"], 3),
+                "embed": round(stats["embed_seconds"], 3),
+                "upsert": round(stats["upsert_seconds"], 3),
+                "cleanup": round(cleanup_seconds, 3),
+                "wall": round(elapsed, 3)
+            }
+        }
+
+    def _produce(
+        self,
+        files: List[Path],
+        chunk_queue: queue.Queue,
+        stats: Dict[str, Any],
+        changes: Dict[str, list],
+        stop: threading.Event
+    ):
+        """Stage 1: read and split files, feeding changed chunks into the bounded queue"""
+        try:
+            for chunks, file_info, elapsed in self._split_files(files):
+                stats["documents"] += 1
+                stats["read_split_seconds"] += elapsed
+                for chunk in self._diff(chunks, file_info, stats, changes):
+                    if not self._put(chunk_queue, chunk, stop):
+                        return
+        except Exception as e:
+            logger.error(f"Failed to read documents: {e}")
+            stats["errors"].append(e)
+            stop.set()
+        finally:
+            self._put(chunk_queue, _DONE, stop, force=True)
+
+    def _diff(
+        self,
+        chunks: List[Document],
+        file_info: Dict[str, Any],
+        stats: Dict[str, Any],
+        changes: Dict[str, list]
+    ) -> List[Document]:
+        """Compare a file's chunks with the manifest and return those needing embedding"""
+        new_ids = [chunk.metadata["chunk_id"] for chunk in chunks]
+        changes["files"].append((file_info, new_ids))
+
+        entry = self.manifest.get(file_info["source"]) if self.manifest else None
+        if entry is None:
+            return chunks
+
+        old_positions = {chunk_id: index for index, chunk_id in enumerate(entry["chunk_ids"])}
+        new_id_set = set(new_ids)
+        deleted = [chunk_id for chunk_id in entry["chunk_ids"] if chunk_id not in new_id_set]
+
+        changed = []
+        for chunk in chunks:
+            old_index = old_positions.get(chunk.metadata["chunk_id"])
+            if old_index is None:
+                changed.append(chunk)
+            elif old_index != chunk.metadata["chunk_index"]:
+                # Same text at a new position: refresh metadata, keep the vector
+                changes["moved"].append(chunk)
+
+        changes["delete_ids"].extend(deleted)
+        stats["chunks_unchanged"] += len(chunks) - len(changed)
+        if not changed and not deleted:
+            stats["documents_unchanged"] += 1
+        return changed
+
+    def _apply_changes(self, changes: Dict[str, list], removed_sources: List[str]) -> int:
+        """
+        Update moved chunks, delete stale ones and record the new state in the manifest
+        Runs after all new chunks are stored so a file is never partially missing
+
+        Returns:
+            Number of chunks deleted
+        """
+        delete_ids = list(changes["delete_ids"])
+        for source in removed_sources:
+            entry = self.manifest.get(source) if self.manifest else None
+            if entry:
+                delete_ids.extend(entry["chunk_ids"])
+
+        moved = changes["moved"]
+        for start in range(0, len(moved), self.upsert_batch_size):
+            batch = moved[start:start + self.upsert_batch_size]
+            self.collection.update(
+                ids=[chunk.metadata["chunk_id"] for chunk in batch],
+                metadatas=[chunk.metadata for chunk in batch]
+            )
+
+        for start in range(0, len(delete_ids), self.upsert_batch_size):
+            self.collection.delete(ids=delete_ids[start:start + self.upsert_batch_size])
+
+        if self.manifest is not None:
+            # One transaction: the manifest never reflects half a run
+            try:
+                for file_info, ids in changes["files"]:
+                    self.manifest.set_file(file_info, ids)
+                for source in removed_sources:
+                    self.manifest.remove(source)
+                self.manifest.save()
+            except Exception:
+                self.manifest.rollback()
+                raise
+
+        return len(delete_ids)
+
+    def _split_files(self, files: List[Path]) -> Iterator[Tuple[List[Document], Dict[str, Any], float]]:
+        """Split files in the process pool, keeping only a few files in flight"""
+        args = (settings.chunk_size, settings.chunk_overlap)
+
+        # Starting worker processes costs more than splitting a handful of files
+        if self.workers <= 1 or len(files) < self.workers * 2:
+            for path in files:
+                yield load_and_split(str(path), *args)
+            return
+
+        # spawn: forking a process that already runs model threads is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            pending = deque()
+            remaining = iter(files)
+            for path in remaining:
+                pending.append(pool.submit(load_and_split, str(path), *args))
+                if len(pending) >= self.workers * 2:
+                    break
+            while pending:
+                yield pending.popleft().result()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append(pool.submit(load_and_split, str(next_path), *args))
+
+    def _embed(self, chunk_queue: queue.Queue, upsert_queue: queue.Queue, stats: Dict[str, Any], stop: threading.Event):
+        """Stage 2: embed chunks in batches and hand them to the writer"""
+        batch: List[Document] = []
+        next_progress = PROGRESS_EVERY
+
+        while True:
+            item = chunk_queue.get()
+            if item is not _DONE:
+                batch.append(item)
+            if batch and (item is _DONE or len(batch) >= self.embed_batch_size):
+                embed_start = time.perf_counter()
+                vectors = self.embeddings.embed_documents([chunk.page_content for chunk in batch])
+                stats["embed_seconds"] += time.perf_counter() - embed_start
+                stats["chunks"] += len(batch)
+
+                if not self._put(upsert_queue, (batch, vectors), stop):
+                    return
+                batch = []
+
+                if stats["chunks"] >= next_progress:
+                    logger.info(f"Embedded {stats['chunks']} chunks from {stats['documents']} documents")
+                    next_progress += PROGRESS_EVERY
+            if item is _DONE or stop.is_set():
+                return
+
+    def _write(self, upsert_queue: queue.Queue, stats: Dict[str, Any], stop: threading.Event):
+        """Stage 3: upsert embedded chunks into the collection in batches"""
+        ids, vectors, texts, metadatas = [], [], [], []
+
+        def flush():
+            upsert_start = time.perf_counter()
+            self.collection.upsert(ids=ids, embeddings=vectors, documents=texts, metadatas=metadatas)
+            stats["upsert_seconds"] += time.perf_counter() - upsert_start
+            ids.clear(); vectors.clear(); texts.clear(); metadatas.clear()
+
+        try:
+            while True:
+                item = upsert_queue.get()
+                if item is _DONE:
+                    break
+                if stop.is_set():
+                    continue
+                chunks, chunk_vectors = item
+                for chunk, vector in zip(chunks, chunk_vectors):
+                    ids.append(chunk.metadata["chunk_id"])
+                    vectors.append(vector)
+                    texts.append(chunk.page_content)
+                    metadatas.append(chunk.metadata)
+                if len(ids) >= self.upsert_batch_size:
+                    flush()
+            if ids and not stop.is_set():
+                flush()
+        except Exception as e:
+            logger.error(f"Failed to write chunks to the vectorstore: {e}")
+            stats["errors"].append(e)
+            stop.set()
+            # Keep draining so the embedding stage never blocks on a full queue
+            while upsert_queue.get() is not _DONE:
+                pass
+
+    @staticmethod
+    def _put(target: queue.Queue, item, stop: threading.Event, force: bool = False) -> bool:
+        """Blocking put that gives up once the pipeline is stopping (unless forced)"""
+        while True:
+            if stop.is_set() and not force:
+                return False
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if force and stop.is_set():
+                    # Nobody may be consuming anymore: make room for the marker
+                    try:
+                        target.get_nowait()
+                    except queue.Empty:
+                        pass
@@ -0,0 +1,72 @@
+"""
+Knowledge base version marker for BrainGenTechnology RAG System
+The indexer bumps the marker whenever it changes the collection so that
+long-running servers (possibly in other processes) can drop derived state
+"""
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import CHROMA_DIR
+
+logger = logging.getLogger(__name__)
+
+KB_VERSION_FILE = CHROMA_DIR / "kb_version"
+
+def read_kb_version() -> str:
+    """Return the current knowledge base version ("" if never bumped)"""
+    try:
+        return KB_VERSION_FILE.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return ""
+    except Exception as e:
+        logger.warning(f"Could not read knowledge base version: {e}")
+        return ""
+
+def bump_kb_version() -> str:
+    """Write a new knowledge base version and return it"""
+    version = f"{datetime.now().isoformat()}-{uuid.uuid4().hex[:8]}"
+    try:
+        KB_VERSION_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = KB_VERSION_FILE.with_suffix(".tmp")
+        tmp_file.write_text(version, encoding="utf-8")
+        tmp_file.replace(KB_VERSION_FILE)
+        logger.info(f"Knowledge base version bumped to {version}")
+    except Exception as e:
+        logger.error(f"Could not write knowledge base version: {e}")
+    return version
+
+class KBVersionMonitor:
+    """
+    Cheap, rate-limited check for knowledge base changes made by the indexer
+    (possibly in another process)
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self.version = read_kb_version()
+        self._last_check = time.monotonic()
+        self._lock = threading.Lock()
+
+    def changed(self) -> bool:
+        """True once per version change, reading the marker at most every check_interval"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        with self._lock:
+            if now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+
+            version = read_kb_version()
+            if version == self.version:
+                return False
+            logger.info(f"Knowledge base changed ({self.version or 'none'} -> {version})")
+            self.version = version
+            return True
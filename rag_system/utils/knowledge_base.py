@@ -0,0 +1,60 @@
+"""
+Knowledge Base Vectorstore Access for BrainGenTechnology RAG System
+Opens the persistent Chroma collection, and reopens it after the indexer
+(possibly running in another process) has changed it
+"""
+import logging
+from typing import Optional
+
+from langchain_community.vectorstores import Chroma
+from langchain_core.embeddings import Embeddings
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import CHROMA_DIR
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "braingentech_knowledge"
+
+def index_exists() -> bool:
+    return (CHROMA_DIR / "chroma.sqlite3").exists()
+
+def clear_client_cache():
+    """Drop Chroma's per-path client cache, so the next open reads the files now at the path"""
+    try:
+        from chromadb.api.client import SharedSystemClient
+        SharedSystemClient.clear_system_cache()
+    except Exception as e:
+        logger.warning(f"Could not clear Chroma client cache: {e}")
+
+def open_vectorstore(embeddings: Embeddings, fresh: bool = False) -> Chroma:
+    """
+    Open the knowledge base collection
+
+    Args:
+        fresh: Drop Chroma's per-path client cache first, so vectors written by
+            another process since this one opened the collection become visible
+    """
+    if fresh:
+        clear_client_cache()
+
+    return Chroma(
+        persist_directory=str(CHROMA_DIR),
+        embedding_function=embeddings,
+        collection_name=COLLECTION_NAME
+    )
+
+def reload_vectorstore(embeddings: Embeddings, current: Optional[Chroma]) -> Optional[Chroma]:
+    """Reopen the collection after a knowledge base change, keeping the current one on failure"""
+    if not index_exists():
+        return current
+    try:
+        vectorstore = open_vectorstore(embeddings, fresh=True)
+        logger.info(f"Vectorstore reloaded with {vectorstore._collection.count()} chunks")
+        return vectorstore
+    except Exception as e:
+        logger.error(f"Vectorstore reload failed: {e}")
+        return current
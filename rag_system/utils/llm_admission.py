@@ -0,0 +1,237 @@
+"""
+LLM Admission Control for BrainGenTechnology RAG System
+Every upstream LLM request (including the Groq SDK's own retries) waits here
+for a concurrency slot and for room in the model's requests-per-minute and
+tokens-per-minute budgets. Interactive chat is admitted ahead of background
+work, requests that wait too long are shed, and the concurrency limit adapts
+to the provider: additive increase while responses are fast, multiplicative
+decrease on 429s and slow responses (AIMD)
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from monitoring import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# Admission order: a waiting interactive request is always admitted first
+LANES = ("interactive", "background")
+# Prompt size estimate; the budget only needs to be roughly right
+CHARS_PER_TOKEN = 4
+
+def estimate_request_tokens(body: bytes) -> int:
+    """Tokens a chat completion request will count against the TPM budget (prompt + expected completion)"""
+    try:
+        payload = json.loads(body)
+    except (ValueError, TypeError):
+        return len(body or b"") // CHARS_PER_TOKEN
+    prompt = sum(len(str(message.get("content", ""))) for message in payload.get("messages", []))
+    completion = min(payload.get("max_tokens") or settings.llm_expected_completion_tokens, settings.llm_expected_completion_tokens)
+    return prompt // CHARS_PER_TOKEN + completion
+
+class RateBudget:
+    """
+    Token bucket refilled continuously at per_minute / 60 per second (0 = unlimited)
+    Holds up to burst (default: a full minute's budget)
+    """
+
+    def __init__(self, per_minute: int, burst: int = None):
+        self.per_minute = per_minute
+        self.capacity = burst or per_minute
+        self.level = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+
+    def wait_time(self, amount: int, now: float) -> float:
+        """Seconds until amount fits (requests larger than the whole bucket wait for a full one)"""
+        if not self.per_minute:
+            return 0.0
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing * 60 / self.per_minute)
+
+    def take(self, amount: int, now: float):
+        if self.per_minute:
+            self._refill(now)
+            self.level -= min(amount, self.capacity)
+
+class AdmissionController:
+    """
+    Per-model admission queue with priority lanes, RPM/TPM budgets and an
+    AIMD concurrency limit. Lives on one event loop (the server's)
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_limit: int,
+        min_limit: int = None,
+        requests_per_minute: int = None,
+        tokens_per_minute: int = None,
+        latency_target: float = None,
+        max_queue: int = None,
+        max_wait: Dict[str, float] = None
+    ):
+        self.model = model
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit or settings.llm_min_concurrency, max_limit)
+        self.limit = float(max_limit)
+        self.latency_target = latency_target or settings.llm_latency_target_seconds
+        self.max_queue = max_queue or settings.llm_max_queue
+        self.max_wait = max_wait or {
+            "interactive": settings.llm_interactive_max_wait_seconds,
+            "background": settings.llm_background_max_wait_seconds
+        }
+        self.requests = RateBudget(settings.llm_requests_per_minute if requests_per_minute is None else requests_per_minute)
+        self.tokens = RateBudget(settings.llm_tokens_per_minute if tokens_per_minute is None else tokens_per_minute)
+        self.in_flight = 0
+        self.lanes: Dict[str, Deque[List]] = {lane: deque() for lane in LANES}
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._round_trip: Optional[float] = None  # Smoothed latency of successful responses
+        self._timer: Optional[asyncio.TimerHandle] = None
+        get_metrics().update_llm_concurrency_limit(model, self.max_limit)
+
+    async def acquire(self, lane: str, tokens: int) -> bool:
+        """
+        Wait for admission
+
+        Returns:
+            False when the request is shed (lane queue full or waited longer
+            than the lane's max wait); callers must not call release() then
+        """
+        metrics = get_metrics()
+        queue = self.lanes[lane]
+        if len(queue) >= self.max_queue:
+            metrics.record_llm_shed(self.model, lane, "queue_full")
+            return False
+
+        loop = asyncio.get_running_loop()
+        admitted = loop.create_future()
+        entry = [admitted, tokens]
+        queue.append(entry)
+        queued_at = time.perf_counter()
+        timeout = loop.call_later(self.max_wait[lane], self._expire, lane, entry)
+        self._dispatch()
+        try:
+            result = await admitted
+        except asyncio.CancelledError:
+            # Caller gave up (client disconnected): hand back a slot granted in the meantime
+            if admitted.done() and not admitted.cancelled() and admitted.result():
+                self.release(None, 0.0)
+            elif entry in queue:
+                queue.remove(entry)
+                self._update_queue_depth()
+            raise
+        finally:
+            timeout.cancel()
+
+        if result:
+            metrics.record_llm_admission_wait(self.model, lane, time.perf_counter() - queued_at)
+        else:
+            metrics.record_llm_shed(self.model, lane, "timeout")
+        return result
+
+    def release(self, status: Optional[int], latency: float, retry_after: float = 0.0):
+        """
+        Free a slot and adapt the limit to the response
+
+        Args:
+            status: HTTP status (None if the request failed without a response)
+            latency: seconds until the response headers arrived
+            retry_after: the provider's Retry-After on a 429
+        """
+        now = time.monotonic()
+        self.in_flight -= 1
+        if status == 429:
+            get_metrics().record_llm_throttled(self.model)
+            self._paused_until = max(self._paused_until, now + retry_after)
+            self._decrease(now, 0.5)
+        elif status is not None and status < 500:
+            self._round_trip = latency if self._round_trip is None else 0.8 * self._round_trip + 0.2 * latency
+            if latency > self.latency_target:
+                self._decrease(now, 0.9)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        get_metrics().update_llm_concurrency_limit(self.model, self.limit)
+        self._dispatch()
+
+    def _decrease(self, now: float, factor: float):
+        # Responses of one round trip report the same congestion: decrease at most once per round trip
+        if now - self._last_decrease < (self._round_trip or 1.0):
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(self.min_limit, self.limit * factor)
+        logger.info(f"LLM concurrency for {self.model}: {previous:.1f} -> {self.limit:.1f}")
+
+    def _expire(self, lane: str, entry: List):
+        admitted = entry[0]
+        if not admitted.done():
+            self.lanes[lane].remove(entry)
+            admitted.set_result(False)
+            self._update_queue_depth()
+
+    def _schedule(self, delay: float):
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self):
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit queued requests in lane order while slots and budgets allow"""
+        now = time.monotonic()
+        try:
+            for lane in LANES:
+                queue = self.lanes[lane]
+                while queue:
+                    admitted, tokens = queue[0]
+                    if admitted.done():
+                        # Cancelled (or expired) before its acquire() cleaned up: not a slot
+                        queue.popleft()
+                        continue
+                    if self.in_flight >= int(self.limit):
+                        return
+                    wait = max(
+                        self._paused_until - now,
+                        self.requests.wait_time(1, now),
+                        self.tokens.wait_time(tokens, now)
+                    )
+                    if wait > 0:
+                        # Strict priority: lower lanes do not overtake a waiting head of line
+                        self._schedule(wait)
+                        return
+                    queue.popleft()
+                    self.in_flight += 1
+                    self.requests.take(1, now)
+                    self.tokens.take(tokens, now)
+                    admitted.set_result(True)
+        finally:
+            self._update_queue_depth()
+
+    def _update_queue_depth(self):
+        metrics = get_metrics()
+        metrics.update_llm_in_flight(self.model, self.in_flight)
+        for lane, queue in self.lanes.items():
+            metrics.update_llm_queue_depth(self.model, lane, len(queue))
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            **{f"queued_{lane}": len(queue) for lane, queue in self.lanes.items()}
+        }
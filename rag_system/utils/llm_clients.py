@@ -0,0 +1,275 @@
+"""
+Shared Groq LLM Clients for BrainGenTechnology RAG System
+Every ChatGroq in the process (chat chains, qualification, servers) sends its
+requests through one keep-alive connection pool (HTTP/2 when the h2 package
+is installed), so TLS handshakes happen once per connection instead of once
+per client. Requests pass admission control per model (utils/llm_admission.py),
+and connection reuse is exported as metrics.
+"""
+import functools
+import importlib.util
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from langchain_groq import ChatGroq
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from monitoring import get_metrics
+from utils.llm_admission import AdmissionController, LANES, estimate_request_tokens
+
+logger = logging.getLogger(__name__)
+
+class _ConnectionTrace:
+    """httpcore trace hook noting whether a request had to open a connection"""
+
+    def __init__(self):
+        self.connect_started: Optional[float] = None
+        self.connect_seconds: Optional[float] = None
+
+    def on_event(self, name: str):
+        if name == "connection.connect_tcp.started":
+            self.connect_started = time.perf_counter()
+        elif name in ("connection.start_tls.complete", "connection.connect_tcp.complete") and self.connect_started:
+            # TLS follows TCP: the last completion seen covers the whole handshake
+            self.connect_seconds = time.perf_counter() - self.connect_started
+
+    def __call__(self, name: str, info: Dict[str, Any]):
+        self.on_event(name)
+
+    def record(self, model: str):
+        get_metrics().record_llm_connection(model, reused=self.connect_started is None, connect_seconds=self.connect_seconds)
+
+class _AsyncConnectionTrace(_ConnectionTrace):
+    async def __call__(self, name: str, info: Dict[str, Any]):
+        self.on_event(name)
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """
+    Response body that frees the model's concurrency slot exactly once: when
+    it is read to the end, closed, or its reader stops early (cancelled,
+    broken out of, garbage collected) without closing it
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self.stream = stream
+        self.release = release
+        self.released = False
+        self.closed = False
+
+    def _release_once(self):
+        if not self.released:
+            self.released = True
+            self.release()
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self.stream:
+                yield chunk
+        finally:
+            self._release_once()
+
+    async def aclose(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self.stream.aclose()
+        finally:
+            self._release_once()
+
+    def __del__(self):
+        # Last resort for a body never iterated nor closed
+        self._release_once()
+
+class PooledAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    One model and priority lane's view of the shared async connection pool
+    Requests are admitted by the model's AdmissionController (a streamed
+    response holds its slot until the body is closed); shed requests get a
+    429 the Groq SDK does not retry
+    """
+
+    def __init__(self, pool: httpx.AsyncBaseTransport, controller: AdmissionController, lane: str):
+        self.pool = pool
+        self.controller = controller
+        self.lane = lane
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not await self.controller.acquire(self.lane, estimate_request_tokens(request.content)):
+            return _shed_response(request)
+
+        trace = _AsyncConnectionTrace()
+        request.extensions = dict(request.extensions, trace=trace)
+        started = time.perf_counter()
+        try:
+            response = await self.pool.handle_async_request(request)
+        except BaseException:
+            self.controller.release(None, time.perf_counter() - started)
+            raise
+        latency = time.perf_counter() - started
+        trace.record(self.controller.model)
+
+        retry_after = _retry_after(response) if response.status_code == 429 else 0.0
+        response.stream = _ReleasingStream(
+            response.stream,
+            lambda: self.controller.release(response.status_code, latency, retry_after)
+        )
+        return response
+
+    async def aclose(self):
+        # The pool is shared by every model: closed by aclose_llm_clients()
+        pass
+
+def _shed_response(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        429,
+        headers={"x-should-retry": "false"},
+        json={"error": {
+            "message": "LLM request shed by admission control (queue full or wait exceeded)",
+            "type": "admission_rejected",
+            "code": "admission_rejected"
+        }},
+        request=request
+    )
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return float(response.headers.get("retry-after", 0))
+    except ValueError:
+        return 0.0
+
+class TracedTransport(httpx.BaseTransport):
+    """Shared sync connection pool with connection reuse metrics"""
+
+    def __init__(self, pool: httpx.BaseTransport):
+        self.pool = pool
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        trace = _ConnectionTrace()
+        request.extensions = dict(request.extensions, trace=trace)
+        response = self.pool.handle_request(request)
+        trace.record("sync")
+        return response
+
+    def close(self):
+        self.pool.close()
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+@functools.lru_cache(maxsize=None)
+def _use_http2() -> bool:
+    if settings.llm_http2 and not http2_available():
+        logger.warning("LLM_HTTP2 is set but the h2 package is missing (pip install 'httpx[http2]'), using HTTP/1.1")
+        return False
+    return settings.llm_http2
+
+def _pool_options() -> Dict[str, Any]:
+    return {
+        "http2": _use_http2(),
+        "limits": httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_connections,
+            keepalive_expiry=settings.llm_keepalive_seconds
+        )
+    }
+
+_async_pool: Optional[httpx.AsyncHTTPTransport] = None
+_async_clients: Dict[tuple, httpx.AsyncClient] = {}
+_controllers: Dict[str, AdmissionController] = {}
+_sync_client: Optional[httpx.Client] = None
+_lock = threading.Lock()
+
+def model_concurrency(model: str) -> int:
+    return settings.llm_model_concurrency.get(model, settings.llm_default_concurrency)
+
+def get_admission_controller(model: str = None) -> AdmissionController:
+    """The admission controller shared by every client of a model"""
+    model = model or settings.llm_model
+    with _lock:
+        if model not in _controllers:
+            _controllers[model] = AdmissionController(model, model_concurrency(model))
+        return _controllers[model]
+
+def get_async_http_client(model: str = None, priority: str = "interactive") -> httpx.AsyncClient:
+    """The async HTTP client for a model's requests in one priority lane, over the shared pool"""
+    global _async_pool
+    if priority not in LANES:
+        raise ValueError(f"Unknown LLM priority '{priority}', expected one of {LANES}")
+    model = model or settings.llm_model
+    controller = get_admission_controller(model)
+    with _lock:
+        if _async_pool is None:
+            options = _pool_options()
+            _async_pool = httpx.AsyncHTTPTransport(**options)
+            logger.info(
+                f"LLM connection pool: {'HTTP/2' if options['http2'] else 'HTTP/1.1'}, "
+                f"{settings.llm_max_connections} connections, {settings.llm_keepalive_seconds:.0f}s keep-alive"
+            )
+        if (model, priority) not in _async_clients:
+            _async_clients[model, priority] = httpx.AsyncClient(
+                transport=PooledAsyncTransport(_async_pool, controller, priority)
+            )
+        return _async_clients[model, priority]
+
+def get_http_client() -> httpx.Client:
+    """The sync HTTP client (invoke(), startup checks), one pool for all models"""
+    global _sync_client
+    with _lock:
+        if _sync_client is None:
+            _sync_client = httpx.Client(transport=TracedTransport(httpx.HTTPTransport(**_pool_options())))
+        return _sync_client
+
+def get_chat_model(
+    model: str = None,
+    temperature: float = None,
+    max_tokens: int = None,
+    timeout: float = None,
+    max_retries: int = None,
+    streaming: bool = False,
+    priority: str = "interactive",
+    **kwargs
+) -> ChatGroq:
+    """
+    A ChatGroq over the shared connection pools
+    ChatGroq objects are cheap: create one per configuration (temperature,
+    token limit, timeout), the connections behind them are shared
+
+    Args:
+        priority: admission lane, "interactive" (chat) or "background"
+    """
+    model = model or settings.llm_model
+    return ChatGroq(
+        groq_api_key=settings.groq_api_key,
+        model_name=model,
+        temperature=settings.llm_temperature if temperature is None else temperature,
+        max_tokens=max_tokens or settings.llm_max_tokens,
+        timeout=timeout or settings.llm_timeout,
+        max_retries=settings.llm_max_retries if max_retries is None else max_retries,
+        streaming=streaming,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(model, priority),
+        **kwargs
+    )
+
+async def aclose_llm_clients():
+    """Close the shared pools (server shutdown)"""
+    global _async_pool, _sync_client
+    with _lock:
+        clients, pool, sync_client = list(_async_clients.values()), _async_pool, _sync_client
+        _async_clients.clear()
+        _controllers.clear()
+        _async_pool, _sync_client = None, None
+    for client in clients:
+        await client.aclose()
+    if pool is not None:
+        await pool.aclose()
+    if sync_client is not None:
+        sync_client.close()
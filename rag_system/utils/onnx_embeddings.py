@@ -0,0 +1,156 @@
+"""
+ONNX Runtime Embedding Backend for BrainGenTechnology RAG System
+Exports the sentence-transformers model to ONNX once, optionally applies
+int8 dynamic quantization, and runs CPU inference without PyTorch
+
+Requires the optional dependencies: pip install "optimum[onnxruntime]"
+"""
+import logging
+import platform
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings, BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+FP32_MODEL_FILE = "model.onnx"
+INT8_MODEL_FILE = "model_quantized.onnx"
+
+def onnx_model_dir(model_name: str) -> Path:
+    """Directory holding the exported ONNX model and tokenizer for a model name"""
+    root = Path(settings.onnx_model_dir)
+    if not root.is_absolute():
+        root = BASE_DIR / root
+    return root / model_name.replace("/", "__")
+
+def export_onnx_model(model_name: str, quantize: bool = True) -> Path:
+    """
+    Export a sentence-transformers model to ONNX (and int8) if not already done
+
+    Returns:
+        Path of the ONNX file to load
+    """
+    export_dir = onnx_model_dir(model_name)
+    fp32_path = export_dir / FP32_MODEL_FILE
+    int8_path = export_dir / INT8_MODEL_FILE
+
+    try:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+    except ImportError as e:
+        if (int8_path if quantize else fp32_path).exists():
+            return int8_path if quantize else fp32_path
+        raise ImportError(
+            "ONNX embedding backend requires optimum: pip install \"optimum[onnxruntime]\""
+        ) from e
+
+    if not fp32_path.exists():
+        logger.info(f"Exporting {model_name} to ONNX in {export_dir}")
+        model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+        model.save_pretrained(export_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(export_dir)
+
+    if not quantize:
+        return fp32_path
+
+    if not int8_path.exists():
+        logger.info(f"Quantizing {model_name} to int8 (dynamic)")
+        if platform.machine().lower() in ("arm64", "aarch64"):
+            qconfig = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+        else:
+            qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=FP32_MODEL_FILE)
+        quantizer.quantize(save_dir=export_dir, quantization_config=qconfig)
+
+    return int8_path
+
+class ONNXEmbeddings(Embeddings):
+    """
+    Mean-pooled sentence embeddings computed with ONNX Runtime on CPU
+    Produces vectors compatible with the sentence-transformers model it was exported from
+    """
+
+    def __init__(
+        self,
+        model_name: str = None,
+        quantize: bool = None,
+        batch_size: int = None,
+        normalize: bool = None,
+        num_threads: int = None,
+        max_length: int = 384
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name or settings.embeddings_model
+        self.quantize = settings.onnx_quantize if quantize is None else quantize
+        self.batch_size = batch_size or settings.embeddings_batch_size
+        self.normalize = settings.embeddings_normalize if normalize is None else normalize
+        num_threads = settings.embeddings_num_threads if num_threads is None else num_threads
+
+        model_path = export_onnx_model(self.model_name, quantize=self.quantize)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_path.parent))
+        self.max_length = min(max_length, self.tokenizer.model_max_length)
+
+        logger.info(f"ONNX embeddings loaded: {model_path.name} ({'int8' if self.quantize else 'fp32'})")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0].tolist()
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Queries are encoded like documents: one batch"""
+        return self._encode(texts).tolist()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # Batch texts of similar length together to minimize padding
+        order = np.argsort([len(text) for text in texts])
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = [texts[i] for i in order[start:start + self.batch_size]]
+            batches.append(self._encode_batch(batch))
+
+        vectors = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+        vectors[order] = np.concatenate(batches)
+        return vectors
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np"
+        )
+        feed = {name: encoded[name].astype(np.int64) for name in self.input_names if name in encoded}
+        token_embeddings = self.session.run(None, feed)[0]
+
+        # Mean pooling over real (non-padding) tokens, as sentence-transformers does
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.normalize:
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
@@ -0,0 +1,181 @@
+"""
+Semantic Response Cache for BrainGenTechnology RAG System
+Reuses answers to first-turn questions whose query embedding is close to a
+previously answered one, skipping both the vector search and the LLM call
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from monitoring import get_metrics
+from utils.kb_version import KBVersionMonitor
+
+logger = logging.getLogger(__name__)
+
+class SemanticResponseCache:
+    """
+    Bounded LRU cache of answers keyed on normalized query embeddings
+    Entries expire after a TTL and the whole cache is dropped when the
+    knowledge base version changes
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = None,
+        ttl_seconds: int = None,
+        max_entries: int = None
+    ):
+        self.similarity_threshold = similarity_threshold if similarity_threshold is not None else settings.semantic_cache_threshold
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.semantic_cache_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.semantic_cache_max_entries
+
+        # Embeddings live in one preallocated matrix; the LRU maps slot -> entry
+        self._matrix: Optional[np.ndarray] = None
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._free_slots: List[int] = list(range(self.max_entries - 1, -1, -1))
+        self._lock = threading.Lock()
+
+        self._kb_monitor = KBVersionMonitor()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, query_embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """Return the cached entry most similar to the query, or None below the threshold"""
+        metrics = get_metrics()
+        self._check_kb_version()
+        query = self._normalize(query_embedding)
+
+        with self._lock:
+            self._expire()
+            if not self._entries:
+                self.misses += 1
+                metrics.record_semantic_cache_miss(self.hit_ratio)
+                return None
+
+            slots = np.fromiter(self._entries.keys(), dtype=np.int64, count=len(self._entries))
+            similarities = self._matrix[slots] @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+
+            if similarity < self.similarity_threshold:
+                self.misses += 1
+                metrics.record_semantic_cache_miss(self.hit_ratio)
+                return None
+
+            slot = int(slots[best])
+            self._entries.move_to_end(slot)
+            entry = self._entries[slot]
+            entry["hits"] += 1
+            self.hits += 1
+
+        metrics.record_semantic_cache_hit(
+            self.hit_ratio,
+            saved_tokens=entry["tokens"],
+            saved_seconds=entry["latency"]
+        )
+        logger.debug(f"Semantic cache hit (similarity {similarity:.3f}) for: {entry['query'][:60]}")
+        return {**entry, "similarity": similarity}
+
+    def store(
+        self,
+        query: str,
+        query_embedding: List[float],
+        answer: str,
+        sources: List[Dict[str, Any]],
+        tokens: int,
+        latency: float
+    ):
+        """Cache an answer produced for a first-turn question"""
+        embedding = self._normalize(query_embedding)
+
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != embedding.shape[0]:
+                self._matrix = np.zeros((self.max_entries, embedding.shape[0]), dtype=np.float32)
+                self._entries.clear()
+                self._free_slots = list(range(self.max_entries - 1, -1, -1))
+
+            self._expire()
+            if not self._free_slots:
+                evicted_slot, _ = self._entries.popitem(last=False)
+                self._free_slots.append(evicted_slot)
+
+            slot = self._free_slots.pop()
+            self._matrix[slot] = embedding
+            self._entries[slot] = {
+                "query": query,
+                "answer": answer,
+                "sources": sources,
+                "tokens": tokens,
+                "latency": latency,
+                "created_at": time.monotonic(),
+                "hits": 0
+            }
+            size = len(self._entries)
+
+        get_metrics().update_semantic_cache_size(size)
+
+    def invalidate(self):
+        """Drop every cached answer"""
+        with self._lock:
+            self._entries.clear()
+            self._free_slots = list(range(self.max_entries - 1, -1, -1))
+        get_metrics().update_semantic_cache_size(0)
+        logger.info("Semantic response cache invalidated")
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "similarity_threshold": self.similarity_threshold,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+    def _check_kb_version(self):
+        """Invalidate when the indexer has changed the knowledge base"""
+        if self._kb_monitor.changed():
+            self.invalidate()
+
+    def _expire(self):
+        """Remove entries older than the TTL (caller holds the lock)"""
+        if not self.ttl_seconds:
+            return
+        cutoff = time.monotonic() - self.ttl_seconds
+        # Entries are in LRU order, not insertion order, so scan them all
+        expired = [slot for slot, entry in self._entries.items() if entry["created_at"] < cutoff]
+        for slot in expired:
+            del self._entries[slot]
+            self._free_slots.append(slot)
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+# Global instance
+_semantic_cache_instance = None
+
+def get_semantic_cache() -> SemanticResponseCache:
+    """Get singleton semantic response cache instance"""
+    global _semantic_cache_instance
+    if _semantic_cache_instance is None:
+        _semantic_cache_instance = SemanticResponseCache()
+    return _semantic_cache_instance
@@ -1,104 +1,210 @@
 """
 Session Memory Manager for BrainGenTechnology RAG System
-Handles per-session conversation memory with Redis persistence
+Handles per-session conversation memory with Redis persistence. Redis is
+used through redis.asyncio with one shared connection pool, so session
+loads and saves never block the event loop; a session's memory and context
+are read and written together in one pipelined round trip. History is an
+append-only Redis list trimmed to the memory window: a turn writes only its
+new message pair. Hot sessions live in a bounded LRU (count, approximate
+size and idle time); their changes are written behind to Redis in batches,
+and evicted sessions are reloaded transparently on their next turn. Their
+messages are compact ChatMessage objects in a ring buffer (utils.chat_history)
 """
+import asyncio
 import json
-import redis
 import logging
-from typing import Dict, List, Any, Optional
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from langchain.memory import ConversationBufferWindowMemory
-from langchain.schema import BaseMessage, HumanMessage, AIMessage
+
+import redis.asyncio as redis
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import settings
+from monitoring import get_metrics
+from utils.chat_history import ChatMessage, SessionHistory
+from utils.user_info_extractor import ONCE_FIELDS, extract_user_info
 
 logger = logging.getLogger(__name__)
 
+@contextmanager
+def _timed(operation: str):
+    """Record the duration of one Redis round trip"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        get_metrics().record_redis_operation(operation, time.perf_counter() - started)
+
+def create_redis_client() -> redis.Redis:
+    """Async Redis client over a connection pool shared by all session operations"""
+    pool = redis.ConnectionPool.from_url(
+        settings.redis_url,
+        password=settings.redis_password or None,
+        max_connections=settings.redis_max_connections,
+        decode_responses=True,
+        socket_connect_timeout=settings.redis_socket_timeout,
+        socket_timeout=settings.redis_socket_timeout,
+        retry_on_timeout=True,
+        health_check_interval=30
+    )
+    return redis.Redis(connection_pool=pool)
+
+def history_limit() -> int:
+    """Messages kept per session: the memory window (settings.max_conversation_length exchanges)"""
+    return 2 * settings.max_conversation_length
+
 class SessionManager:
     """
     Manages conversation sessions with Redis persistence
     Each session maintains its own conversation memory and context
     """
     
-    def __init__(self):
-        self.session_memories: Dict[str, ConversationBufferWindowMemory] = {}
-        self.session_contexts: Dict[str, Dict[str, Any]] = {}
-        self.redis_client = None
-        self._initialize_redis()
-        
-    def _initialize_redis(self):
-        """Initialize Redis connection for session persistence"""
-        try:
-            # Try to connect to Redis
-            self.redis_client = redis.Redis(
-                host='redis',  # Docker service name
-                port=6379,
-                password=os.getenv('REDIS_PASSWORD', ''),
-                db=0,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True,
-                health_check_interval=30
-            )
-            
-            # Test connection
-            self.redis_client.ping()
-            logger.info("Redis connection established for session management")
-            
-        except Exception as e:
-            logger.warning(f"Redis connection failed, using in-memory storage: {e}")
-            self.redis_client = None
+    def __init__(self, redis_client=None):
+        """
+        Args:
+            redis_client: async Redis client (e.g. utils.fake_redis.FakeRedis);
+                defaults to a pooled client for settings.redis_url
+        """
+        # Hot sessions, least recently used first: {"history", "context", "bytes", "last_access"}
+        self._resident: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._resident_bytes = 0
+        # Write-behind: per-session {"entries": [...], "context": json} not yet in Redis
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flushing: set = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self.redis_client = redis_client if redis_client is not None else create_redis_client()
+        self._redis_checked = False
+        self._redis_lock = asyncio.Lock()
     
-    def get_session_memory(self, session_id: str) -> ConversationBufferWindowMemory:
-        """Get or create conversation memory for a session"""
-        if session_id not in self.session_memories:
-            # Create new memory for this session
-            memory = ConversationBufferWindowMemory(
-                k=settings.max_conversation_length,
-                memory_key="chat_history",
-                return_messages=True,
-                output_key="answer"
-            )
-            
-            # Load existing conversation from Redis if available
-            self._load_session_from_redis(session_id, memory)
-            
-            self.session_memories[session_id] = memory
-            logger.info(f"Created new memory for session {session_id}")
+    async def _get_redis(self):
+        """The Redis client, or None (in-memory storage) when Redis is unreachable"""
+        if not self._redis_checked:
+            async with self._redis_lock:
+                if not self._redis_checked:
+                    try:
+                        with _timed("ping"):
+                            await self.redis_client.ping()
+                        logger.info("Redis connection established for session management")
+                    except Exception as e:
+                        logger.warning(f"Redis connection failed, using in-memory storage: {e}")
+                        self.redis_client = None
+                    self._redis_checked = True
+        return self.redis_client
+    
+    async def load_session(self, session_id: str) -> Dict[str, Any]:
+        """
+        The resident session ({"history", "context"}), loading history tail and
+        context from Redis in one round trip on a miss
+        """
+        session = self._touch(session_id)
+        if session is not None:
+            return session
+        
+        # A reload must see the session's changes that are still being written behind
+        if session_id in self._pending or session_id in self._flushing:
+            await self.flush()
+        
+        log_entries, context = await self._load_session_from_redis(session_id)
+        
+        # Another request may have loaded the session while this one waited
+        session = self._touch(session_id)
+        if session is not None:
+            return session
+        
+        history = SessionHistory(history_limit(), [ChatMessage.from_log_entry(entry) for entry in log_entries or []])
+        
+        if not context:
+            context = {
+                'session_id': session_id,
+                'created_at': datetime.now().isoformat(),
+                'last_activity': datetime.now().isoformat(),
+                'user_info': {},
+                'conversation_metadata': {},
+                'message_count': 0,
+                'topics_discussed': [],
+                'user_preferences': {}
+            }
         
-        return self.session_memories[session_id]
+        session = {"history": history, "context": context, "bytes": 0, "last_access": time.monotonic()}
+        self._resident[session_id] = session
+        self._resize(session)
+        self._evict()
+        logger.debug(f"Loaded session {session_id} ({len(history)} messages)")
+        return session
+    
+    def _touch(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """The resident session marked as most recently used, or None (idle sessions count as misses)"""
+        session = self._resident.get(session_id)
+        if session is None:
+            return None
+        now = time.monotonic()
+        if now - session["last_access"] > settings.session_timeout_minutes * 60:
+            self._drop(session_id, "idle")
+            return None
+        session["last_access"] = now
+        self._resident.move_to_end(session_id)
+        return session
+    
+    def _resize(self, session: Dict[str, Any]):
+        """Re-estimate a session's size: message characters plus its serialized context"""
+        size = sum(len(message.content) for message in session["history"])
+        size += len(json.dumps(session["context"], default=str))
+        self._resident_bytes += size - session["bytes"]
+        session["bytes"] = size
+    
+    def _drop(self, session_id: str, reason: str):
+        session = self._resident.pop(session_id)
+        self._resident_bytes -= session["bytes"]
+        get_metrics().record_session_eviction(reason)
+        if self.redis_client is None:
+            logger.info(f"Evicted session {session_id} ({reason}); without Redis its history is lost")
+    
+    def _evict(self):
+        """Drop least recently used sessions beyond the count and size limits, and idle ones"""
+        idle_after = settings.session_timeout_minutes * 60
+        now = time.monotonic()
+        while self._resident:
+            session_id, session = next(iter(self._resident.items()))
+            if len(self._resident) > settings.session_cache_max_sessions:
+                reason = "sessions"
+            elif self._resident_bytes > settings.session_cache_max_bytes and len(self._resident) > 1:
+                reason = "bytes"
+            elif now - session["last_access"] > idle_after:
+                reason = "idle"
+            else:
+                break
+            self._drop(session_id, reason)
+        get_metrics().update_session_cache(len(self._resident), self._resident_bytes)
+    
+    async def get_session_history(self, session_id: str) -> SessionHistory:
+        """Get or create the message history of a session"""
+        return (await self.load_session(session_id))["history"]
     
-    def get_session_context(self, session_id: str) -> Dict[str, Any]:
+    async def get_session_context(self, session_id: str) -> Dict[str, Any]:
         """Get or create context information for a session"""
-        if session_id not in self.session_contexts:
-            # Load context from Redis if available
-            context = self._load_context_from_redis(session_id)
-            if not context:
-                context = {
-                    'session_id': session_id,
-                    'created_at': datetime.now().isoformat(),
-                    'last_activity': datetime.now().isoformat(),
-                    'user_info': {},
-                    'conversation_metadata': {},
-                    'message_count': 0,
-                    'topics_discussed': [],
-                    'user_preferences': {}
-                }
-            
-            self.session_contexts[session_id] = context
-            logger.info(f"Initialized context for session {session_id}")
-        
-        return self.session_contexts[session_id]
+        return (await self.load_session(session_id))["context"]
     
-    def update_session_context(self, session_id: str, user_message: str, ai_response: str, metadata: Optional[Dict[str, Any]] = None):
+    async def update_session_context(self, session_id: str, user_message: str, ai_response: str, metadata: Optional[Dict[str, Any]] = None):
         """Update session context with new interaction"""
-        context = self.get_session_context(session_id)
+        session = await self.load_session(session_id)
+        self._apply_interaction(session["context"], user_message, ai_response, metadata)
+        self._resize(session)
         
+        # Save to Redis
+        await self._write_behind(session_id, context=session["context"])
+        
+        logger.debug(f"Updated context for session {session_id}")
+    
+    def _apply_interaction(self, context: Dict[str, Any], user_message: str, ai_response: str, metadata: Optional[Dict[str, Any]] = None):
+        """Record a message pair in the (resident) session context"""
         # Update basic info
         context['last_activity'] = datetime.now().isoformat()
         context['message_count'] += 2  # User + AI message
@@ -109,177 +215,81 @@ class SessionManager:
         # Update metadata if provided
         if metadata:
             context['conversation_metadata'].update(metadata)
-        
-        # Save to Redis
-        self._save_context_to_redis(session_id, context)
-        
-        logger.debug(f"Updated context for session {session_id}")
     
     def _extract_user_info(self, context: Dict[str, Any], user_message: str, ai_response: str):
         """Extract user information from conversation messages"""
-        user_message_lower = user_message.lower()
+        user_info = context['user_info']
+        found = extract_user_info(user_message, known=[field for field in ONCE_FIELDS if user_info.get(field)])
         
-        # Extract name information
-        if not context['user_info'].get('name'):
-            name_patterns = [
-                'my name is',
-                'i am',
-                'i\'m',
-                'call me',
-                'name\'s'
-            ]
-            
-            for pattern in name_patterns:
-                if pattern in user_message_lower:
-                    # Try to extract name after the pattern
-                    parts = user_message_lower.split(pattern)
-                    if len(parts) > 1:
-                        potential_name = parts[1].strip().split()[0]
-                        if potential_name and len(potential_name) > 1 and potential_name.isalpha():
-                            context['user_info']['name'] = potential_name.title()
-                            logger.info(f"Extracted user name: {potential_name.title()}")
-                            break
-        
-        # Extract company information
-        if not context['user_info'].get('company'):
-            company_patterns = [
-                'my company',
-                'our company',
-                'we are',
-                'work at',
-                'work for',
-                'i work at',
-                'i work for',
-                'company is'
-            ]
-            
-            for pattern in company_patterns:
-                if pattern in user_message_lower:
-                    # Extract potential company name
-                    parts = user_message_lower.split(pattern)
-                    if len(parts) > 1:
-                        company_part = parts[1].strip()
-                        # Take first few words as company name
-                        company_words = company_part.split()[:3]  # Max 3 words for company name
-                        if company_words:
-                            potential_company = ' '.join(company_words).title()
-                            context['user_info']['company'] = potential_company
-                            logger.info(f"Extracted company: {potential_company}")
-                            break
-        
-        # Extract industry information
-        if not context['user_info'].get('industry'):
-            industry_keywords = {
-                'electric': 'Electric/Energy',
-                'electrical': 'Electric/Energy',
-                'energy': 'Electric/Energy',
-                'power': 'Electric/Energy',
-                'manufacturing': 'Manufacturing',
-                'fintech': 'FinTech',
-                'financial': 'Financial Services',
-                'healthcare': 'Healthcare',
-                'medical': 'Healthcare',
-                'retail': 'Retail',
-                'ecommerce': 'E-commerce',
-                'real estate': 'Real Estate',
-                'construction': 'Construction',
-                'technology': 'Technology',
-                'software': 'Software/Technology',
-                'agriculture': 'Agriculture',
-                'automotive': 'Automotive',
-                'logistics': 'Logistics/Supply Chain'
-            }
-            
-            for keyword, industry in industry_keywords.items():
-                if keyword in user_message_lower:
-                    context['user_info']['industry'] = industry
-                    logger.info(f"Identified industry: {industry}")
-                    break
-        
-        # Extract contact preferences and business needs
-        if 'email' in user_message_lower or '@' in user_message:
-            context['user_info']['contact_method'] = 'email'
+        # Name, company and industry are kept once known
+        for field in ONCE_FIELDS:
+            if field in found:
+                user_info[field] = found[field]
+                logger.info(f"Extracted user {field}: {found[field]}")
         
-        if any(word in user_message_lower for word in ['phone', 'call', 'mobile']):
-            context['user_info']['contact_method'] = 'phone'
+        # The latest contact preference wins
+        if 'contact_method' in found:
+            user_info['contact_method'] = found['contact_method']
         
         # Track topics discussed
-        topic_keywords = {
-            'ai': 'Artificial Intelligence',
-            'automation': 'Business Automation',
-            'blockchain': 'Blockchain Solutions',
-            'predictive maintenance': 'Predictive Maintenance',
-            'machine learning': 'Machine Learning',
-            'data analysis': 'Data Analytics',
-            'customer service': 'Customer Service',
-            'crm': 'CRM Systems',
-            'consultation': 'Consultation Request',
-            'demo': 'Product Demo',
-            'pricing': 'Pricing Information',
-            'roi': 'ROI Discussion'
-        }
-        
-        for keyword, topic in topic_keywords.items():
-            if keyword in user_message_lower and topic not in context['topics_discussed']:
+        for topic in found.get('topics', []):
+            if topic not in context['topics_discussed']:
                 context['topics_discussed'].append(topic)
     
-    def add_message_to_session(self, session_id: str, user_message: str, ai_response: str, metadata: Optional[Dict[str, Any]] = None):
+    async def add_message_to_session(self, session_id: str, user_message: str, ai_response: str, metadata: Optional[Dict[str, Any]] = None):
         """Add a message pair to session memory and update context"""
-        memory = self.get_session_memory(session_id)
+        session = await self.load_session(session_id)
         
-        # Add messages to memory
-        memory.chat_memory.add_user_message(user_message)
-        memory.chat_memory.add_ai_message(ai_response)
+        # Add messages to the history ring, which keeps the same window as the stored log
+        pair = [session["history"].add('human', user_message), session["history"].add('ai', ai_response)]
         
         # Update session context
-        self.update_session_context(session_id, user_message, ai_response, metadata)
+        self._apply_interaction(session["context"], user_message, ai_response, metadata)
+        self._resize(session)
+        self._evict()
         
-        # Save to Redis
-        self._save_session_to_redis(session_id, memory)
+        # Append the pair and save the context to Redis (written behind, batched)
+        await self._write_behind(
+            session_id,
+            new_entries=[message.to_log_entry() for message in pair],
+            context=session["context"]
+        )
         
         logger.debug(f"Added message pair to session {session_id}")
     
-    def get_conversation_history(self, session_id: str) -> List[Dict[str, str]]:
+    async def get_conversation_history(self, session_id: str) -> List[Dict[str, str]]:
         """Get formatted conversation history for a session"""
         try:
-            memory = self.get_session_memory(session_id)
-            messages = memory.chat_memory.messages
-            
-            history = []
-            for message in messages:
-                history.append({
-                    "role": "user" if isinstance(message, HumanMessage) else "assistant",
-                    "content": message.content,
-                    "timestamp": getattr(message, "timestamp", datetime.now().isoformat())
-                })
-            
-            return history
+            history = await self.get_session_history(session_id)
+            return history.to_dicts()
         except Exception as e:
             logger.error(f"Error getting conversation history for session {session_id}: {e}")
             return []
     
-    def clear_session(self, session_id: str):
+    async def clear_session(self, session_id: str):
         """Clear all data for a session"""
         try:
-            # Clear from memory
-            if session_id in self.session_memories:
-                del self.session_memories[session_id]
-            
-            if session_id in self.session_contexts:
-                del self.session_contexts[session_id]
+            # Clear from memory, including changes not yet written
+            session = self._resident.pop(session_id, None)
+            if session is not None:
+                self._resident_bytes -= session["bytes"]
+                get_metrics().update_session_cache(len(self._resident), self._resident_bytes)
+            self._pending.pop(session_id, None)
             
-            # Clear from Redis
-            if self.redis_client:
-                self.redis_client.delete(f"session_memory:{session_id}")
-                self.redis_client.delete(f"session_context:{session_id}")
+            # Clear from Redis, after any write of the session already in flight
+            redis_client = await self._get_redis()
+            if redis_client:
+                async with self._flush_lock:
+                    with _timed("delete"):
+                        await redis_client.delete(f"session_log:{session_id}", f"session_context:{session_id}")
             
             logger.info(f"Cleared all data for session {session_id}")
         except Exception as e:
             logger.error(f"Error clearing session {session_id}: {e}")
     
-    def get_user_info_summary(self, session_id: str) -> str:
+    async def get_user_info_summary(self, session_id: str) -> str:
         """Get a formatted summary of user information for context"""
-        context = self.get_session_context(session_id)
+        context = await self.get_session_context(session_id)
         user_info = context.get('user_info', {})
         
         summary_parts = []
@@ -302,115 +312,152 @@ class SessionManager:
         
         return ""
     
-    def _load_session_from_redis(self, session_id: str, memory: ConversationBufferWindowMemory):
-        """Load conversation history from Redis"""
-        if not self.redis_client:
-            return
+    async def _load_session_from_redis(self, session_id: str) -> Tuple[Optional[List[Dict[str, str]]], Optional[Dict[str, Any]]]:
+        """
+        Load the history tail and context from Redis (one pipelined round trip)
+        A session saved before the append-only log (one JSON list under
+        session_memory:{id}) is moved to session_log:{id} on first load
+        """
+        redis_client = await self._get_redis()
+        if not redis_client:
+            return None, None
         
         try:
-            key = f"session_memory:{session_id}"
-            data = self.redis_client.get(key)
+            with _timed("load"):
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    log_data, context_data, legacy_data = await (
+                        pipe.lrange(f"session_log:{session_id}", -history_limit(), -1)
+                        .get(f"session_context:{session_id}")
+                        .get(f"session_memory:{session_id}")
+                        .execute()
+                    )
             
-            if data:
-                messages_data = json.loads(data)
-                for msg_data in messages_data:
-                    if msg_data['type'] == 'human':
-                        memory.chat_memory.add_user_message(msg_data['content'])
-                    else:
-                        memory.chat_memory.add_ai_message(msg_data['content'])
-                
+            if legacy_data and not log_data:
+                log_data = await self._migrate_legacy_history(redis_client, session_id, legacy_data)
+            
+            messages_data = [json.loads(entry) for entry in log_data]
+            context = json.loads(context_data) if context_data else None
+            if messages_data:
                 logger.info(f"Loaded {len(messages_data)} messages from Redis for session {session_id}")
+            if context:
+                logger.info(f"Loaded context from Redis for session {session_id}")
+            return messages_data, context
         
         except Exception as e:
             logger.error(f"Error loading session from Redis: {e}")
+            return None, None
+    
+    async def _migrate_legacy_history(self, redis_client, session_id: str, legacy_data: str) -> List[str]:
+        """Rewrite a session_memory:{id} JSON list as session_log:{id} entries; returns the entries kept"""
+        entries = [json.dumps(message) for message in json.loads(legacy_data)[-history_limit():]]
+        key = f"session_log:{session_id}"
+        async with redis_client.pipeline(transaction=True) as pipe:
+            if entries:
+                pipe.rpush(key, *entries)
+                pipe.expire(key, timedelta(hours=settings.session_ttl_hours))
+            pipe.delete(f"session_memory:{session_id}")
+            await pipe.execute()
+        logger.info(f"Migrated {len(entries)} messages of session {session_id} to the session log")
+        return entries
     
-    def _save_session_to_redis(self, session_id: str, memory: ConversationBufferWindowMemory):
-        """Save conversation history to Redis"""
-        if not self.redis_client:
+    async def _write_behind(self, session_id: str, new_entries: Optional[List[str]] = None, context: Optional[Dict[str, Any]] = None):
+        """Queue history entries and/or the context for Redis; flushed after settings.session_write_behind_seconds"""
+        if not await self._get_redis():
             return
         
-        try:
-            messages_data = []
-            for message in memory.chat_memory.messages:
-                messages_data.append({
-                    'type': 'human' if isinstance(message, HumanMessage) else 'ai',
-                    'content': message.content,
-                    'timestamp': getattr(message, 'timestamp', datetime.now().isoformat())
-                })
-            
-            key = f"session_memory:{session_id}"
-            
-            # Set with expiration (24 hours)
-            self.redis_client.setex(
-                key,
-                timedelta(hours=24),
-                json.dumps(messages_data)
-            )
-            
-            logger.debug(f"Saved session {session_id} to Redis")
-            
-        except Exception as e:
-            logger.error(f"Error saving session to Redis: {e}")
+        changes = self._pending.setdefault(session_id, {"entries": [], "context": None})
+        if new_entries:
+            changes["entries"].extend(new_entries)
+            del changes["entries"][:-history_limit()]
+        if context is not None:
+            changes["context"] = json.dumps(context, default=str)
+        
+        if settings.session_write_behind_seconds <= 0:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
     
-    def _load_context_from_redis(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Load session context from Redis"""
-        if not self.redis_client:
-            return None
-        
-        try:
-            key = f"session_context:{session_id}"
-            data = self.redis_client.get(key)
-            
-            if data:
-                context = json.loads(data)
-                logger.info(f"Loaded context from Redis for session {session_id}")
-                return context
-        
-        except Exception as e:
-            logger.error(f"Error loading context from Redis: {e}")
-        
-        return None
+    async def _flush_later(self):
+        await asyncio.sleep(settings.session_write_behind_seconds)
+        await self.flush()
     
-    def _save_context_to_redis(self, session_id: str, context: Dict[str, Any]):
-        """Save session context to Redis"""
-        if not self.redis_client:
-            return
-        
-        try:
-            key = f"session_context:{session_id}"
+    async def flush(self):
+        """Write every pending session change to Redis in one pipelined round trip"""
+        async with self._flush_lock:
+            redis_client = await self._get_redis()
+            if not self._pending or not redis_client:
+                return
             
-            # Set with expiration (24 hours)
-            self.redis_client.setex(
-                key,
-                timedelta(hours=24),
-                json.dumps(context, default=str)
-            )
-            
-            logger.debug(f"Saved context for session {session_id} to Redis")
+            pending, self._pending = self._pending, {}
+            self._flushing = set(pending)
+            try:
+                ttl = timedelta(hours=settings.session_ttl_hours)
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for session_id, changes in pending.items():
+                        if changes["entries"]:
+                            key = f"session_log:{session_id}"
+                            pipe.rpush(key, *changes["entries"])
+                            pipe.ltrim(key, -history_limit(), -1)
+                            pipe.expire(key, ttl)
+                        if changes["context"] is not None:
+                            pipe.setex(f"session_context:{session_id}", ttl, changes["context"])
+                    with _timed("save"):
+                        await pipe.execute()
+                
+                logger.debug(f"Saved {len(pending)} sessions to Redis")
             
-        except Exception as e:
-            logger.error(f"Error saving context to Redis: {e}")
+            except Exception as e:
+                logger.error(f"Error saving sessions to Redis: {e}")
+                # Keep the changes for the next flush, ahead of anything queued since
+                for session_id, changes in pending.items():
+                    newer = self._pending.get(session_id)
+                    if newer:
+                        changes["entries"] = (changes["entries"] + newer["entries"])[-history_limit():]
+                        changes["context"] = newer["context"] or changes["context"]
+                    self._pending[session_id] = changes
+            finally:
+                self._flushing = set()
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "resident_sessions": len(self._resident),
+            "resident_bytes": self._resident_bytes,
+            "pending_writes": len(self._pending)
+        }
     
-    def cleanup_expired_sessions(self):
-        """Clean up expired sessions from memory (Redis TTL handles persistence)"""
+    async def aclose(self):
+        """Write pending changes and close the Redis connection pool (server shutdown)"""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+        await self.flush()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+    
+    async def cleanup_expired_sessions(self):
+        """
+        Write pending changes, then evict idle sessions from memory (Redis TTL
+        handles persistence). Session loads evict too, but only while traffic
+        arrives: the periodic sweep frees memory on a quiet server
+        """
         try:
-            expired_sessions = []
-            current_time = datetime.now()
-            
-            for session_id, context in self.session_contexts.items():
-                last_activity = datetime.fromisoformat(context['last_activity'])
-                if current_time - last_activity > timedelta(hours=1):  # 1 hour timeout
-                    expired_sessions.append(session_id)
-            
-            for session_id in expired_sessions:
-                if session_id in self.session_memories:
-                    del self.session_memories[session_id]
-                if session_id in self.session_contexts:
-                    del self.session_contexts[session_id]
-                logger.info(f"Cleaned up expired session {session_id}")
-                
+            await self.flush()
+            self._evict()
         except Exception as e:
             logger.error(f"Error during session cleanup: {e}")
+    
+    def start_cleanup(self, interval: Optional[float] = None):
+        """Run cleanup_expired_sessions every `interval` seconds until aclose() (call from the server's event loop)"""
+        interval = settings.session_cleanup_interval_seconds if interval is None else interval
+        if interval <= 0 or (self._cleanup_task is not None and not self._cleanup_task.done()):
+            return
+        self._cleanup_task = asyncio.create_task(self._cleanup_periodically(interval))
+    
+    async def _cleanup_periodically(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.cleanup_expired_sessions()
 
 # Global instance
 _session_manager_instance = None
@@ -420,4 +467,11 @@ def get_session_manager() -> SessionManager:
     global _session_manager_instance
     if _session_manager_instance is None:
         _session_manager_instance = SessionManager()
-    return _session_manager_instance
\ No newline at end of file
+    return _session_manager_instance
+
+async def aclose_session_manager():
+    """Close the singleton's Redis connections (server shutdown)"""
+    global _session_manager_instance
+    if _session_manager_instance is not None:
+        await _session_manager_instance.aclose()
+        _session_manager_instance = None
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""
+Server-Sent Events helpers for streaming chat responses
+"""
+import json
+from typing import Any
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no"  # Disable nginx proxy buffering
+}
+
+def sse_event(event: str, data: Any) -> str:
+    """Format a single Server-Sent Event frame with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
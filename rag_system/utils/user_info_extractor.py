@@ -0,0 +1,171 @@
+"""
+User Info Extraction for BrainGenTechnology RAG System
+Finds a user's name, company, industry, preferred contact method and the
+topics they ask about in one pass over a chat message. Every cue and keyword
+is an alternative of one regex trie, matched on word boundaries ("ai" does
+not match "email", "power" does not match "empower"). A variant without the
+phrases of fields a session already knows is compiled at import for each
+combination, so returning users do not pay for name and company cues
+"""
+import re
+from itertools import combinations
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple
+
+# Phrases followed by the user's name (one word) or company (up to three words)
+NAME_CUES = ["my name is", "i am", "i'm", "call me", "name's"]
+COMPANY_CUES = [
+    "my company is", "my company", "our company is", "our company", "company is",
+    "we are", "work at", "work for", "i work at", "i work for"
+]
+
+INDUSTRY_KEYWORDS = {
+    'electric': 'Electric/Energy',
+    'electrical': 'Electric/Energy',
+    'energy': 'Electric/Energy',
+    'power': 'Electric/Energy',
+    'manufacturing': 'Manufacturing',
+    'fintech': 'FinTech',
+    'financial': 'Financial Services',
+    'healthcare': 'Healthcare',
+    'medical': 'Healthcare',
+    'retail': 'Retail',
+    'ecommerce': 'E-commerce',
+    'real estate': 'Real Estate',
+    'construction': 'Construction',
+    'technology': 'Technology',
+    'software': 'Software/Technology',
+    'agriculture': 'Agriculture',
+    'automotive': 'Automotive',
+    'logistics': 'Logistics/Supply Chain'
+}
+
+TOPIC_KEYWORDS = {
+    'ai': 'Artificial Intelligence',
+    'automation': 'Business Automation',
+    'blockchain': 'Blockchain Solutions',
+    'predictive maintenance': 'Predictive Maintenance',
+    'machine learning': 'Machine Learning',
+    'data analysis': 'Data Analytics',
+    'customer service': 'Customer Service',
+    'crm': 'CRM Systems',
+    'consultation': 'Consultation Request',
+    'demo': 'Product Demo',
+    'pricing': 'Pricing Information',
+    'roi': 'ROI Discussion'
+}
+
+CONTACT_KEYWORDS = {'email': 'email', 'phone': 'phone', 'call': 'phone', 'mobile': 'phone'}
+
+# Any whitespace between words, straight or curly apostrophes
+CHAR_PATTERNS = {" ": r"\s+", "'": "['’]"}
+# Characters a phrase may follow (besides the start of the message): spelled
+# out, since the regex engine skips ahead over a plain character set quickly
+SEPARATORS = " \t\n\r\f\v\u00a0" + "!\"#$%&()*+,-./:;<=>?@[\\]^`{|}~" + "“”‘«»–—…"
+
+def _build_phrases() -> Dict[str, List[Tuple[str, Optional[str]]]]:
+    """Every phrase of the combined pattern with the fields it sets: [(field, value), ...]"""
+    phrases: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+    for field, keywords in (
+        ("name", dict.fromkeys(NAME_CUES)),
+        ("company", dict.fromkeys(COMPANY_CUES)),
+        ("industry", INDUSTRY_KEYWORDS),
+        ("topic", TOPIC_KEYWORDS),
+        ("contact", CONTACT_KEYWORDS)
+    ):
+        for phrase, value in keywords.items():
+            phrases.setdefault(phrase, []).append((field, value))
+    # "call me Sam" is a name cue and also asks for a phone call
+    phrases["call me"].append(("contact", "phone"))
+    return phrases
+
+def _trie_pattern(phrases: List[str]) -> Tuple[str, List[str]]:
+    """
+    Phrases as one regex trie: alternatives share their prefixes, so each
+    position is tested character by character instead of phrase by phrase.
+    Each phrase ends in an empty group; returns the pattern and the phrase
+    of every group, so match.lastindex names the phrase matched
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = phrase
+
+    groups: List[str] = []
+
+    def node_pattern(node: Dict[str, Any]) -> str:
+        # Groups are numbered in pattern order: children come before this node's end
+        branches = [CHAR_PATTERNS.get(char, re.escape(char)) + node_pattern(child) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            groups.append(node[""])
+            # The longer phrase is tried first, this one if it does not end at a word boundary
+            branches.append("()")
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    return node_pattern(trie), groups
+
+def _compile(known: FrozenSet[str]) -> Tuple[Pattern, List[List[Tuple[str, Optional[str]]]]]:
+    """The combined pattern without the phrases of known fields, and the fields set by each group"""
+    phrases = {}
+    for phrase, fields in _build_phrases().items():
+        wanted = [(field, value) for field, value in fields if field not in known]
+        if wanted:
+            phrases[phrase] = wanted
+    trie, group_phrases = _trie_pattern(list(phrases))
+    # Matched in the lowercased message with a space prepended; plurals count ("demos", "CRMs")
+    pattern = re.compile(f"[{re.escape(SEPARATORS)}]{trie}s?\\b")
+    return pattern, [[]] + [phrases[phrase] for phrase in group_phrases]
+
+# Fields kept once known; later messages are matched without their phrases
+ONCE_FIELDS = ("name", "company", "industry")
+_PATTERNS = {
+    frozenset(known): _compile(frozenset(known))
+    for size in range(len(ONCE_FIELDS) + 1)
+    for known in combinations(ONCE_FIELDS, size)
+}
+
+_NAME = re.compile(r"\s+([^\W\d_]{2,})\b")
+# A company name ends at sentence punctuation ("Acme Corp, and..." -> "Acme Corp")
+_COMPANY_WORD = r"(?:[^\s,;:!?.]|\.(?=\S))+"
+_COMPANY = re.compile(rf"\s+({_COMPANY_WORD}(?:\s+{_COMPANY_WORD}){{0,2}})")
+
+def extract_user_info(message: str, known: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    User details mentioned in one message
+
+    Args:
+        message: The user's message
+        known: Fields of ONCE_FIELDS the session already has; not searched
+
+    Returns:
+        Dict with any of name, company, industry (first match in the message),
+        contact_method ('phone' wins over 'email') and topics (in order of
+        first mention)
+    """
+    pattern, group_fields = _PATTERNS[frozenset(known).intersection(ONCE_FIELDS)]
+    text = " " + message.lower()
+    info: Dict[str, Any] = {}
+    topics: List[str] = []
+    contacts = {"email"} if "@" in message else set()
+    for match in pattern.finditer(text):
+        for field, value in group_fields[match.lastindex]:
+            if field == "name" and "name" not in info:
+                name = _NAME.match(text, match.end())
+                if name:
+                    info["name"] = name.group(1).title()
+            elif field == "company" and "company" not in info:
+                company = _COMPANY.match(text, match.end())
+                if company:
+                    info["company"] = company.group(1).title()
+            elif field == "industry":
+                info.setdefault("industry", value)
+            elif field == "topic" and value not in topics:
+                topics.append(value)
+            elif field == "contact":
+                contacts.add(value)
+    if contacts:
+        info["contact_method"] = "phone" if "phone" in contacts else "email"
+    if topics:
+        info["topics"] = topics
+    return info
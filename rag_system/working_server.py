@@ -11,21 +11,28 @@ sys.path.append(str(Path(__file__).parent))
 import asyncio
 import json
 import time
+from contextlib import aclosing
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
 
 from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 # Import working components
-from langchain_groq import ChatGroq
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
-from config.settings import settings, CHROMA_DIR
+from config.settings import settings
 from monitoring import get_metrics
-from utils.session_manager import get_session_manager
+from utils.session_manager import get_session_manager, aclose_session_manager
+from utils.semantic_cache import get_semantic_cache
+from utils.user_info_extractor import extract_user_info
+from utils.embeddings_provider import get_embeddings
+from utils.knowledge_base import index_exists, open_vectorstore, reload_vectorstore
+from utils.kb_version import KBVersionMonitor
+from retrieval import HybridSearcher, get_reranker, retrieve_reranked, pack_context
 from integrations.laravel_bridge import LaravelBridge
+from utils.streaming import sse_event, SSE_HEADERS
+from utils.llm_clients import get_chat_model, get_admission_controller, aclose_llm_clients
 
 app = FastAPI(
     title="BrainGenTechnology Working RAG API",
@@ -56,27 +63,29 @@ class ChatResponse(BaseModel):
     timestamp: str
     processing_time: Optional[float] = None
 
+class BatchRetrieveRequest(BaseModel):
+    queries: List[str]
+    k: Optional[int] = None
+
 # Global variables
 groq_llm = None
+embeddings = None
 vectorstore = None
-conversations = {}
+searcher = None
+kb_monitor = KBVersionMonitor()
+semantic_cache = None
 session_manager = None
 laravel_bridge = None
 
 def init_system():
     """Initialize the working system"""
-    global groq_llm, vectorstore, session_manager, laravel_bridge
+    global groq_llm, embeddings, vectorstore, searcher, semantic_cache, session_manager, laravel_bridge
     
     print("🚀 Initializing BrainGenTechnology Working RAG Server...")
     
     # Initialize Groq LLM
     try:
-        groq_llm = ChatGroq(
-            groq_api_key=settings.groq_api_key,
-            model_name=settings.llm_model,
-            temperature=0.3,
-            max_tokens=1000
-        )
+        groq_llm = get_chat_model(temperature=0.3, max_tokens=1000)
         test_response = groq_llm.invoke("Say 'Groq ready' and nothing else.")
         print(f"✅ Groq initialized: {test_response.content}")
     except Exception as e:
@@ -85,25 +94,31 @@ def init_system():
     
     # Initialize vectorstore
     try:
-        if (CHROMA_DIR / "chroma.sqlite3").exists():
-            embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-mpnet-base-v2"
-            )
+        if index_exists():
+            embeddings = get_embeddings()
             
-            vectorstore = Chroma(
-                persist_directory=str(CHROMA_DIR),
-                embedding_function=embeddings,
-                collection_name="braingentech_knowledge"
-            )
+            vectorstore = open_vectorstore(embeddings)
             
             doc_count = vectorstore._collection.count()
             print(f"✅ Vectorstore loaded with {doc_count} documents")
+            
+            searcher = HybridSearcher(vectorstore, embeddings)
+            print(f"✅ Retrieval mode: {searcher.mode} (dense search: {searcher.dense_backend})")
+            if settings.rerank_enabled:
+                print(f"{'✅' if get_reranker() else '❌'} Cross-encoder re-ranking ({settings.rerank_model})")
         else:
             print("⚠️ No vectorstore found")
             vectorstore = None
     except Exception as e:
         print(f"❌ Vectorstore initialization failed: {e}")
         vectorstore = None
+        searcher = None
+        embeddings = None
+    
+    # Initialize semantic response cache (needs query embeddings)
+    if settings.semantic_cache_enabled and embeddings is not None:
+        semantic_cache = get_semantic_cache()
+        print("✅ Semantic response cache enabled")
     
     # Initialize Session Manager
     try:
@@ -127,23 +142,85 @@ def init_system():
     print(f"   Session Manager: {'✅' if session_manager else '❌'}")
     print(f"   Laravel Bridge: {'✅' if laravel_bridge else '❌'}")
 
-def get_context_for_query(query: str) -> str:
-    """Get relevant context from vectorstore"""
+def current_vectorstore():
+    """The vectorstore, reopened when the indexer has changed the knowledge base"""
+    global vectorstore
+    if embeddings is not None and kb_monitor.changed():
+        vectorstore = reload_vectorstore(embeddings, vectorstore)
+        if searcher is not None and vectorstore is not None:
+            searcher.set_vectorstore(vectorstore)
+    return vectorstore
+
+def get_context_for_query(query: str, query_embedding: Optional[List[float]] = None) -> str:
+    """Get relevant context from vectorstore, reusing the query embedding when given"""
     try:
+        vectorstore = current_vectorstore()
         if vectorstore is None:
             return ""
             
-        docs = vectorstore.similarity_search(query, k=3)
+        if searcher is not None:
+            docs = [doc for doc, _ in retrieve_reranked(searcher, query, query_embedding=query_embedding)]
+        elif query_embedding is not None:
+            docs = vectorstore.similarity_search_by_vector(query_embedding, k=settings.context_candidates)
+        else:
+            docs = vectorstore.similarity_search(query, k=settings.context_candidates)
         if not docs:
             return ""
             
-        context = "\n\n".join([doc.page_content for doc in docs])
-        return context[:2000]  # Limit context length
+        # Overlap-free, sentence-aligned context within settings.context_token_budget
+        return pack_context(docs)["text"]
         
     except Exception as e:
         print(f"⚠️ Context retrieval failed: {e}")
         return ""
 
+async def aget_context_for_query(query: str, query_embedding: Optional[List[float]] = None) -> str:
+    """Get relevant context without blocking the event loop (embedding + search run in a worker thread)"""
+    return await asyncio.to_thread(get_context_for_query, query, query_embedding)
+
+def embed_query(query: str) -> Optional[List[float]]:
+    """Embed a query once so the semantic cache and the vector search can share it"""
+    if embeddings is None:
+        return None
+    try:
+        return embeddings.embed_query(query)
+    except Exception as e:
+        print(f"⚠️ Query embedding failed: {e}")
+        return None
+
+async def _load_session_context(session_id: str) -> tuple:
+    """Load user context and formatted recent history for a session"""
+    user_context = ""
+    conversation_history = ""
+    if session_manager:
+        try:
+            user_context = await session_manager.get_user_info_summary(session_id)
+            # Get recent conversation history
+            history = await session_manager.get_conversation_history(session_id)
+            if history:
+                # Format last few messages for context
+                recent_messages = history[-6:]  # Last 3 exchanges
+                conversation_history = "\n".join([
+                    f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
+                    for msg in recent_messages
+                ])
+        except Exception as e:
+            print(f"Session context error: {e}")
+    return user_context, conversation_history
+
+async def _store_session_messages(session_id: str, message: str, answer: str, metadata: Dict[str, Any]):
+    """Persist a message pair in the session manager"""
+    if session_manager:
+        try:
+            await session_manager.add_message_to_session(
+                session_id=session_id,
+                user_message=message,
+                ai_response=answer,
+                metadata=metadata
+            )
+        except Exception as e:
+            print(f"Session storage error: {e}")
+
 def create_rag_prompt(query: str, context: str = "") -> str:
     """Create a RAG prompt similar to the working test"""
     base_info = """You are a helpful AI assistant for BrainGenTechnology, a company that provides AI, automation, and blockchain solutions for businesses.
@@ -262,7 +339,8 @@ async def _create_consultation_request_via_api(consultation_data: dict):
     """Create consultation request via Laravel API"""
     try:
         import requests
-        response = requests.post(
+        response = await asyncio.to_thread(
+            requests.post,
             f"{laravel_bridge.laravel_base_url}/api/consultation/request",
             json=consultation_data,
             timeout=5
@@ -339,6 +417,81 @@ Response:"""
     
     return prompt
 
+async def _prepare_chat_turn(message: str, session_id: str) -> Dict[str, Any]:
+    """
+    Prepare a chat turn: embed the query and load session state concurrently,
+    answer first-turn questions from the semantic cache when possible, otherwise
+    retrieve context and build the prompt
+    """
+    metrics = get_metrics()
+    
+    # Embed the query in a worker thread while the session loads from Redis
+    vector_start = time.time()
+    query_embedding, (user_context, conversation_history) = await asyncio.gather(
+        asyncio.to_thread(embed_query, message),
+        _load_session_context(session_id)
+    )
+    
+    # Only session-independent questions can share answers
+    first_turn = not conversation_history
+    if first_turn and semantic_cache is not None and query_embedding is not None:
+        cached = semantic_cache.lookup(query_embedding)
+        if cached:
+            return {"cached": cached, "first_turn": True, "query_embedding": query_embedding}
+    
+    context = await aget_context_for_query(message, query_embedding)
+    metrics.record_vector_search(time.time() - vector_start)
+    
+    # Create enhanced prompt with user context
+    prompt = create_enhanced_rag_prompt(message, context, user_context, conversation_history)
+    return {
+        "cached": None,
+        "first_turn": first_turn,
+        "query_embedding": query_embedding,
+        "prompt": prompt,
+        "context": context
+    }
+
+def _cache_answer(message: str, turn: Dict[str, Any], answer: str, sources: List[Dict[str, Any]], tokens: int, processing_time: float):
+    """Store a freshly generated first-turn answer in the semantic cache"""
+    if semantic_cache is None or not turn["first_turn"] or turn["query_embedding"] is None:
+        return
+    # An answer to "I'm Dana from Acme, reach me at dana@acme.com" may repeat those
+    # details: never serve it to anyone else
+    user_info = extract_user_info(message)
+    if any(field in user_info for field in ("name", "company", "contact_method")):
+        return
+    if any(_extract_contact_info([{"role": "user", "content": message}])):
+        return
+    try:
+        semantic_cache.store(message, turn["query_embedding"], answer, sources, tokens, processing_time)
+    except Exception as e:
+        print(f"⚠️ Semantic cache store failed: {e}")
+
+def _build_sources(context: str) -> List[Dict[str, Any]]:
+    """Prepare the sources list returned to the client"""
+    sources = []
+    if context:
+        sources.append({
+            "source": "BrainGenTechnology Knowledge Base",
+            "content": context[:200] + "..." if len(context) > 200 else context
+        })
+    return sources
+
+def _record_llm_usage(prompt: str, answer: str, llm_duration: float) -> int:
+    """Track LLM request, token estimate and assistant message metrics; return estimated total tokens"""
+    metrics = get_metrics()
+    metrics.record_llm_request("success", settings.llm_model, llm_duration)
+    
+    # Estimate tokens (rough calculation)
+    input_tokens = len(prompt.split()) * 1.3  # Approximate
+    output_tokens = len(answer.split()) * 1.3
+    metrics.record_tokens(int(input_tokens), int(output_tokens))
+    
+    # Track assistant message
+    metrics.record_message("assistant")
+    return int(input_tokens + output_tokens)
+
 async def process_chat_request(message: str, session_id: str) -> Dict[str, Any]:
     """Process chat request using working approach with session memory"""
     start_time = time.time()
@@ -357,77 +510,40 @@ async def process_chat_request(message: str, session_id: str) -> Dict[str, Any]:
         # Track message
         metrics.record_message("user")
         
-        # Get context from vectorstore with timing
-        vector_start = time.time()
-        context = get_context_for_query(message)
-        vector_duration = time.time() - vector_start
-        metrics.record_vector_search(vector_duration)
-        
-        # Get user context from session manager
-        user_context = ""
-        conversation_history = ""
-        if session_manager:
-            try:
-                user_context = session_manager.get_user_info_summary(session_id)
-                # Get recent conversation history
-                history = session_manager.get_conversation_history(session_id)
-                if history:
-                    # Format last few messages for context
-                    recent_messages = history[-6:]  # Last 3 exchanges
-                    conversation_history = "\n".join([
-                        f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
-                        for msg in recent_messages
-                    ])
-            except Exception as e:
-                print(f"Session context error: {e}")
-        
-        # Create enhanced prompt with user context
-        prompt = create_enhanced_rag_prompt(message, context, user_context, conversation_history)
-        
-        # Get Groq response with timing
-        llm_start = time.time()
-        response = groq_llm.invoke(prompt)
-        llm_duration = time.time() - llm_start
-        
-        # Track LLM request
-        metrics.record_llm_request("success", settings.llm_model, llm_duration)
-        
-        # Estimate tokens (rough calculation)
-        input_tokens = len(prompt.split()) * 1.3  # Approximate
-        output_tokens = len(response.content.split()) * 1.3
-        metrics.record_tokens(int(input_tokens), int(output_tokens))
-        
-        # Track assistant message
-        metrics.record_message("assistant")
+        turn = await _prepare_chat_turn(message, session_id)
         
-        # Prepare sources
-        sources = []
-        if context:
-            sources.append({
-                "source": "BrainGenTechnology Knowledge Base",
-                "content": context[:200] + "..." if len(context) > 200 else context
-            })
+        if turn["cached"]:
+            answer = turn["cached"]["answer"]
+            sources = turn["cached"]["sources"]
+            metrics.record_message("assistant")
+        else:
+            # Get Groq response with timing
+            llm_start = time.time()
+            response = await groq_llm.ainvoke(turn["prompt"])
+            answer = response.content
+            tokens = _record_llm_usage(turn["prompt"], answer, time.time() - llm_start)
+            sources = _build_sources(turn["context"])
         
         processing_time = time.time() - start_time
         metrics.record_query("success", processing_time)
         
+        if not turn["cached"]:
+            _cache_answer(message, turn, answer, sources, tokens, processing_time)
+        
         # Store conversation in session manager
-        if session_manager:
-            try:
-                session_manager.add_message_to_session(
-                    session_id=session_id,
-                    user_message=message,
-                    ai_response=response.content,
-                    metadata={"processing_time": processing_time, "sources": sources}
-                )
-            except Exception as e:
-                print(f"Session storage error: {e}")
+        await _store_session_messages(
+            session_id,
+            message,
+            answer,
+            {"processing_time": processing_time, "sources": sources}
+        )
         
         return {
             "success": True,
-            "answer": response.content,
+            "answer": answer,
             "sources": sources,
-            "processing_time": processing_time
+            "processing_time": processing_time,
+            "cached": bool(turn["cached"])
         }
         
     except Exception as e:
@@ -436,6 +552,7 @@ async def process_chat_request(message: str, session_id: str) -> Dict[str, Any]:
         traceback.print_exc()
         
         processing_time = time.time() - start_time
+        metrics.record_query("error", processing_time)
         return {
             "success": False,
             "answer": "I'm experiencing a technical issue. Please try again or contact our support team at contact@braingentech.com for assistance.",
@@ -444,10 +561,92 @@ async def process_chat_request(message: str, session_id: str) -> Dict[str, Any]:
             "error": str(e)
         }
 
+async def stream_chat_request(message: str, session_id: str) -> AsyncIterator[tuple]:
+    """
+    Stream a chat turn as (event, data) pairs: sources first, then tokens as
+    Groq produces them, then a final "done" event once the answer is persisted
+    """
+    start_time = time.time()
+    metrics = get_metrics()
+    
+    try:
+        if groq_llm is None:
+            metrics.record_error("llm_unavailable")
+            yield "error", {"answer": "AI system is initializing. Please try again in a moment."}
+            return
+        
+        metrics.record_message("user")
+        
+        turn = await _prepare_chat_turn(message, session_id)
+        
+        if turn["cached"]:
+            answer = turn["cached"]["answer"]
+            sources = turn["cached"]["sources"]
+            yield "sources", {"sources": sources, "session_id": session_id}
+            metrics.record_time_to_first_token(time.time() - start_time)
+            yield "token", {"token": answer}
+            metrics.record_message("assistant")
+        else:
+            sources = _build_sources(turn["context"])
+            yield "sources", {"sources": sources, "session_id": session_id}
+            
+            llm_start = time.time()
+            first_token_recorded = False
+            answer_parts = []
+            # Closed on client disconnect too, which frees the LLM connection and admission slot
+            async with aclosing(groq_llm.astream(turn["prompt"])) as chunks:
+                async for chunk in chunks:
+                    if not chunk.content:
+                        continue
+                    if not first_token_recorded:
+                        metrics.record_time_to_first_token(time.time() - start_time)
+                        first_token_recorded = True
+                    answer_parts.append(chunk.content)
+                    yield "token", {"token": chunk.content}
+            
+            answer = "".join(answer_parts)
+            tokens = _record_llm_usage(turn["prompt"], answer, time.time() - llm_start)
+        
+        processing_time = time.time() - start_time
+        metrics.record_query("success", processing_time)
+        
+        if not turn["cached"]:
+            _cache_answer(message, turn, answer, sources, tokens, processing_time)
+        
+        await _store_session_messages(
+            session_id,
+            message,
+            answer,
+            {"processing_time": processing_time, "sources": sources}
+        )
+        
+        yield "done", {
+            "answer": answer,
+            "session_id": session_id,
+            "processing_time": processing_time,
+            "cached": bool(turn["cached"])
+        }
+        
+    except Exception as e:
+        print(f"❌ Chat streaming error: {e}")
+        metrics.record_query("error", time.time() - start_time)
+        yield "error", {
+            "answer": "I'm experiencing a technical issue. Please try again or contact our support team at contact@braingentech.com for assistance.",
+            "error": str(e)
+        }
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize components on startup"""
     init_system()
+    if session_manager is not None:
+        session_manager.start_cleanup()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled LLM and Redis connections"""
+    await aclose_llm_clients()
+    await aclose_session_manager()
 
 @app.get("/")
 async def root():
@@ -469,7 +668,12 @@ async def health_check():
             "groq_available": groq_llm is not None,
             "vectorstore_available": vectorstore is not None,
             "llm_model": settings.llm_model,
-            "document_count": vectorstore._collection.count() if vectorstore else 0
+            "document_count": vectorstore._collection.count() if vectorstore else 0,
+            "retrieval_mode": searcher.mode if searcher else None,
+            "dense_backend": searcher.dense_backend if searcher else None,
+            "semantic_cache": semantic_cache.get_stats() if semantic_cache else None,
+            "llm_admission": get_admission_controller().stats(),
+            "sessions": session_manager.stats() if session_manager else None
         }
     }
 
@@ -514,7 +718,12 @@ async def test_consultation_creation():
         }
     ]
     
-    conversations[session_id] = test_conversation
+    if session_manager:
+        await session_manager.add_message_to_session(
+            session_id,
+            test_conversation[0]["content"],
+            test_conversation[1]["content"]
+        )
     
     # Create a mock qualification object that will trigger consultation request
     class MockQualification:
@@ -541,20 +750,14 @@ async def test_consultation_creation():
         "qualification_score": mock_qualification.lead_score
     }
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(request: ChatRequest):
-    """Working chat endpoint"""
-    
-    # Track conversation
-    if request.session_id not in conversations:
-        conversations[request.session_id] = []
-    
-    conversations[request.session_id].append({
-        "role": "user",
-        "content": request.message,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
-    
+async def _conversation_history(session_id: str) -> List[Dict[str, Any]]:
+    """Session history from the session manager, the single store of conversations"""
+    if not session_manager:
+        return []
+    return await session_manager.get_conversation_history(session_id)
+
+async def _record_user_turn(request: ChatRequest):
+    """Track the user message in Laravel (the session manager stores the answered pair)"""
     # Store user message in Laravel
     if laravel_bridge:
         try:
@@ -562,45 +765,110 @@ async def chat_endpoint(request: ChatRequest):
                 'user_ip': request.metadata.get('user_ip', '127.0.0.1') if request.metadata else '127.0.0.1',
                 'referrer': request.metadata.get('referrer', 'direct') if request.metadata else 'direct'
             }
-            laravel_bridge.store_conversation(request.session_id, user_data)
-            laravel_bridge.store_message(request.session_id, "user", request.message, request.metadata)
+            await asyncio.to_thread(laravel_bridge.store_conversation, request.session_id, user_data)
+            await asyncio.to_thread(laravel_bridge.store_message, request.session_id, "user", request.message, request.metadata)
         except Exception as e:
             print(f"⚠️ Laravel bridge error (user message): {e}")
+
+async def _record_assistant_turn(session_id: str, answer: str, processing_time: float, sources: List[Dict[str, Any]]):
+    """Track the assistant answer in Laravel"""
+    # Store assistant message in Laravel
+    if laravel_bridge:
+        try:
+            await asyncio.to_thread(laravel_bridge.store_message, session_id, "assistant", answer, {
+                "processing_time": processing_time,
+                "sources": sources
+            })
+        except Exception as e:
+            print(f"⚠️ Laravel bridge error (assistant message): {e}")
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat_endpoint(request: ChatRequest):
+    """Working chat endpoint"""
+    
+    await _record_user_turn(request)
     
     # Process chat
     result = await process_chat_request(request.message, request.session_id)
     
     if result["success"]:
-        conversations[request.session_id].append({
-            "role": "assistant", 
-            "content": result["answer"],
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        })
-        
-        # Store assistant message in Laravel
-        if laravel_bridge:
-            try:
-                laravel_bridge.store_message(request.session_id, "assistant", result["answer"], {
-                    "processing_time": result.get("processing_time", 0),
-                    "sources": result.get("sources", [])
-                })
-            except Exception as e:
-                print(f"⚠️ Laravel bridge error (assistant message): {e}")
+        await _record_assistant_turn(
+            request.session_id,
+            result["answer"],
+            result.get("processing_time", 0),
+            result.get("sources", [])
+        )
     
     return ChatResponse(
         answer=result["answer"],
         session_id=request.session_id,
         sources=result.get("sources", []),
-        conversation_length=len(conversations[request.session_id]),
+        conversation_length=len(await _conversation_history(request.session_id)),
         timestamp=datetime.now(timezone.utc).isoformat(),
         processing_time=result.get("processing_time", 0)
     )
 
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """Streaming chat endpoint (Server-Sent Events): sources, then tokens, then done"""
+    
+    await _record_user_turn(request)
+    
+    async def event_stream():
+        sources = []
+        # A disconnecting client stops this generator: close the turn (and its LLM stream) with it
+        async with aclosing(stream_chat_request(request.message, request.session_id)) as events:
+            async for event, data in events:
+                if event == "sources":
+                    sources = data["sources"]
+                elif event == "done":
+                    await _record_assistant_turn(
+                        request.session_id,
+                        data["answer"],
+                        data["processing_time"],
+                        sources
+                    )
+                    data["conversation_length"] = len(await _conversation_history(request.session_id))
+                    data["timestamp"] = datetime.now(timezone.utc).isoformat()
+                yield sse_event(event, data)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.post("/retrieve/batch")
+async def retrieve_batch_endpoint(request: BatchRetrieveRequest):
+    """Ranked knowledge base chunks with scores for many queries, embedded and searched together"""
+    if not request.queries or len(request.queries) > 256:
+        raise HTTPException(status_code=400, detail="Send between 1 and 256 queries")
+    if current_vectorstore() is None or searcher is None:
+        raise HTTPException(status_code=503, detail="Knowledge base not available")
+    
+    start_time = time.time()
+    results = await searcher.asearch_batch(request.queries, request.k or settings.retrieval_k)
+    return {
+        "results": [
+            {
+                "query": query,
+                "chunks": [
+                    {
+                        "content": doc.page_content,
+                        "source": doc.metadata.get("source", "Unknown"),
+                        "chunk_index": doc.metadata.get("chunk_index"),
+                        "score": score
+                    }
+                    for doc, score in ranked
+                ]
+            }
+            for query, ranked in zip(request.queries, results)
+        ],
+        "count": len(results),
+        "processing_time": time.time() - start_time
+    }
+
 @app.post("/qualify")
 async def qualify_lead(request: dict):
     """Advanced lead qualification using LLM analysis"""
     session_id = request.get("session_id", "unknown")
-    conversation = conversations.get(session_id, [])
+    conversation = await _conversation_history(session_id)
     
     if not conversation:
         return {